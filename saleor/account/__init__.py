@@ -61,6 +61,7 @@ class BalanceEvents:
     REFUNDED = "refunded"
     OTHER = "other"
     INVITATION_ACCEPTED = "invitation_accepted"
+    OPENING_BALANCE = "opening_balance"
     CHOICES = [
         (
             DONATION_GRANTED,
@@ -87,4 +88,5 @@ class BalanceEvents:
         (POOR_SIGN, "The user is in special class."),
         (OTHER, "Other reasons."),
         (INVITATION_ACCEPTED, "Your invitation is accepted."),
+        (OPENING_BALANCE, "The balance the user's coin logs start with."),
     ]
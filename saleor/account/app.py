@@ -1,16 +1,46 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class AccountAppConfig(AppConfig):
     name = "saleor.account"
 
     def ready(self):
-        from .models import User
-        from .signals import delete_avatar
+        from .models import Group, User
+        from .signals import (
+            delete_all_auth_snapshots,
+            delete_avatar,
+            delete_user_auth_snapshot,
+            open_user_balance,
+        )
 
         post_delete.connect(
             delete_avatar,
             sender=User,
             dispatch_uid="delete_user_avatar",
         )
+        post_save.connect(
+            open_user_balance,
+            sender=User,
+            dispatch_uid="open_created_user_balance",
+        )
+        post_save.connect(
+            delete_user_auth_snapshot,
+            sender=User,
+            dispatch_uid="delete_saved_user_auth_snapshot",
+        )
+        post_delete.connect(
+            delete_user_auth_snapshot,
+            sender=User,
+            dispatch_uid="delete_deleted_user_auth_snapshot",
+        )
+        for through in (
+            User.groups.through,
+            User.user_permissions.through,
+            Group.permissions.through,
+        ):
+            m2m_changed.connect(
+                delete_all_auth_snapshots,
+                sender=through,
+                dispatch_uid=f"delete_auth_snapshots_{through._meta.model_name}",
+            )
@@ -0,0 +1,153 @@
+"""Login streaks of users and the credits granted for them.
+
+Logins only queue a `PendingLogin` for the user and the day, deduplicated with
+the cache, so authentication never locks the user row. The queue is processed
+in batches by `process_pending_logins`, which updates the streaks with a single
+`UPDATE` and posts the credits to the ledger. Processing is idempotent: a day
+that was already counted for the user grants nothing. The counted days are
+kept in `User.last_streak_day`, `last_login` is set by the login mutations
+before the queue is processed.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import Case, DateField, F, IntegerField, When
+from django.utils import timezone
+
+from . import BalanceEvents, ledger
+from .models import PendingLogin, User
+
+TIMEZONE = pytz.timezone("Asia/Shanghai")
+PENDING_LOGIN_CACHE_KEY = "pending_login:{user_id}:{day}"
+# Longer than a day, so a key never expires before the day it deduplicates ends.
+PENDING_LOGIN_CACHE_TIMEOUT = 60 * 60 * 25
+
+
+def get_login_day(login_time: datetime) -> date:
+    return login_time.astimezone(tz=TIMEZONE).date()
+
+
+def get_streak_credit(continuous: int) -> Decimal:
+    credits = settings.CONTINUOUS_BALANCE_ADD
+    return Decimal(credits[min(continuous, len(credits)) - 1])
+
+
+def update_streak(
+    continuous: int, last_streak_day: date, login_time: datetime
+) -> tuple[int, Decimal]:
+    """Return the streak after the login and the credit the login grants."""
+    days = (get_login_day(login_time) - last_streak_day).days
+    if days < 1:
+        return continuous, Decimal(0)
+    continuous = continuous + 1 if days == 1 else 1
+    return continuous, get_streak_credit(continuous)
+
+
+def _enqueue_login(user_id: int, login_time: datetime):
+    day = get_login_day(login_time)
+    key = PENDING_LOGIN_CACHE_KEY.format(user_id=user_id, day=day)
+    if not cache.add(key, 1, timeout=PENDING_LOGIN_CACHE_TIMEOUT):
+        return
+    try:
+        PendingLogin.objects.bulk_create(
+            [PendingLogin(user_id=user_id, day=day, login_time=login_time)],
+            ignore_conflicts=True,
+        )
+    except DatabaseError:
+        cache.delete(key)
+        raise
+
+
+def record_login(user: User, login_time: Optional[datetime] = None):
+    """Queue the login for the streak processing once the transaction commits."""
+    login_time = login_time or timezone.now()
+    user_id = user.pk
+    transaction.on_commit(lambda: _enqueue_login(user_id, login_time))
+
+
+def _process_batch(batch_size: int) -> tuple[int, int]:
+    with transaction.atomic():
+        pending_logins = list(
+            PendingLogin.objects.select_for_update(skip_locked=True).order_by("pk")[
+                :batch_size
+            ]
+        )
+        if not pending_logins:
+            return 0, 0
+        # Users locked by other transactions are left for the next run.
+        users = {
+            user.pk: user
+            for user in User.objects.select_for_update(skip_locked=True)
+            .filter(pk__in={login.user_id for login in pending_logins})
+            .order_by("pk")
+            .only("pk", "continuous", "last_streak_day")
+        }
+        logins_per_user = defaultdict(list)
+        for login in pending_logins:
+            if login.user_id in users:
+                logins_per_user[login.user_id].append(login)
+
+        postings = []
+        for user_id, logins in logins_per_user.items():
+            user = users[user_id]
+            for login in sorted(logins, key=lambda login: login.login_time):
+                user.continuous, credit = update_streak(
+                    user.continuous, user.last_streak_day, login.login_time
+                )
+                user.last_streak_day = max(
+                    user.last_streak_day, get_login_day(login.login_time)
+                )
+                if credit:
+                    postings.append(
+                        ledger.Posting(
+                            user_id=user_id,
+                            delta=credit,
+                            type=BalanceEvents.CONSECUTIVE_LOGIN,
+                            date=login.login_time,
+                        )
+                    )
+
+        if logins_per_user:
+            User.objects.filter(pk__in=logins_per_user.keys()).update(
+                continuous=Case(
+                    *[
+                        When(pk=user_id, then=users[user_id].continuous)
+                        for user_id in logins_per_user
+                    ],
+                    default=F("continuous"),
+                    output_field=IntegerField(),
+                ),
+                last_streak_day=Case(
+                    *[
+                        When(pk=user_id, then=users[user_id].last_streak_day)
+                        for user_id in logins_per_user
+                    ],
+                    default=F("last_streak_day"),
+                    output_field=DateField(),
+                ),
+            )
+            ledger.post_many(postings)
+        processed = [
+            login.pk for logins in logins_per_user.values() for login in logins
+        ]
+        PendingLogin.objects.filter(pk__in=processed).delete()
+        return len(pending_logins), len(processed)
+
+
+def process_pending_logins(batch_size: int = 500) -> int:
+    """Update streaks of the queued logins and grant their credits.
+
+    Return the number of processed logins.
+    """
+    total = 0
+    while True:
+        fetched, processed = _process_batch(batch_size)
+        total += processed
+        if fetched < batch_size or not processed:
+            return total
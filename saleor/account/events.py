@@ -1,14 +1,12 @@
-from decimal import Decimal
 from typing import Optional
 
 from django.conf import settings
 from stripe import Balance
 
 from ..app.models import App
-from ..donation.models import Donation
 from ..order.models import Order, OrderLine
-from . import BalanceEvents, CustomerEvents
-from .models import BalanceEvent, CustomerEvent, User
+from . import CustomerEvents
+from .models import CustomerEvent, User
 
 
 def customer_account_created_event(*, user: User) -> Optional[CustomerEvent]:
@@ -129,72 +127,3 @@ def assigned_name_to_a_customer_event(
         type=CustomerEvents.NAME_ASSIGNED,
         parameters={"message": new_name},
     )
-
-
-def first_login_balance_event(*, user: User) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user,
-        type=BalanceEvents.FIRST_LOGIN,
-        balance=Decimal(0.0),
-        delta=Decimal(50.0),
-    )
-
-
-def accept_invitation_balance_event(*, user: User) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user,
-        type=BalanceEvents.INVITATION_ACCEPTED,
-        balance=Decimal(0.0),
-        delta=Decimal(25.0),
-    )
-
-
-def consecutive_login_balance_event(*, user: User, delta: Decimal) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user,
-        type=BalanceEvents.CONSECUTIVE_LOGIN,
-        balance=user.balance,
-        delta=delta,
-    )
-
-
-def change_balance_event(*, user: User, balance: Decimal) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user,
-        type=BalanceEvents.MANUALLY_UPDATED,
-        balance=balance,
-        delta=(balance - user.balance),
-    )
-
-
-def donation_granted_balance_event(*, user: User, donation: Donation) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user,
-        type=BalanceEvents.DONATION_GRANTED,
-        balance=user.balance,
-        delta=donation.price_amount,
-    )
-
-
-def consumption_balance_event(*, user: User, order: Order) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user,
-        type=BalanceEvents.CONSUMED,
-        balance=user.balance,
-        delta=-order.total_net_amount,
-    )
-
-
-def donation_rejected_balance_event(*, user: User, donation: Donation) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user,
-        type=BalanceEvents.DONATION_REJECTED,
-        balance=user.balance,
-        delta=-(donation.price_amount or 0),
-    )
-
-
-def refunded_balance_event(*, user: User, amount: Decimal) -> BalanceEvent:
-    return BalanceEvent.objects.create(
-        user=user, type=BalanceEvents.REFUNDED, balance=user.balance, delta=amount
-    )
@@ -0,0 +1,213 @@
+"""The single write path of users' coin balances.
+
+Every change of `User.balance` is posted here. Postings lock the affected user
+rows, apply the deltas with `F()` arithmetic and write the matching
+`BalanceEvent` rows in the same transaction, so the balance events always form
+a complete ledger of the balance.
+"""
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+
+from ..core import MonthlySequenceName
+from ..core.models import MonthlySequence
+from . import BalanceEvents
+from .models import BalanceEvent, BalanceEventArchive, User
+
+
+class InsufficientBalance(Exception):
+    def __init__(self, user_id: int, balance: Decimal, amount: Decimal):
+        super().__init__(f"User {user_id} has {balance} coins, {amount} required.")
+        self.user_id = user_id
+        self.balance = balance
+        self.amount = amount
+
+
+@dataclass
+class Posting:
+    user_id: int
+    delta: Decimal
+    type: str
+    date: Optional[datetime] = None
+
+
+def lock_balances(user_ids: Iterable[int]) -> dict[int, Decimal]:
+    """Lock the users' rows and return their current balances.
+
+    Rows are locked in the primary key order to avoid deadlocks between
+    concurrent batches.
+    """
+    return dict(
+        User.objects.select_for_update()
+        .filter(pk__in=set(user_ids))
+        .order_by("pk")
+        .values_list("pk", "balance")
+    )
+
+
+def _apply_deltas(totals: dict[int, Decimal]):
+    output_field = DecimalField(
+        max_digits=User._meta.get_field("balance").max_digits,
+        decimal_places=User._meta.get_field("balance").decimal_places,
+    )
+    User.objects.filter(pk__in=totals.keys()).update(
+        balance=F("balance")
+        + Case(
+            *[When(pk=user_id, then=Value(total)) for user_id, total in totals.items()],
+            default=Value(Decimal(0)),
+            output_field=output_field,
+        )
+    )
+
+
+def post_many(postings: Iterable[Posting]) -> list[BalanceEvent]:
+    """Apply the postings and record a balance event for every one of them.
+
+    Postings of the same user are applied in the given order and each event
+    stores the balance right after its own posting. All users are updated with a
+    single `UPDATE` and all events are inserted with a single `INSERT`.
+    """
+    postings = list(postings)
+    if not postings:
+        return []
+    with transaction.atomic():
+        balances = lock_balances(posting.user_id for posting in postings)
+        totals: dict[int, Decimal] = defaultdict(Decimal)
+        events = []
+        for posting in postings:
+            if posting.user_id not in balances:
+                raise User.DoesNotExist(f"User {posting.user_id} does not exist.")
+            balances[posting.user_id] += posting.delta
+            totals[posting.user_id] += posting.delta
+            event = BalanceEvent(
+                number=None,
+                user_id=posting.user_id,
+                type=posting.type,
+                balance=balances[posting.user_id],
+                delta=posting.delta,
+            )
+            if posting.date is not None:
+                event.date = posting.date
+            events.append(event)
+        _apply_deltas(totals)
+        MonthlySequence.assign(MonthlySequenceName.BALANCE_EVENT, events)
+        BalanceEvent.objects.bulk_create(events)
+    return events
+
+
+def post(user: User, delta: Decimal, type: str) -> BalanceEvent:
+    """Apply a single posting and update the balance of the given instance."""
+    (event,) = post_many([Posting(user_id=user.pk, delta=delta, type=type)])
+    user.balance = event.balance
+    return event
+
+
+def debit(
+    user: User, amount: Decimal, type: str = BalanceEvents.CONSUMED
+) -> BalanceEvent:
+    """Subtract the amount from the balance or raise `InsufficientBalance`.
+
+    The balance is checked and decremented by a single conditional `UPDATE`, so
+    concurrent debits of a user are serialized by the row lock the statement
+    takes and can never overdraw the balance.
+    """
+    table = connection.ops.quote_name(User._meta.db_table)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET balance = balance - %s "
+                "WHERE id = %s AND balance >= %s RETURNING balance",
+                [amount, user.pk, amount],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            balance = (
+                User.objects.filter(pk=user.pk)
+                .values_list("balance", flat=True)
+                .first()
+            )
+            if balance is None:
+                raise User.DoesNotExist(f"User {user.pk} does not exist.")
+            raise InsufficientBalance(user.pk, balance, amount)
+        event = BalanceEvent(
+            number=None, user_id=user.pk, type=type, balance=row[0], delta=-amount
+        )
+        MonthlySequence.assign(MonthlySequenceName.BALANCE_EVENT, [event])
+        event.save()
+    user.balance = event.balance
+    return event
+
+
+def open_balance(user: User) -> BalanceEvent:
+    """Record the balance the user was created with as the opening event.
+
+    The balance itself is not changed, the opening event starts the ledger of the
+    user so the balance events sum up to the balance from the beginning.
+    """
+    return BalanceEvent.objects.create(
+        number=None,
+        user_id=user.pk,
+        type=BalanceEvents.OPENING_BALANCE,
+        balance=user.balance,
+        delta=user.balance,
+        date=user.date_joined,
+    )
+
+
+def set_balance(
+    user: User, balance: Decimal, type: str = BalanceEvents.MANUALLY_UPDATED
+) -> Optional[BalanceEvent]:
+    """Post the difference between the given and the current balance."""
+    with transaction.atomic():
+        current = lock_balances([user.pk])[user.pk]
+        if current == balance:
+            user.balance = current
+            return None
+        return post(user, balance - current, type)
+
+
+def _sum_deltas(model):
+    deltas = (
+        model.objects.filter(user=OuterRef("pk"))
+        .order_by()
+        .values("user")
+        .annotate(total=Sum("delta"))
+        .values("total")
+    )
+    return Coalesce(
+        Subquery(deltas, output_field=DecimalField()),
+        Value(Decimal(0)),
+        output_field=DecimalField(),
+    )
+
+
+def get_ledger_discrepancies(users=None):
+    """Return users whose balance differs from the sum of their balance events.
+
+    Events moved to the archive by the retention are included in the sum.
+    """
+    if users is None:
+        users = User.objects.all()
+    return (
+        users.annotate(
+            ledger_balance=_sum_deltas(BalanceEvent) + _sum_deltas(BalanceEventArchive),
+        )
+        .exclude(balance=F("ledger_balance"))
+        .order_by("pk")
+    )
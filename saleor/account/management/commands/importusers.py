@@ -1,125 +1,275 @@
 import datetime
 import json
-from decimal import Decimal
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from decimal import Decimal, InvalidOperation
+from itertools import islice
 
 import pytz
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from django.db.models import F
+from django.db.models import OuterRef, Subquery
 
-from saleor.account import BalanceEvents
-
-from ....account.models import BalanceEvent, User
-from ....order.utils import match_orders_with_new_user
-from ....site.models import Site, SiteStatistics
+from ....core import MonthlySequenceName
+from ....core.models import MonthlySequence
+from ....core.utils.date_time import get_year_month
+from ....order.models import Order
+from ....site.models import Site
+from ....site.statistics import increment_site_statistics
+from ... import BalanceEvents
+from ...continuous_login import get_login_day
+from ...models import BalanceEvent, User
 from ...search import prepare_user_search_document_value
 
+TIMEZONE = pytz.timezone("Asia/Shanghai")
+READ_SIZE = 1 << 16
+
+
+def iter_json_array(stream, read_size: int = READ_SIZE) -> Iterator:
+    """Yield items of the top level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def skip_whitespace():
+        nonlocal buffer, position, eof
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            buffer = stream.read(read_size)
+            position = 0
+            eof = not buffer
+
+    def expect(characters: str) -> str:
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] not in characters:
+            raise json.JSONDecodeError(
+                "Expecting one of %r" % characters, buffer, position
+            )
+        return buffer[position]
+
+    expect("[")
+    position += 1
+    skip_whitespace()
+    if position < len(buffer) and buffer[position] == "]":
+        return
+    while True:
+        skip_whitespace()
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            item, end = None, None
+        # A value touching the end of the buffer may be truncated, read more.
+        if end is None or (end == len(buffer) and not eof):
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+            chunk = stream.read(read_size)
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = not chunk
+            continue
+        yield item
+        position = end
+        if expect(",]") == "]":
+            return
+        position += 1
+
+
+def chunked(iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def parse_date(value: str) -> datetime.datetime:
+    return TIMEZONE.localize(datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S"))
+
 
 class Command(BaseCommand):
-    help = "Used to import users from a single JSON file."
+    help = (
+        "Used to import users from a single JSON file. Accounts are imported in "
+        "chunks, each in its own transaction; already imported accounts are "
+        "skipped, so an interrupted import can be resumed by running it again."
+    )
     requires_migrations_checks = True
 
     def add_arguments(self, parser):
         parser.add_argument("json_file", nargs=1, type=str)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of accounts imported in a single transaction.",
+        )
 
     def handle(self, *args, **options):
         file = options["json_file"][0]
-        try:
-            users = json.load(open(file))
-        except OSError:
-            raise CommandError("Failed to open file %s" % file)
-        except json.JSONDecodeError:
-            raise CommandError("%s does not seem to be a valid JSON file." % file)
-        
-        # 查询数据库里用户 jaccount 列表
-        db_user_accounts = User.objects.values_list('account', flat=True)
-        db_user_set = set(db_user_accounts)
-
-        # 查询待导入的用户列表
-        file_user_set = set([user["userinfo"]["jaccount"] for user in users])
-
-        # 构建差集
-        do_import_user_set = file_user_set - db_user_set
-        duplicate = len(file_user_set) - len(do_import_user_set)
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive number.")
 
-        # 准备导入
         configuration = {
             item["name"]: item["value"]
             for item in settings.OPENID_PROVIDER_SETTINGS.get(settings.OPENID_PROVIDER)
         }
         oauth_url = configuration.get("oauth_authorization_url")
-        oidc_metadata_key = f"oidc:{oauth_url}"
-        
-        log_number_dic = {}
-        for user in users:
-            userInfo = user["userinfo"]
-            if (userInfo.get("jaccount") not in do_import_user_set):
-                continue;
-            defaults_create = {
-                "is_active": True,
-                "is_confirmed": True,
-                "email": userInfo.get("email"),
-                "account": userInfo.get("jaccount"),
-                "user_type": "student",
-                "first_name": userInfo.get("username"),
-                "last_name": "",
-                "code": "",
-                "private_metadata": {oidc_metadata_key: userInfo.get("jaccount")},
-                "password": make_password(None),
-                "balance": Decimal(userInfo.get("coins")),
-                "continuous": int(userInfo.get("continuous")),
-                "last_login": datetime.datetime.strptime(
-                    userInfo.get("last_login"), "%Y-%m-%d %H:%M:%S"
-                ).replace(tzinfo=pytz.timezone("Asia/Shanghai")),
-            }
-            with transaction.atomic():
-                user_object, _ = User.objects.get_or_create(
-                    email=user.get("email"),
-                    defaults=defaults_create,
-                )
-                user_object.search_document = prepare_user_search_document_value(
-                    user_object, attach_addresses_data=False
-                )
-                user_object.save(update_fields=["search_document"])
-                match_orders_with_new_user(user_object)
-            coinlogs = user["coinlog"]
-            bulk_data = []
-
-            for log in coinlogs:
-                num = log_number_dic.get(log.get("date")[:7], 0) + 1
-                log_number_dic[log.get("date")[:7]] = num
-                bulk_data.append(
-                    BalanceEvent(
-                        user=user_object,
-                        type=log.get("type"),
-                        balance=log.get("balance"),
-                        delta=log.get("delta"),
-                        date=datetime.datetime.strptime(
-                            log.get("date"), "%Y-%m-%d %H:%M:%S"
-                        ).replace(tzinfo=pytz.timezone("Asia/Shanghai")),
-                        number=num
+        self.oidc_metadata_key = f"oidc:{oauth_url}"
+        self.password = make_password(None)
+        self.site_id = self.get_site().pk
+
+        imported = skipped = processed = 0
+        started_at = time.monotonic()
+        try:
+            with open(file, encoding="utf-8") as stream:
+                for chunk in chunked(iter_json_array(stream), chunk_size):
+                    chunk_imported = self.import_chunk(chunk)
+                    processed += len(chunk)
+                    imported += chunk_imported
+                    skipped += len(chunk) - chunk_imported
+                    elapsed = time.monotonic() - started_at
+                    self.stdout.write(
+                        f"Processed {processed} accounts: {imported} imported, "
+                        f"{skipped} skipped ({processed / elapsed:.0f} accounts/s)."
                     )
-                )
+        except OSError:
+            raise CommandError(f"Failed to open file {file}")
+        except (
+            json.JSONDecodeError,
+            InvalidOperation,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as e:
+            raise CommandError(
+                f"{file} does not seem to be a valid users file: {e}. Accounts "
+                "processed before the error are imported, run the command again "
+                "after fixing the file to resume."
+            )
 
-            BalanceEvent.objects.bulk_create(
-                bulk_data
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully imported {imported} of {processed} accounts, "
+                f"{skipped} skipped."
             )
+        )
 
+    def get_site(self) -> Site:
         site, _ = Site.objects.get_or_create(id=settings.SITE_ID)
         if not site.domain or not site.name:
             site.name = settings.SITE_NAME
             site.domain = settings.SITE_DOMAIN
             site.save(update_fields=["name", "domain"])
-        try:
-            stat = site.stat
-        except:
-            stat = SiteStatistics.objects.get_or_create(site=site)
-        SiteStatistics.objects.filter(id=stat.id).update(users=F("users") + len(do_import_user_set))
-        self.stdout.write(
-            self.style.SUCCESS(
-                "Successfully imported %d of %d accounts, %d skipped."
-                % (len(do_import_user_set), len(file_user_set), duplicate)
-            )
+        return site
+
+    def build_user(self, userinfo: dict) -> User:
+        last_login = parse_date(userinfo["last_login"])
+        user = User(
+            is_active=True,
+            is_confirmed=True,
+            email=User.objects.normalize_email(userinfo["email"]),
+            account=userinfo["jaccount"],
+            user_type="student",
+            first_name=userinfo.get("username") or "",
+            last_name="",
+            code="",
+            private_metadata={self.oidc_metadata_key: userinfo["jaccount"]},
+            password=self.password,
+            balance=Decimal(userinfo.get("coins") or 0),
+            continuous=int(userinfo.get("continuous") or 0),
+            last_login=last_login,
+            last_streak_day=get_login_day(last_login),
+        )
+        user.search_document = prepare_user_search_document_value(
+            user, attach_addresses_data=False
         )
+        return user
+
+    def import_chunk(self, records: list[dict]) -> int:
+        """Import the not yet existing accounts and return how many were created."""
+        accounts = {record["userinfo"]["jaccount"] for record in records}
+        emails = {
+            User.objects.normalize_email(record["userinfo"]["email"])
+            for record in records
+        }
+        with transaction.atomic():
+            existing_accounts = set(
+                User.objects.filter(account__in=accounts).values_list(
+                    "account", flat=True
+                )
+            )
+            existing_emails = set(
+                User.objects.filter(email__in=emails).values_list("email", flat=True)
+            )
+
+            users, coinlogs = [], []
+            for record in records:
+                user = self.build_user(record["userinfo"])
+                if user.account in existing_accounts or user.email in existing_emails:
+                    continue
+                existing_accounts.add(user.account)
+                existing_emails.add(user.email)
+                users.append(user)
+                coinlogs.append(record.get("coinlog") or [])
+            if not users:
+                return 0
+
+            User.objects.bulk_create(users)
+            self.create_balance_events(users, coinlogs)
+            Order.objects.confirmed().filter(
+                user=None, user_email__in=[user.email for user in users]
+            ).update(
+                user_id=Subquery(
+                    User.objects.filter(email=OuterRef("user_email")).values("pk")[:1]
+                )
+            )
+            transaction.on_commit(
+                lambda: increment_site_statistics(
+                    site_id=self.site_id, users=len(users)
+                )
+            )
+        return len(users)
+
+    def create_balance_events(self, users: list[User], coinlogs: list[list[dict]]):
+        events_by_month = defaultdict(list)
+        for user, logs in zip(users, coinlogs):
+            dates = [parse_date(log["date"]) for log in logs]
+            # The imported logs don't have to add up to the imported balance, the
+            # opening event covers the coins the logs don't account for.
+            opening = user.balance - sum(
+                (Decimal(str(log.get("delta") or 0)) for log in logs), Decimal(0)
+            )
+            if opening:
+                opening_date = min(dates, default=user.date_joined)
+                events_by_month[get_year_month(opening_date)].append(
+                    BalanceEvent(
+                        user=user,
+                        type=BalanceEvents.OPENING_BALANCE,
+                        balance=opening,
+                        delta=opening,
+                        date=opening_date,
+                        number=None,
+                    )
+                )
+            for log, date in zip(logs, dates):
+                events_by_month[get_year_month(date)].append(
+                    BalanceEvent(
+                        user=user,
+                        type=log.get("type"),
+                        balance=log.get("balance"),
+                        delta=log.get("delta"),
+                        date=date,
+                        number=None,
+                    )
+                )
+        events = []
+        for year_month, month_events in events_by_month.items():
+            events += MonthlySequence.assign(
+                MonthlySequenceName.BALANCE_EVENT, month_events, year_month=year_month
+            )
+        BalanceEvent.objects.bulk_create(events, batch_size=5000)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ....account.ledger import get_ledger_discrepancies, lock_balances
+from ....account.models import User
+
+
+class Command(BaseCommand):
+    help = "Compare users' balances with their coin logs and optionally fix them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Set the balances to the sum of the coin logs.",
+        )
+
+    def handle(self, *args, **options):
+        discrepancies = get_ledger_discrepancies()
+        count = 0
+        for user in discrepancies.iterator():
+            count += 1
+            self.stdout.write(
+                f"{user.email}: balance {user.balance}, "
+                f"coin logs {user.ledger_balance}"
+            )
+            if not options["fix"]:
+                continue
+            with transaction.atomic():
+                # Recompute under the row lock, the balance could have been
+                # changed by a posting since the discrepancy was found.
+                lock_balances([user.pk])
+                current = get_ledger_discrepancies(
+                    User.objects.filter(pk=user.pk)
+                ).first()
+                if current:
+                    User.objects.filter(pk=user.pk).update(
+                        balance=current.ledger_balance
+                    )
+
+        if options["fix"]:
+            message = f"Fixed {count} balances"
+        else:
+            message = f"Found {count} balances"
+        self.stdout.write(self.style.SUCCESS(message))
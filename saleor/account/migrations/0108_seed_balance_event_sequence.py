@@ -0,0 +1,37 @@
+# Generated by Django 3.2.24 on 2026-10-17 09:30
+
+from django.db import migrations
+from django.db.models import Max
+from django.db.models.functions import TruncMonth
+
+
+def seed_balance_event_sequence(apps, _schema_editor):
+    BalanceEvent = apps.get_model("account", "BalanceEvent")
+    MonthlySequence = apps.get_model("core", "MonthlySequence")
+    rows = (
+        BalanceEvent.objects.annotate(month=TruncMonth("date"))
+        .values("month")
+        .annotate(last_value=Max("number"))
+        .order_by()
+    )
+    MonthlySequence.objects.bulk_create(
+        [
+            MonthlySequence(
+                name="balance_event",
+                year_month=int(row["month"].strftime("%y%m")),
+                last_value=row["last_value"] or 0,
+            )
+            for row in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0107_alter_user_options"),
+        ("core", "0011_monthlysequence"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_balance_event_sequence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.24 on 2026-10-17 10:00
+
+from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0108_seed_balance_event_sequence"),
+    ]
+
+    atomic = False
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="balanceevent",
+            index=BTreeIndex(
+                fields=["user", "date", "id"], name="balanceevent_user_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="balanceevent",
+            index=BTreeIndex(fields=["date", "id"], name="balanceevent_date_idx"),
+        ),
+    ]
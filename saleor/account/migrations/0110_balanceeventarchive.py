@@ -0,0 +1,59 @@
+# Generated by Django 3.2.24 on 2026-10-17 10:00
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0109_balance_event_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceEventArchive",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("date", models.DateTimeField()),
+                ("type", models.CharField(max_length=255)),
+                ("number", models.IntegerField(blank=True, null=True)),
+                (
+                    "balance",
+                    models.DecimalField(
+                        blank=True, decimal_places=3, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "delta",
+                    models.DecimalField(
+                        blank=True, decimal_places=3, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_balance_events",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("date",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="balanceeventarchive",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["user", "date"], name="balanceeventarchive_user_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.24 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0110_balanceeventarchive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingLogin",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("login_time", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("pk",),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pendinglogin",
+            constraint=models.UniqueConstraint(
+                fields=("user", "day"), name="pendinglogin_user_day_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 3.2.24 on 2026-10-17 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0111_pendinglogin"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="balanceevent",
+            options={"ordering": ("date", "pk")},
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.24 on 2026-10-17 14:00
+
+from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0112_alter_balanceevent_options"),
+    ]
+
+    atomic = False
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="user",
+            index=BTreeIndex(fields=["code"], name="user_code_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=BTreeIndex(fields=["account"], name="user_account_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.24 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0113_user_code_account_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="balanceevent",
+            name="number",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 3.2.24 on 2026-10-18 12:00
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import DecimalField, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def _aggregate(model, aggregate, output_field):
+    rows = (
+        model.objects.filter(user=OuterRef("pk"))
+        .order_by()
+        .values("user")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+    return Subquery(rows, output_field=output_field)
+
+
+def seed_opening_balances(apps, _schema_editor):
+    """Record the part of every balance the coin logs don't account for.
+
+    Balances users were created with were never posted and part of the coin logs
+    was deleted, the opening events make the coin logs add up to the balances.
+    Users whose coin logs already add up get no opening event.
+    """
+    User = apps.get_model("account", "User")
+    BalanceEvent = apps.get_model("account", "BalanceEvent")
+    BalanceEventArchive = apps.get_model("account", "BalanceEventArchive")
+    decimal_field = DecimalField()
+    users = (
+        User.objects.annotate(
+            live_sum=Coalesce(
+                _aggregate(BalanceEvent, Sum("delta"), decimal_field),
+                Value(Decimal(0)),
+                output_field=decimal_field,
+            ),
+            archived_sum=Coalesce(
+                _aggregate(BalanceEventArchive, Sum("delta"), decimal_field),
+                Value(Decimal(0)),
+                output_field=decimal_field,
+            ),
+            first_live_date=_aggregate(
+                BalanceEvent, Min("date"), models.DateTimeField()
+            ),
+            first_archived_date=_aggregate(
+                BalanceEventArchive, Min("date"), models.DateTimeField()
+            ),
+        )
+        .order_by("pk")
+        .values_list(
+            "pk",
+            "balance",
+            "date_joined",
+            "live_sum",
+            "archived_sum",
+            "first_live_date",
+            "first_archived_date",
+        )
+    )
+    events = []
+    for pk, balance, date_joined, live_sum, archived_sum, *dates in users.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        opening = balance - live_sum - archived_sum
+        if not opening:
+            continue
+        events.append(
+            BalanceEvent(
+                user_id=pk,
+                type="opening_balance",
+                balance=opening,
+                delta=opening,
+                date=min([date for date in dates if date] + [date_joined]),
+            )
+        )
+        if len(events) >= BATCH_SIZE:
+            BalanceEvent.objects.bulk_create(events)
+            events = []
+    BalanceEvent.objects.bulk_create(events)
+
+
+def delete_opening_balances(apps, _schema_editor):
+    BalanceEvent = apps.get_model("account", "BalanceEvent")
+    BalanceEvent.objects.filter(type="opening_balance").delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0114_alter_balanceevent_number"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="balanceevent",
+            name="type",
+            field=models.CharField(
+                choices=[
+                    ("DONATION_GRANTED", "donation_granted"),
+                    ("DONATION_REJECTED", "donation_rejected"),
+                    ("FIRST_LOGIN", "first_login"),
+                    ("MANUALLY_UPDATED", "manually_updated"),
+                    ("CONSECUTIVE_LOGIN", "consecutive_login"),
+                    ("CONSUMED", "consumed"),
+                    ("REFUNDED", "refunded"),
+                    ("INVITE_NEW_USER", "invite_new_user"),
+                    ("SPECIAL_EVENT", "special_event"),
+                    ("BONUS", "bonus"),
+                    ("POOR_SIGN", "poor_sign"),
+                    ("OTHER", "other"),
+                    ("INVITATION_ACCEPTED", "invitation_accepted"),
+                    ("OPENING_BALANCE", "opening_balance"),
+                ],
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(seed_opening_balances, delete_opening_balances),
+    ]
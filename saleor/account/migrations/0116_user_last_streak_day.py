@@ -0,0 +1,31 @@
+# Generated by Django 3.2.24 on 2026-10-18 12:30
+
+import pytz
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+import saleor.account.models
+
+
+def set_last_streak_day(apps, _schema_editor):
+    User = apps.get_model("account", "User")
+    User.objects.update(
+        last_streak_day=TruncDate("last_login", tzinfo=pytz.timezone("Asia/Shanghai"))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0115_opening_balance_events"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="last_streak_day",
+            field=models.DateField(
+                default=saleor.account.models.get_default_streak_day
+            ),
+        ),
+        migrations.RunPython(set_last_streak_day, migrations.RunPython.noop),
+    ]
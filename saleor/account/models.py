@@ -1,5 +1,4 @@
 from collections.abc import Iterable
-from datetime import datetime
 from decimal import Decimal
 from functools import partial
 from typing import Union
@@ -7,8 +6,8 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
-from django.contrib.postgres.indexes import GinIndex
-from django.db import connection, models
+from django.contrib.postgres.indexes import BTreeIndex, GinIndex
+from django.db import models, transaction
 from django.db.models import JSONField, Q, Value
 from django.db.models.expressions import Exists, OuterRef
 from django.forms.models import model_to_dict
@@ -18,7 +17,12 @@ from django_countries.fields import Country, CountryField
 from phonenumber_field.modelfields import PhoneNumber, PhoneNumberField
 
 from ..app.models import App
-from ..core.models import ModelWithExternalReference, ModelWithMetadata
+from ..core import MonthlySequenceName
+from ..core.models import (
+    ModelWithExternalReference,
+    ModelWithMetadata,
+    MonthlySequence,
+)
 from ..core.utils.json_serializer import CustomJsonEncoder
 from ..order.models import Order
 from ..permission.enums import AccountPermissions, BasePermissionEnum, get_permissions
@@ -121,7 +125,36 @@ class Address(ModelWithMetadata):
         return Address.objects.create(**self.as_data())
 
 
-class UserManager(BaseUserManager["User"]):
+def get_default_streak_day():
+    from .continuous_login import get_login_day
+
+    return get_login_day(timezone.now())
+
+
+def _delete_user_snapshots(fields: Iterable[str]):
+    # Bulk writes don't send `post_save`, so the snapshots of all users are dropped
+    # when a field stored in them changes.
+    from ..core.auth_cache import USER_SNAPSHOT_FIELDS, delete_all_user_snapshots
+
+    if set(fields) & set(USER_SNAPSHOT_FIELDS):
+        delete_all_user_snapshots()
+        transaction.on_commit(delete_all_user_snapshots)
+
+
+class UserQueryset(models.QuerySet["User"]):
+    def update(self, **kwargs):
+        updated = super().update(**kwargs)
+        if updated:
+            _delete_user_snapshots(kwargs)
+        return updated
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        result = super().bulk_update(objs, fields, batch_size=batch_size)
+        _delete_user_snapshots(fields)
+        return result
+
+
+class UserManager(BaseUserManager.from_queryset(UserQueryset)):  # type: ignore[misc]
     def create_user(
         self, email, password=None, is_staff=False, is_active=True, **extra_fields
     ):
@@ -185,6 +218,9 @@ class User(
     note = models.TextField(null=True, blank=True)
     date_joined = models.DateTimeField(default=timezone.now, editable=False)
     continuous = models.IntegerField(blank=True, default=1)
+    # The last login day counted in the streak; `last_login` is overwritten by
+    # the login mutations before the streak is processed.
+    last_streak_day = models.DateField(default=get_default_streak_day)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
     last_login = models.DateTimeField(default=timezone.now)
     last_password_reset_request = models.DateTimeField(null=True, blank=True)
@@ -237,12 +273,24 @@ class User(
                 fields=["private_metadata"],
                 opclasses=["jsonb_path_ops"],
             ),
+            # Donator and jAccount lookups
+            BTreeIndex(fields=["code"], name="user_code_idx"),
+            BTreeIndex(fields=["account"], name="user_account_idx"),
         ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._effective_permissions = None
 
+    def refresh_from_db(self, using=None, fields=None):
+        # Users restored from the auth snapshot defer most of the fields; the first
+        # access of any of them loads them all instead of one query per field.
+        if fields is not None and getattr(self, "_load_deferred_together", False):
+            deferred_fields = self.get_deferred_fields()
+            if deferred_fields.issuperset(fields):
+                fields = deferred_fields
+        super().refresh_from_db(using=using, fields=fields)
+
     def __str__(self):
         # Override the default __str__ of AbstractUser that returns username, which may
         # lead to leaking sensitive data in logs.
@@ -407,9 +455,7 @@ class CustomerEvent(models.Model):
 
 
 def get_balance_event_number():
-    now = timezone.now()
-    current_year_month = datetime(now.year, now.month, 1, tzinfo=now.tzinfo)
-    return BalanceEvent.objects.filter(date__gte=current_year_month).count() + 1
+    return MonthlySequence.next_value(MonthlySequenceName.BALANCE_EVENT)
 
 
 class BalanceEvent(models.Model):
@@ -423,9 +469,7 @@ class BalanceEvent(models.Model):
         ],
     )
 
-    number = models.IntegerField(
-        null=True, blank=True, default=get_balance_event_number
-    )
+    number = models.IntegerField(null=True, blank=True)
 
     user = models.ForeignKey(
         User, related_name="balance_events", on_delete=models.CASCADE, null=True
@@ -445,11 +489,83 @@ class BalanceEvent(models.Model):
     )
 
     class Meta:
-        ordering = ("date",)
+        ordering = ("date", "pk")
+        indexes = [
+            # Customer's own history, sorted by date
+            BTreeIndex(
+                fields=["user", "date", "id"], name="balanceevent_user_date_idx"
+            ),
+            # Staff history of all users, sorted by date
+            BTreeIndex(fields=["date", "id"], name="balanceevent_date_idx"),
+        ]
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
 
+    def save(self, *args, **kwargs):
+        # Numbers are allocated on insert only, so unsaved events don't use them.
+        if self._state.adding and self.number is None:
+            self.number = get_balance_event_number()
+        super().save(*args, **kwargs)
+
+
+class BalanceEventArchive(models.Model):
+    """Balance events moved out of the live table by the retention.
+
+    The rows keep the primary keys of the original events, so the coin history
+    of a user can still be audited and reconciled.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    date = models.DateTimeField()
+    type = models.CharField(max_length=255)
+    number = models.IntegerField(null=True, blank=True)
+    user = models.ForeignKey(
+        User,
+        related_name="archived_balance_events",
+        on_delete=models.CASCADE,
+        null=True,
+    )
+    balance = models.DecimalField(
+        blank=True,
+        null=True,
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+    )
+    delta = models.DecimalField(
+        blank=True,
+        null=True,
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+    )
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ("date",)
+        indexes = [
+            BTreeIndex(fields=["user", "date"], name="balanceeventarchive_user_idx"),
+        ]
+
+
+class PendingLogin(models.Model):
+    """Login of a user awaiting the update of their login streak.
+
+    At most one login per user and day is queued; the streak and its credits are
+    processed in batches by `process_pending_logins`.
+    """
+
+    user = models.ForeignKey(User, related_name="+", on_delete=models.CASCADE)
+    day = models.DateField()
+    login_time = models.DateTimeField()
+
+    class Meta:
+        ordering = ("pk",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "day"], name="pendinglogin_user_day_unique"
+            ),
+        ]
+
 
 class StaffNotificationRecipient(models.Model):
     user = models.OneToOneField(
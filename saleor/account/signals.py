@@ -1,6 +1,30 @@
+from django.db import transaction
+
+from ..core.auth_cache import delete_all_user_snapshots, delete_user_snapshot
 from ..core.tasks import delete_from_storage_task
+from . import ledger
 
 
 def delete_avatar(sender, instance, **kwargs):
     if avatar := instance.avatar:
         delete_from_storage_task.delay(avatar.name)
+
+
+def delete_user_auth_snapshot(sender, instance, **kwargs):
+    # Drop the snapshot again after commit, other requests could have stored the
+    # old state of the user while the transaction was open.
+    delete_user_snapshot(instance)
+    transaction.on_commit(lambda: delete_user_snapshot(instance))
+
+
+def delete_all_auth_snapshots(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        delete_all_user_snapshots()
+
+
+def open_user_balance(sender, instance, created, raw=False, **kwargs):
+    # The balance a user is created with is not posted, the opening event keeps
+    # the coin logs of the user complete. Users starting with no coins don't
+    # need one.
+    if created and not raw and instance.balance:
+        ledger.open_balance(instance)
@@ -0,0 +1,12 @@
+from celery.utils.log import get_task_logger
+
+from ..celeryconf import app
+from .continuous_login import process_pending_logins
+
+task_logger = get_task_logger(__name__)
+
+
+@app.task
+def process_pending_logins_task():
+    count = process_pending_logins()
+    task_logger.debug("Processed %s pending logins", count)
@@ -1,9 +1,16 @@
+import io
+import json
 import os
+from datetime import date
+from decimal import Decimal
 from unittest import mock
 
 from django.core.management import call_command
 
-from ..models import Group, User
+from .. import BalanceEvents
+from ..ledger import get_ledger_discrepancies
+from ..management.commands.importusers import iter_json_array
+from ..models import BalanceEvent, Group, User
 
 
 def test_createsuperuser_command(db):
@@ -51,3 +58,131 @@ def test_createsuperuser_command_email_from_settings(db):
     )
     assert Group.objects.count() == 1
     assert Group.objects.get(name="Full Access")
+
+
+def test_reconcilebalances_command_fix(customer_user):
+    # given
+    opening_balance = customer_user.balance
+    customer_user.balance = Decimal(42)
+    customer_user.save(update_fields=["balance"])
+    BalanceEvent.objects.create(user=customer_user, delta=Decimal(7), balance=7)
+
+    # when
+    call_command("reconcilebalances", fix=True)
+
+    # then
+    customer_user.refresh_from_db()
+    assert customer_user.balance == opening_balance + Decimal(7)
+
+
+def test_reconcilebalances_command_fix_user_without_opening_balance(db):
+    # given
+    user = User.objects.create_user("new@example.com", balance=Decimal(0))
+    BalanceEvent.objects.create(user=user, delta=Decimal(7), balance=7)
+
+    # when
+    call_command("reconcilebalances", fix=True)
+
+    # then
+    user.refresh_from_db()
+    assert user.balance == Decimal(7)
+
+
+def test_iter_json_array_reads_in_small_chunks():
+    # given
+    items = [{"a": [1, 2, {"b": "]"}]}, 3, "x", {}]
+    stream = io.StringIO(" \n" + json.dumps(items, indent=2))
+
+    # when
+    result = list(iter_json_array(stream, read_size=3))
+
+    # then
+    assert result == items
+
+
+def _import_record(jaccount, coinlogs=()):
+    return {
+        "userinfo": {
+            "jaccount": jaccount,
+            "email": f"{jaccount}@sjtu.edu.cn",
+            "username": jaccount,
+            "coins": "10",
+            "continuous": "2",
+            "last_login": "2023-05-01 12:00:00",
+        },
+        "coinlog": list(coinlogs),
+    }
+
+
+def test_importusers_command_is_resumable(db, tmp_path, order):
+    # given
+    coinlog = {
+        "type": "BONUS",
+        "balance": "10",
+        "delta": "10",
+        "date": "2023-04-30 08:00:00",
+    }
+    records = [_import_record(f"user{i}", [coinlog]) for i in range(5)]
+    order.user = None
+    order.user_email = "user3@sjtu.edu.cn"
+    order.save(update_fields=["user", "user_email"])
+    User.objects.create(email="user1@sjtu.edu.cn", account="user1")
+    file = tmp_path / "users.json"
+    file.write_text(json.dumps(records))
+
+    # when
+    call_command("importusers", str(file), chunk_size=2)
+    call_command("importusers", str(file), chunk_size=2)
+
+    # then
+    assert User.objects.filter(account__startswith="user").count() == 5
+    user = User.objects.get(account="user3")
+    assert user.search_document
+    assert user.balance == Decimal(10)
+    order.refresh_from_db()
+    assert order.user == user
+    events = BalanceEvent.objects.filter(user__account__startswith="user").exclude(
+        user__account="user1"
+    )
+    # The coin logs add up to the balances, no opening events are recorded.
+    assert events.count() == 4
+    assert len(set(events.values_list("number", flat=True))) == 4
+
+
+def test_importusers_command_records_opening_balances(db, tmp_path):
+    # given
+    coinlog = {
+        "type": "BONUS",
+        "balance": "10",
+        "delta": "4",
+        "date": "2023-04-30 08:00:00",
+    }
+    file = tmp_path / "users.json"
+    file.write_text(json.dumps([_import_record("user0", [coinlog])]))
+
+    # when
+    call_command("importusers", str(file))
+
+    # then
+    opening, bonus = BalanceEvent.objects.filter(user__account="user0").order_by("pk")
+    assert opening.type == BalanceEvents.OPENING_BALANCE
+    assert opening.delta == Decimal(6)
+    assert opening.date == bonus.date
+    users = User.objects.filter(account="user0")
+    assert not get_ledger_discrepancies(users).exists()
+
+
+def test_importusers_command_sets_last_streak_day_from_last_login(db, tmp_path):
+    # given
+    record = _import_record("user0")
+    record["userinfo"]["last_login"] = "2023-05-01 23:30:00"
+    file = tmp_path / "users.json"
+    file.write_text(json.dumps([record]))
+
+    # when
+    call_command("importusers", str(file))
+
+    # then
+    user = User.objects.get(account="user0")
+    assert user.continuous == 2
+    assert user.last_streak_day == date(2023, 5, 1)
@@ -0,0 +1,124 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytz
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .. import BalanceEvents
+from ..continuous_login import (
+    process_pending_logins,
+    record_login,
+    update_streak,
+)
+from ..models import PendingLogin
+
+TIMEZONE = pytz.timezone("Asia/Shanghai")
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.parametrize(
+    ("continuous", "days", "expected_continuous", "expected_credit"),
+    [
+        (1, 0, 1, Decimal(0)),
+        (1, 1, 2, Decimal("1.0")),
+        (2, 1, 3, Decimal("2.0")),
+        (5, 1, 6, Decimal("2.0")),
+        (5, 3, 1, Decimal("0.5")),
+    ],
+)
+def test_update_streak(continuous, days, expected_continuous, expected_credit):
+    # given
+    last_streak_day = date(2024, 3, 1)
+    login_time = TIMEZONE.localize(datetime(2024, 3, 1 + days, 0, 10))
+
+    # when
+    result = update_streak(continuous, last_streak_day, login_time)
+
+    # then
+    assert result == (expected_continuous, expected_credit)
+
+
+def test_record_login_deduplicates_logins_of_a_day(
+    customer_user, django_capture_on_commit_callbacks
+):
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        for _ in range(3):
+            record_login(customer_user)
+
+    # then
+    assert PendingLogin.objects.filter(user=customer_user).count() == 1
+
+
+def test_record_login_does_not_lock_user(
+    customer_user, django_capture_on_commit_callbacks
+):
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            record_login(customer_user)
+
+    # then
+    assert not any("FOR UPDATE" in query["sql"] for query in queries)
+
+
+def test_process_pending_logins_grants_credits_once(customer_user):
+    # given
+    login_time = TIMEZONE.localize(datetime(2024, 3, 2, 0, 10))
+    customer_user.continuous = 1
+    customer_user.last_streak_day = date(2024, 3, 1)
+    customer_user.save(update_fields=["continuous", "last_streak_day"])
+    balance = customer_user.balance
+    PendingLogin.objects.create(
+        user=customer_user,
+        day=login_time.astimezone(TIMEZONE).date(),
+        login_time=login_time,
+    )
+
+    # when
+    processed = process_pending_logins()
+    PendingLogin.objects.create(
+        user=customer_user,
+        day=login_time.astimezone(TIMEZONE).date(),
+        login_time=login_time,
+    )
+    processed_again = process_pending_logins()
+
+    # then
+    assert (processed, processed_again) == (1, 1)
+    assert not PendingLogin.objects.exists()
+    customer_user.refresh_from_db()
+    assert customer_user.continuous == 2
+    assert customer_user.last_streak_day == date(2024, 3, 2)
+    assert customer_user.balance == balance + Decimal("1.0")
+    events = customer_user.balance_events.filter(type=BalanceEvents.CONSECUTIVE_LOGIN)
+    assert events.count() == 1
+    assert events.get().date == login_time
+
+
+def test_process_pending_logins_in_batches(customer_user, staff_user):
+    # given
+    login_time = timezone.now() + timedelta(days=1)
+    for user in [customer_user, staff_user]:
+        PendingLogin.objects.create(
+            user=user,
+            day=login_time.astimezone(TIMEZONE).date(),
+            login_time=login_time,
+        )
+
+    # when
+    processed = process_pending_logins(batch_size=1)
+
+    # then
+    assert processed == 2
+    assert not PendingLogin.objects.exists()
@@ -0,0 +1,158 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from .. import BalanceEvents, ledger
+from ..models import BalanceEvent, BalanceEventArchive, User
+from ..utils import archive_balance_events
+
+
+@pytest.fixture
+def customer_with_balance(customer_user):
+    customer_user.balance = Decimal(10)
+    customer_user.save(update_fields=["balance"])
+    customer_user.balance_events.update(balance=Decimal(10), delta=Decimal(10))
+    return customer_user
+
+
+def test_post_updates_balance_and_records_event(customer_with_balance):
+    # when
+    event = ledger.post(customer_with_balance, Decimal(5), BalanceEvents.BONUS)
+
+    # then
+    assert customer_with_balance.balance == Decimal(15)
+    customer_with_balance.refresh_from_db()
+    assert customer_with_balance.balance == Decimal(15)
+    assert event.pk
+    assert event.balance == Decimal(15)
+    assert event.delta == Decimal(5)
+    assert event.number
+
+
+def test_post_many_records_running_balances(customer_with_balance, customer_user2):
+    # given
+    customer_user2.balance = Decimal(0)
+    customer_user2.save(update_fields=["balance"])
+    postings = [
+        ledger.Posting(customer_with_balance.pk, Decimal(1), BalanceEvents.BONUS),
+        ledger.Posting(customer_user2.pk, Decimal(2), BalanceEvents.BONUS),
+        ledger.Posting(customer_with_balance.pk, Decimal(3), BalanceEvents.BONUS),
+    ]
+
+    # when
+    events = ledger.post_many(postings)
+
+    # then
+    assert [event.balance for event in events] == [
+        Decimal(11),
+        Decimal(2),
+        Decimal(14),
+    ]
+    customer_with_balance.refresh_from_db()
+    customer_user2.refresh_from_db()
+    assert customer_with_balance.balance == Decimal(14)
+    assert customer_user2.balance == Decimal(2)
+    assert len({event.number for event in events}) == 3
+
+
+def test_debit_with_insufficient_balance(customer_with_balance):
+    # when
+    with pytest.raises(ledger.InsufficientBalance):
+        ledger.debit(customer_with_balance, Decimal(11))
+
+    # then
+    customer_with_balance.refresh_from_db()
+    assert customer_with_balance.balance == Decimal(10)
+    assert not BalanceEvent.objects.filter(type=BalanceEvents.CONSUMED).exists()
+
+
+def test_debit(customer_with_balance):
+    # when
+    event = ledger.debit(customer_with_balance, Decimal(4))
+
+    # then
+    assert event.type == BalanceEvents.CONSUMED
+    assert event.delta == Decimal(-4)
+    customer_with_balance.refresh_from_db()
+    assert customer_with_balance.balance == Decimal(6)
+
+
+def test_set_balance_posts_difference(customer_with_balance):
+    # when
+    event = ledger.set_balance(customer_with_balance, Decimal(25))
+
+    # then
+    assert event.type == BalanceEvents.MANUALLY_UPDATED
+    assert event.delta == Decimal(15)
+    assert ledger.set_balance(customer_with_balance, Decimal(25)) is None
+
+
+def test_get_ledger_discrepancies(customer_with_balance):
+    # given
+    ledger.post(customer_with_balance, Decimal(10), BalanceEvents.BONUS)
+    User.objects.filter(pk=customer_with_balance.pk).update(balance=Decimal(30))
+
+    # when
+    discrepancies = list(ledger.get_ledger_discrepancies())
+
+    # then
+    assert discrepancies == [customer_with_balance]
+    assert discrepancies[0].ledger_balance == Decimal(20)
+
+    # when
+    ledger.post(customer_with_balance, Decimal(-20), BalanceEvents.OTHER)
+    ledger.post(customer_with_balance, Decimal(10), BalanceEvents.OTHER)
+    customer_with_balance.balance = Decimal(10)
+    customer_with_balance.save(update_fields=["balance"])
+
+    # then
+    assert not ledger.get_ledger_discrepancies().exists()
+
+
+def test_get_ledger_discrepancies_includes_archived_events(customer_with_balance):
+    # given
+    ledger.post(customer_with_balance, Decimal(-10), BalanceEvents.OTHER)
+    ledger.post(customer_with_balance, Decimal(10), BalanceEvents.OTHER)
+    BalanceEvent.objects.update(date=timezone.now() - timedelta(days=400))
+
+    # when
+    archived = archive_balance_events(timezone.now(), batch_size=1)
+
+    # then
+    assert archived == 3
+    assert not BalanceEvent.objects.exists()
+    assert BalanceEventArchive.objects.count() == 3
+    assert not ledger.get_ledger_discrepancies().exists()
+
+
+def test_created_user_has_opening_balance(db):
+    # when
+    user = User.objects.create_user("new@example.com")
+
+    # then
+    (event,) = user.balance_events.all()
+    assert event.type == BalanceEvents.OPENING_BALANCE
+    assert event.delta == user.balance
+    assert event.balance == user.balance
+    assert event.number
+    assert not ledger.get_ledger_discrepancies().exists()
+
+
+def test_created_user_without_balance_has_no_opening_balance(db):
+    # when
+    user = User.objects.create_user("new@example.com", balance=Decimal(0))
+
+    # then
+    assert not user.balance_events.exists()
+    assert not ledger.get_ledger_discrepancies().exists()
+
+
+def test_debit_of_missing_user(customer_with_balance):
+    # given
+    User.objects.filter(pk=customer_with_balance.pk).delete()
+
+    # when & then
+    with pytest.raises(User.DoesNotExist):
+        ledger.debit(customer_with_balance, Decimal(1))
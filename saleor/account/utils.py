@@ -1,11 +1,12 @@
 from typing import TYPE_CHECKING
 
 from django.conf import settings
+from django.db import connection, transaction
 from django.db.models import Exists, OuterRef
 
 from ..checkout import AddressType
 from ..permission.models import Permission
-from .models import Group, User
+from .models import BalanceEvent, BalanceEventArchive, Group, User
 
 if TYPE_CHECKING:
     from ..plugins.manager import PluginsManager
@@ -143,3 +144,41 @@ def get_user_groups_permissions(user: User):
     return Permission.objects.filter(
         Exists(group_permissions.filter(permission_id=OuterRef("id")))
     )
+
+
+def archive_balance_events(date_cutoff, batch_size: int = 5000) -> int:
+    """Move the balance events older than the cutoff to the archive table.
+
+    Rows are moved in batches, each in its own short transaction with a single
+    `DELETE ... RETURNING` statement feeding the `INSERT`, so the live table is
+    never locked for the whole retention run. Returns the number of moved rows.
+    """
+    table = BalanceEvent._meta.db_table
+    archive_table = BalanceEventArchive._meta.db_table
+    moved = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {table}
+                    WHERE id IN (
+                        SELECT id FROM {table}
+                        WHERE date < %(cutoff)s
+                        ORDER BY date, id
+                        LIMIT %(batch_size)s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, date, type, number, user_id, balance, delta
+                )
+                INSERT INTO {archive_table}
+                    (id, date, type, number, user_id, balance, delta, archived_at)
+                SELECT id, date, type, number, user_id, balance, delta, now()
+                FROM moved
+                """,
+                {"cutoff": date_cutoff, "batch_size": batch_size},
+            )
+            count = cursor.rowcount
+        moved += count
+        if count < batch_size:
+            return moved
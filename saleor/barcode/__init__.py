@@ -0,0 +1,22 @@
+SUB_MODULUS = 100000
+
+
+def encode_barcode(year_month: int, sub: int) -> str:
+    """Return the canonical code printed on the label of the barcode."""
+    return str(year_month * SUB_MODULUS + sub)
+
+
+def decode_barcode(code: str) -> tuple[int, int]:
+    """Return the year month and the sub of the canonical code.
+
+    Raise `ValueError` when the code is not canonical, its year month is not a
+    `YYMM` number or its sub is 0.
+    """
+    code = code.strip()
+    if not code.isdigit() or code != str(int(code)):
+        raise ValueError(f"Invalid barcode: {code!r}.")
+    year_month, sub = divmod(int(code), SUB_MODULUS)
+    year, month = divmod(year_month, 100)
+    if year > 99 or not 1 <= month <= 12 or sub < 1:
+        raise ValueError(f"Invalid barcode: {code!r}.")
+    return year_month, sub
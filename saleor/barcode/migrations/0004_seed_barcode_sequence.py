@@ -0,0 +1,31 @@
+# Generated by Django 3.2.24 on 2026-10-17 09:30
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def seed_barcode_sequence(apps, _schema_editor):
+    Barcode = apps.get_model("barcode", "Barcode")
+    MonthlySequence = apps.get_model("core", "MonthlySequence")
+    rows = Barcode.objects.values("year_month").annotate(last_value=Max("sub"))
+    MonthlySequence.objects.bulk_create(
+        [
+            MonthlySequence(
+                name="barcode",
+                year_month=row["year_month"],
+                last_value=row["last_value"] or 0,
+            )
+            for row in rows.order_by()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("barcode", "0003_alter_barcode_year_month"),
+        ("core", "0011_monthlysequence"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_barcode_sequence, migrations.RunPython.noop),
+    ]
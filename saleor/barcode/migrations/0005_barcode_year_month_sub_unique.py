@@ -0,0 +1,43 @@
+# Generated by Django 3.2.24 on 2026-10-17 13:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicated_barcodes(apps, _schema_editor):
+    """Keep the oldest of barcodes with the same code, used if any of them was."""
+    Barcode = apps.get_model("barcode", "Barcode")
+    duplicated = (
+        Barcode.objects.values("year_month", "sub")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for key in duplicated.iterator():
+        barcodes = list(
+            Barcode.objects.filter(year_month=key["year_month"], sub=key["sub"])
+            .order_by("pk")
+            .values_list("pk", "used")
+        )
+        kept_pk = barcodes[0][0]
+        if any(used for _pk, used in barcodes):
+            Barcode.objects.filter(pk=kept_pk).update(used=True)
+        Barcode.objects.filter(pk__in=[pk for pk, _used in barcodes[1:]]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("barcode", "0004_seed_barcode_sequence"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicated_barcodes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="barcode",
+            constraint=models.UniqueConstraint(
+                fields=("year_month", "sub"),
+                include=("used",),
+                name="barcode_year_month_sub_unique",
+            ),
+        ),
+    ]
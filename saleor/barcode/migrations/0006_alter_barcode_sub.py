@@ -0,0 +1,17 @@
+# Generated by Django 3.2.24 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("barcode", "0005_barcode_year_month_sub_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="barcode",
+            name="sub",
+            field=models.IntegerField(editable=False),
+        ),
+    ]
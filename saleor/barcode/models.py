@@ -1,23 +1,18 @@
 from django.db import models
-from django.db.models import Max
-from django.utils import timezone
 
+from ..core import MonthlySequenceName
+from ..core.models import MonthlySequence
+from ..core.utils.date_time import get_year_month
 from ..permission.enums import BarcodePermissions
+from . import encode_barcode
 
 
 def current_year_month():
-    return int(timezone.now().strftime("%y%m"))
+    return get_year_month()
 
 
-def get_sub():
-    year_month = current_year_month()
-    i = (
-        Barcode.objects.filter(year_month=year_month)
-        .all()
-        .aggregate(Max("sub"))["sub__max"]
-        or 0
-    ) + 1
-    return i
+def get_sub(year_month=None):
+    return MonthlySequence.next_value(MonthlySequenceName.BARCODE, year_month)
 
 
 class Barcode(models.Model):
@@ -26,9 +21,28 @@ class Barcode(models.Model):
         editable=False, null=False, blank=False, default=current_year_month
     )
     used = models.BooleanField(default=False, editable=True, null=False, blank=False)
-    sub = models.IntegerField(editable=False, null=False, blank=False, default=get_sub)
+    sub = models.IntegerField(editable=False, null=False, blank=False)
     created_at = models.DateTimeField(auto_now_add=True, null=False, blank=False)
 
     class Meta:
         ordering = ("-created_at",)
         permissions = ((BarcodePermissions.MANAGE_BARCODE.codename, "Manage barcodes"),)
+        constraints = [
+            # Scans look barcodes up by their code and read whether they are used
+            # from the index alone.
+            models.UniqueConstraint(
+                fields=["year_month", "sub"],
+                include=["used"],
+                name="barcode_year_month_sub_unique",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Subs are allocated on insert only, so unsaved barcodes don't use them.
+        if self._state.adding and self.sub is None:
+            self.sub = get_sub(self.year_month)
+        super().save(*args, **kwargs)
+
+    @property
+    def code(self) -> str:
+        return encode_barcode(self.year_month, self.sub)
@@ -0,0 +1,85 @@
+from collections.abc import Iterable
+from typing import NamedTuple, Optional
+
+from django.db import transaction
+from django.db.models import Q
+
+from ..core import MonthlySequenceName
+from ..core.models import MonthlySequence
+from . import decode_barcode, encode_barcode
+from .models import Barcode
+
+
+class ScanResult(NamedTuple):
+    code: str
+    barcode: Optional[Barcode]
+    used_before: Optional[bool]
+
+
+def get_barcodes_by_codes(
+    codes: Iterable[str], database_connection_name: str, for_update: bool = False
+) -> dict[str, Barcode]:
+    """Return barcodes of the canonical codes, looked up by the unique index.
+
+    Raise `ValueError` when any of the codes is not canonical.
+    """
+    lookup = Q()
+    for year_month, sub in {decode_barcode(code) for code in codes}:
+        lookup |= Q(year_month=year_month, sub=sub)
+    if not lookup:
+        return {}
+    barcodes = Barcode.objects.using(database_connection_name).filter(lookup)
+    if for_update:
+        barcodes = barcodes.select_for_update().order_by("pk")
+    return {barcode.code: barcode for barcode in barcodes}
+
+
+def get_reserved_codes(codes: Iterable[str]) -> set[str]:
+    """Return the canonical codes whose subs were reserved for barcodes.
+
+    Barcodes may be created for reserved codes which were not printed, their subs
+    are never reserved for other barcodes.
+    """
+    keys = {code: decode_barcode(code) for code in codes}
+    last_subs = {
+        year_month: MonthlySequence.get_last_reserved(
+            MonthlySequenceName.BARCODE, year_month
+        )
+        for year_month in {year_month for year_month, _sub in keys.values()}
+    }
+    return {
+        code for code, (year_month, sub) in keys.items() if sub <= last_subs[year_month]
+    }
+
+
+def scan_barcodes(
+    codes: list[str], database_connection_name: str, mark_used: bool = True
+) -> list[ScanResult]:
+    """Look up barcodes of the scanned codes and mark the unused ones as used.
+
+    Return a result for every code, in the order of the codes. The barcodes are
+    locked while they are marked, so of concurrent scans of a barcode only one
+    reports it as not used before.
+    """
+    codes = [encode_barcode(*decode_barcode(code)) for code in codes]
+    with transaction.atomic(using=database_connection_name):
+        barcodes = get_barcodes_by_codes(
+            codes, database_connection_name, for_update=mark_used
+        )
+        used_before = {code: barcode.used for code, barcode in barcodes.items()}
+        unused = [barcode for barcode in barcodes.values() if not barcode.used]
+        if mark_used and unused:
+            Barcode.objects.using(database_connection_name).filter(
+                pk__in=[barcode.pk for barcode in unused]
+            ).update(used=True)
+            for barcode in unused:
+                barcode.used = True
+
+    results = []
+    for code in codes:
+        barcode = barcodes.get(code)
+        results.append(ScanResult(code, barcode, used_before.get(code)))
+        # A code scanned twice in the batch is used by its first scan.
+        if mark_used and barcode:
+            used_before[code] = True
+    return results
@@ -24,6 +24,12 @@ class TimePeriodType:
     CHOICES = [(DAY, "Day"), (WEEK, "Week"), (MONTH, "Month"), (YEAR, "Year")]
 
 
+class MonthlySequenceName:
+    BARCODE = "barcode"
+    DONATION = "donation"
+    BALANCE_EVENT = "balance_event"
+
+
 class EventDeliveryStatus:
     PENDING = "pending"
     SUCCESS = "success"
@@ -9,12 +9,16 @@ from ..permission.enums import (
 )
 from ..plugins.manager import get_plugins_manager
 from .auth import get_token_from_request
+from .auth_cache import (
+    get_user_from_snapshot,
+    get_verified_payload,
+    store_user_snapshot,
+)
 from .jwt import (
     JWT_ACCESS_TYPE,
     JWT_THIRDPARTY_ACCESS_TYPE,
     PERMISSIONS_FIELD,
     is_saleor_token,
-    jwt_decode,
 )
 
 
@@ -123,7 +127,7 @@ def load_user_from_request(request):
     jwt_token = get_token_from_request(request)
     if not jwt_token or not is_saleor_token(jwt_token):
         return None
-    payload = jwt_decode(jwt_token)
+    payload = get_verified_payload(jwt_token)
 
     jwt_type = payload.get("type")
     if jwt_type not in [JWT_ACCESS_TYPE, JWT_THIRDPARTY_ACCESS_TYPE]:
@@ -132,7 +136,14 @@ def load_user_from_request(request):
         )
     permissions = payload.get(PERMISSIONS_FIELD, None)
 
-    user = UserByEmailLoader(request).load(payload["email"]).get()
+    user_loader = UserByEmailLoader(request)
+    user = get_user_from_snapshot(payload["email"])
+    if user is not None and user.is_active:
+        user_loader.prime(payload["email"], user)
+    else:
+        user = user_loader.load(payload["email"]).get()
+        if user:
+            store_user_snapshot(user)
     user_jwt_token = payload.get("token")
     if not user_jwt_token:
         raise jwt.InvalidTokenError(
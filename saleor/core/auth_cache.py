@@ -0,0 +1,127 @@
+"""Caches used to authenticate requests carrying Saleor access tokens.
+
+Verified token payloads are kept in a bounded, process-level cache for at most
+`JWT_VERIFICATION_CACHE_TIMEOUT` seconds and never past the token expiration,
+so the signature is checked once per token instead of once per request.
+
+When `JWT_USER_SNAPSHOT_TIMEOUT` is set, a compact snapshot of the user and of
+their effective permissions is stored in the shared cache. Requests then
+authenticate without querying the database; other fields of the user are all
+loaded by one query on the first access of any of them. Snapshots are dropped
+when the user is saved, so rotating `jwt_token_key` revokes the cached tokens
+immediately; queryset and bulk updates of the stored fields drop the snapshots
+of all users, see `UserQueryset`.
+"""
+import hashlib
+import time
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..account.models import User
+from .jwt import jwt_decode
+from .utils.lru_cache import LRUCache
+
+USER_SNAPSHOT_CACHE_KEY = "auth_user_snapshot:{version}:{email}"
+USER_SNAPSHOT_EMAIL_CACHE_KEY = "auth_user_snapshot:email:{user_id}"
+USER_SNAPSHOT_VERSION_CACHE_KEY = "auth_user_snapshot:version"
+USER_SNAPSHOT_FIELDS = [
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "account",
+    "code",
+    "user_type",
+    "is_superuser",
+    "is_staff",
+    "is_active",
+    "is_confirmed",
+    "jwt_token_key",
+    "language_code",
+    "uuid",
+]
+
+verified_token_cache = LRUCache("JWT_VERIFICATION_CACHE_SIZE")
+
+
+def get_verified_payload(token: str) -> dict[str, Any]:
+    """Return the payload of the token, verifying the token only on cache miss."""
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = verified_token_cache.get(key)
+    if payload is None:
+        payload = jwt_decode(token)
+        timeout = settings.JWT_VERIFICATION_CACHE_TIMEOUT
+        if expiration := payload.get("exp"):
+            timeout = min(timeout, expiration - time.time())
+        verified_token_cache.set(key, payload, timeout)
+    return payload
+
+
+def _get_snapshot_fields() -> list[str]:
+    # `Model.from_db` expects the values in the order of the concrete fields.
+    return [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname in USER_SNAPSHOT_FIELDS
+    ]
+
+
+def _get_user_snapshot_key(email: str) -> str:
+    version = cache.get(USER_SNAPSHOT_VERSION_CACHE_KEY, 0)
+    return USER_SNAPSHOT_CACHE_KEY.format(version=version, email=email)
+
+
+def get_user_from_snapshot(email: str) -> Optional[User]:
+    if not settings.JWT_USER_SNAPSHOT_TIMEOUT:
+        return None
+    snapshot = cache.get(_get_user_snapshot_key(email))
+    if snapshot is None:
+        return None
+    values, permissions = snapshot
+    user = User.from_db(
+        settings.DATABASE_CONNECTION_DEFAULT_NAME, _get_snapshot_fields(), values
+    )
+    if permissions is not None:
+        user._effective_permissions_cache = set(permissions)
+    user._load_deferred_together = True
+    return user
+
+
+def store_user_snapshot(user: User):
+    if not settings.JWT_USER_SNAPSHOT_TIMEOUT:
+        return
+    values = [getattr(user, field) for field in _get_snapshot_fields()]
+    permissions = None
+    if user.is_staff or user.is_superuser:
+        permissions = [
+            f"{app_label}.{codename}"
+            for app_label, codename in user.effective_permissions.values_list(
+                "content_type__app_label", "codename"
+            ).order_by()
+        ]
+    # The email the snapshot is stored under is remembered, so the snapshot can be
+    # dropped after the email of the user changes.
+    cache.set_many(
+        {
+            _get_user_snapshot_key(user.email): (values, permissions),
+            USER_SNAPSHOT_EMAIL_CACHE_KEY.format(user_id=user.pk): user.email,
+        },
+        timeout=settings.JWT_USER_SNAPSHOT_TIMEOUT,
+    )
+
+
+def delete_user_snapshot(user: User):
+    email_key = USER_SNAPSHOT_EMAIL_CACHE_KEY.format(user_id=user.pk)
+    emails = {user.email, cache.get(email_key)} - {None}
+    cache.delete_many([email_key, *(_get_user_snapshot_key(email) for email in emails)])
+
+
+def delete_all_user_snapshots():
+    """Drop the snapshots of all users, e.g. after permissions of a group change."""
+    if not cache.add(USER_SNAPSHOT_VERSION_CACHE_KEY, 1, timeout=None):
+        try:
+            cache.incr(USER_SNAPSHOT_VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(USER_SNAPSHOT_VERSION_CACHE_KEY, 1, timeout=None)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ...tasks import maintain_monthly_sequences_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the database sequences of the current and the next month and drop "
+        "the ones older than MONTHLY_SEQUENCE_RETENTION_MONTHS."
+    )
+
+    def handle(self, **options):
+        maintain_monthly_sequences_task()
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.24 on 2026-10-17 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0010_drop_vatlayer_tables"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlySequence",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=64)),
+                ("year_month", models.IntegerField()),
+                ("last_value", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "unique_together": {("name", "year_month")},
+            },
+        ),
+    ]
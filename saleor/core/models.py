@@ -2,11 +2,13 @@ import datetime
 from typing import Any, TypeVar
 
 import pytz
+from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
-from django.db import models, transaction
+from django.db import connection, models, transaction
 from django.db.models import F, JSONField, Max, Q
 
-from . import EventDeliveryStatus, JobStatus
+from . import EventDeliveryStatus, JobStatus, MonthlySequenceName
+from .utils.date_time import add_months, get_year_month
 from .utils.json_serializer import CustomJsonEncoder
 
 
@@ -184,3 +186,200 @@ class EventDeliveryAttempt(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+
+
+class MonthlySequence(models.Model):
+    """Counter of numbers that restart every month.
+
+    Recent months are backed by database sequences, so allocating their numbers
+    takes no row locks and concurrent transactions never wait for each other.
+    The numbers are unique and increasing but not gap-free: numbers of rolled
+    back transactions are not reused. Gap-free numbering needs the counter row to
+    stay locked until the allocating transaction ends, which serialized all
+    writers of balance events, donations and barcodes. The sequences are created
+    ahead of time and dropped once they are older than
+    `MONTHLY_SEQUENCE_RETENTION_MONTHS` by `maintain`, run daily by
+    `maintain_monthly_sequences_task`; no DDL statements run inside of request
+    transactions.
+
+    Months without a sequence, e.g. past months of imported data, allocate
+    numbers from `last_value` of the row, which stays locked until the end of
+    the transaction. A created sequence continues from `last_value`, and the last
+    value of the sequence is written back to the row by `maintain` and when the
+    sequence is dropped, so the row is only behind for the months of the live
+    sequences.
+    """
+
+    name = models.CharField(max_length=64)
+    year_month = models.IntegerField()
+    last_value = models.PositiveIntegerField(default=0)
+
+    # Sequences known to be committed. The ones of the retained months are never
+    # dropped, so their numbers are allocated without locking the row.
+    _created_sequences: set[str] = set()
+
+    class Meta:
+        unique_together = (("name", "year_month"),)
+
+    @classmethod
+    def get_sequence_name(cls, name: str, year_month: int) -> str:
+        return f"{cls._meta.db_table}_{name}_{year_month}"
+
+    @classmethod
+    def get_oldest_retained_year_month(cls) -> int:
+        return add_months(get_year_month(), -settings.MONTHLY_SEQUENCE_RETENTION_MONTHS)
+
+    @classmethod
+    def _lock_row(cls, name: str, year_month: int) -> int:
+        """Lock the row of the sequence and month, creating it if needed.
+
+        Return the last value of the row. Sequences are created, dropped and
+        checked for existence under this lock.
+        """
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (name, year_month, last_value)
+                VALUES (%s, %s, 0)
+                ON CONFLICT (name, year_month) DO UPDATE
+                SET last_value = {table}.last_value
+                RETURNING last_value
+                """,
+                [name, year_month],
+            )
+            return cursor.fetchone()[0]
+
+    @classmethod
+    def _sequence_exists(cls, sequence: str) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [sequence])
+            return cursor.fetchone()[0] is not None
+
+    @classmethod
+    def _next_values(cls, sequence: str, count: int) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)", [sequence, count]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def create_sequence(cls, name: str, year_month: int):
+        """Create the database sequence of the month if it doesn't exist yet."""
+        sequence = cls.get_sequence_name(name, year_month)
+        with transaction.atomic():
+            last_value = cls._lock_row(name, year_month)
+            if not cls._sequence_exists(sequence):
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE SEQUENCE {connection.ops.quote_name(sequence)} "
+                        "START WITH %s",
+                        [last_value + 1],
+                    )
+            transaction.on_commit(lambda: cls._created_sequences.add(sequence))
+
+    @classmethod
+    def sync_sequence(cls, name: str, year_month: int, drop: bool = False):
+        """Write the last value of the database sequence to the row.
+
+        With `drop`, the sequence is dropped and the following numbers of the
+        month are allocated from the row.
+        """
+        sequence = cls.get_sequence_name(name, year_month)
+        with transaction.atomic():
+            cls._lock_row(name, year_month)
+            if not cls._sequence_exists(sequence):
+                return
+            quoted_sequence = connection.ops.quote_name(sequence)
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT last_value, is_called FROM {quoted_sequence}")
+                last_value, is_called = cursor.fetchone()
+                if not is_called:
+                    last_value -= 1
+                cls.objects.filter(
+                    name=name, year_month=year_month, last_value__lt=last_value
+                ).update(last_value=last_value)
+                if drop:
+                    cursor.execute(f"DROP SEQUENCE {quoted_sequence}")
+        if drop:
+            cls._created_sequences.discard(sequence)
+
+    @classmethod
+    def maintain(cls):
+        """Create, sync and drop the database sequences.
+
+        Sequences of the current and the next month are created, the retained
+        ones are synced to their rows and the ones of older months are dropped.
+        """
+        year_month = get_year_month()
+        for name in [
+            MonthlySequenceName.BARCODE,
+            MonthlySequenceName.DONATION,
+            MonthlySequenceName.BALANCE_EVENT,
+        ]:
+            for month in [year_month, add_months(year_month, 1)]:
+                cls.create_sequence(name, month)
+        oldest_retained = cls.get_oldest_retained_year_month()
+        for name, month in cls.objects.values_list("name", "year_month"):
+            # Processes may still use the sequences of the month before the
+            # oldest retained one without locking the row, keep them a bit longer.
+            drop = month < add_months(oldest_retained, -1)
+            cls.sync_sequence(name, month, drop=drop)
+
+    @classmethod
+    def reserve(cls, name: str, count: int = 1, year_month=None) -> list[int]:
+        """Reserve `count` numbers of the sequence in one statement."""
+        if year_month is None:
+            year_month = get_year_month()
+        sequence = cls.get_sequence_name(name, year_month)
+        retained = year_month >= cls.get_oldest_retained_year_month()
+        if retained and sequence in cls._created_sequences:
+            return cls._next_values(sequence, count)
+        with transaction.atomic():
+            last_value = cls._lock_row(name, year_month)
+            if cls._sequence_exists(sequence):
+                transaction.on_commit(lambda: cls._created_sequences.add(sequence))
+                return cls._next_values(sequence, count)
+            cls.objects.filter(name=name, year_month=year_month).update(
+                last_value=F("last_value") + count
+            )
+            return list(range(last_value + 1, last_value + count + 1))
+
+    @classmethod
+    def get_last_reserved(cls, name: str, year_month: int) -> int:
+        """Return the last number reserved in the month, it's never reserved again.
+
+        Numbers reserved by transactions in progress are not reported, takes no
+        locks.
+        """
+        sequence = cls.get_sequence_name(name, year_month)
+        if cls._sequence_exists(sequence):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT last_value, is_called "
+                    f"FROM {connection.ops.quote_name(sequence)}"
+                )
+                last_value, is_called = cursor.fetchone()
+            return last_value if is_called else last_value - 1
+        last_value = (
+            cls.objects.filter(name=name, year_month=year_month)
+            .values_list("last_value", flat=True)
+            .first()
+        )
+        return last_value or 0
+
+    @classmethod
+    def next_value(cls, name: str, year_month=None) -> int:
+        return cls.reserve(name, 1, year_month)[0]
+
+    @classmethod
+    def assign(cls, name: str, instances, field: str = "number", year_month=None):
+        """Set numbers of the not yet saved instances with a single reservation."""
+        instances = list(instances)
+        if not instances:
+            return instances
+        numbers = cls.reserve(name, len(instances), year_month)
+        for instance, number in zip(instances, numbers):
+            setattr(instance, field, number)
+        return instances
@@ -9,7 +9,7 @@ from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 from ..celeryconf import app
-from .models import EventDelivery, EventPayload
+from .models import EventDelivery, EventPayload, MonthlySequence
 
 task_logger: logging.Logger = get_task_logger(__name__)
 
@@ -24,6 +24,16 @@ def delete_from_storage_task(path):
     default_storage.delete(path)
 
 
+@app.task
+def maintain_monthly_sequences_task():
+    """Create the sequences of the coming months and drop the expired ones.
+
+    Sequences are never created by the requests, numbers of the months without
+    a sequence are allocated with the counter row locked.
+    """
+    MonthlySequence.maintain()
+
+
 @app.task
 def delete_event_payloads_task(expiration_date=None):
     expiration_date = expiration_date or timezone.now() + datetime.timedelta(minutes=60)
@@ -0,0 +1,175 @@
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from jwt import InvalidTokenError
+
+from ...account.models import User
+from ..auth_backend import JSONWebTokenBackend
+from ..auth_cache import get_user_from_snapshot, verified_token_cache
+from ..jwt import create_access_token, jwt_decode
+
+
+@pytest.fixture
+def _auth_cache_enabled(settings):
+    settings.JWT_VERIFICATION_CACHE_SIZE = 100
+    settings.JWT_USER_SNAPSHOT_TIMEOUT = 60
+    verified_token_cache.clear()
+    cache.clear()
+    yield
+    verified_token_cache.clear()
+    cache.clear()
+
+
+@patch("saleor.core.auth_cache.jwt_decode", wraps=jwt_decode)
+def test_token_verified_once(mocked_jwt_decode, rf, staff_user, _auth_cache_enabled):
+    # given
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+
+    # when
+    for _ in range(3):
+        request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+        user = backend.authenticate(request)
+
+    # then
+    assert user == staff_user
+    mocked_jwt_decode.assert_called_once_with(access_token)
+    assert verified_token_cache.hits == 2
+
+
+def test_user_authenticated_from_snapshot(
+    rf,
+    staff_user,
+    permission_manage_orders,
+    _auth_cache_enabled,
+    django_assert_num_queries,
+):
+    # given
+    staff_user.user_permissions.add(permission_manage_orders)
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    # when
+    with django_assert_num_queries(0):
+        user = backend.authenticate(
+            rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+        )
+        has_perm = user.has_perm("order.manage_orders")
+
+    # then
+    assert user == staff_user
+    assert has_perm
+
+
+def test_rotated_token_key_invalidates_snapshot(rf, staff_user, _auth_cache_enabled):
+    # given
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    assert get_user_from_snapshot(staff_user.email)
+
+    # when
+    staff_user.jwt_token_key = "new-key"
+    staff_user.save(update_fields=["jwt_token_key", "updated_at"])
+
+    # then
+    assert get_user_from_snapshot(staff_user.email) is None
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
+def test_bulk_deactivation_invalidates_snapshots(
+    rf, customer_user, _auth_cache_enabled
+):
+    # given
+    access_token = create_access_token(customer_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    assert get_user_from_snapshot(customer_user.email)
+
+    # when
+    User.objects.filter(pk=customer_user.pk).update(is_active=False)
+
+    # then
+    assert get_user_from_snapshot(customer_user.email) is None
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
+def test_balance_update_keeps_snapshots(rf, customer_user, _auth_cache_enabled):
+    # given
+    access_token = create_access_token(customer_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    # when
+    User.objects.filter(pk=customer_user.pk).update(balance=Decimal(1))
+
+    # then
+    assert get_user_from_snapshot(customer_user.email)
+
+
+def test_snapshot_user_loads_deferred_fields_at_once(
+    rf, customer_user, _auth_cache_enabled, django_assert_num_queries
+):
+    # given
+    access_token = create_access_token(customer_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    user = get_user_from_snapshot(customer_user.email)
+
+    # when
+    with django_assert_num_queries(1):
+        values = [user.note, user.balance, user.date_joined, user.private_metadata]
+
+    # then
+    assert values == [
+        customer_user.note,
+        customer_user.balance,
+        customer_user.date_joined,
+        customer_user.private_metadata,
+    ]
+
+
+def test_group_permissions_change_invalidates_snapshots(
+    rf, staff_user, permission_group_manage_users, _auth_cache_enabled
+):
+    # given
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    # when
+    permission_group_manage_users.user_set.add(staff_user)
+
+    # then
+    assert get_user_from_snapshot(staff_user.email) is None
+
+
+def test_cached_authentication_overhead(rf, staff_user, _auth_cache_enabled, settings):
+    # given
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    runs = 50
+
+    def authenticate_many():
+        started_at = time.perf_counter()
+        for _ in range(runs):
+            backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+        return time.perf_counter() - started_at
+
+    settings.JWT_VERIFICATION_CACHE_SIZE = 0
+    settings.JWT_USER_SNAPSHOT_TIMEOUT = 0
+    uncached = authenticate_many()
+
+    # when
+    settings.JWT_VERIFICATION_CACHE_SIZE = 100
+    settings.JWT_USER_SNAPSHOT_TIMEOUT = 60
+    cached = authenticate_many()
+
+    # then
+    assert cached < uncached
@@ -0,0 +1,299 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+import pytz
+from django.db import connection, transaction
+
+from ...account.models import BalanceEvent
+from ...donation.models import Donation
+from .. import MonthlySequenceName
+from ..models import MonthlySequence
+from ..utils.date_time import add_months, get_year_month
+
+YEAR_MONTH = 2410
+
+
+def sequence_exists(name, year_month):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT to_regclass(%s)",
+            [MonthlySequence.get_sequence_name(name, year_month)],
+        )
+        return cursor.fetchone()[0] is not None
+
+
+def test_get_year_month_of_local_date_time_uses_utc():
+    # given
+    date_time = pytz.timezone("Asia/Shanghai").localize(datetime(2023, 5, 1, 3))
+
+    # when
+    year_month = get_year_month(date_time)
+
+    # then
+    assert year_month == 2304
+
+
+@pytest.mark.django_db
+def test_reserve_starts_new_month_from_one():
+    # when
+    numbers = MonthlySequence.reserve(MonthlySequenceName.DONATION, 3, YEAR_MONTH)
+
+    # then
+    assert list(numbers) == [1, 2, 3]
+    assert MonthlySequence.next_value(MonthlySequenceName.DONATION, YEAR_MONTH) == 4
+    assert MonthlySequence.next_value(MonthlySequenceName.DONATION, 2411) == 1
+
+
+@pytest.mark.django_db
+def test_sequences_are_independent():
+    # when
+    MonthlySequence.reserve(MonthlySequenceName.BARCODE, 10, YEAR_MONTH)
+
+    # then
+    assert MonthlySequence.next_value(MonthlySequenceName.DONATION, YEAR_MONTH) == 1
+
+
+@pytest.mark.django_db
+def test_reserve_continues_from_counter_row():
+    # given
+    MonthlySequence.objects.create(
+        name=MonthlySequenceName.DONATION, year_month=YEAR_MONTH, last_value=41
+    )
+
+    # when
+    number = MonthlySequence.next_value(MonthlySequenceName.DONATION, YEAR_MONTH)
+
+    # then
+    assert number == 42
+
+
+@pytest.mark.django_db
+def test_rolled_back_reservation_is_not_reused():
+    # given
+    MonthlySequence.create_sequence(MonthlySequenceName.BARCODE, YEAR_MONTH)
+    MonthlySequence.next_value(MonthlySequenceName.BARCODE, YEAR_MONTH)
+
+    def reserve_and_roll_back():
+        with transaction.atomic():
+            MonthlySequence.reserve(MonthlySequenceName.BARCODE, 5, YEAR_MONTH)
+            raise RuntimeError()
+
+    # when
+    with pytest.raises(RuntimeError):
+        reserve_and_roll_back()
+
+    # then
+    assert MonthlySequence.next_value(MonthlySequenceName.BARCODE, YEAR_MONTH) == 7
+
+
+@pytest.mark.django_db
+def test_rolled_back_reservation_of_month_without_sequence_is_reused():
+    # given
+    MonthlySequence.next_value(MonthlySequenceName.BARCODE, YEAR_MONTH)
+
+    def reserve_and_roll_back():
+        with transaction.atomic():
+            MonthlySequence.reserve(MonthlySequenceName.BARCODE, 5, YEAR_MONTH)
+            raise RuntimeError()
+
+    # when
+    with pytest.raises(RuntimeError):
+        reserve_and_roll_back()
+
+    # then
+    assert MonthlySequence.next_value(MonthlySequenceName.BARCODE, YEAR_MONTH) == 2
+
+
+@pytest.mark.django_db
+def test_reserve_does_not_create_sequence():
+    # when
+    MonthlySequence.next_value(MonthlySequenceName.DONATION, YEAR_MONTH)
+
+    # then
+    assert not sequence_exists(MonthlySequenceName.DONATION, YEAR_MONTH)
+    sequence = MonthlySequence.objects.get(
+        name=MonthlySequenceName.DONATION, year_month=YEAR_MONTH
+    )
+    assert sequence.last_value == 1
+
+
+@pytest.mark.django_db
+def test_created_sequence_continues_from_counter_row():
+    # given
+    MonthlySequence.reserve(MonthlySequenceName.DONATION, 3, YEAR_MONTH)
+
+    # when
+    MonthlySequence.create_sequence(MonthlySequenceName.DONATION, YEAR_MONTH)
+
+    # then
+    assert MonthlySequence.next_value(MonthlySequenceName.DONATION, YEAR_MONTH) == 4
+
+
+@pytest.mark.django_db
+def test_sync_sequence_writes_last_value_to_counter_row():
+    # given
+    MonthlySequence.create_sequence(MonthlySequenceName.DONATION, YEAR_MONTH)
+    MonthlySequence.reserve(MonthlySequenceName.DONATION, 5, YEAR_MONTH)
+
+    # when
+    MonthlySequence.sync_sequence(MonthlySequenceName.DONATION, YEAR_MONTH)
+
+    # then
+    sequence = MonthlySequence.objects.get(
+        name=MonthlySequenceName.DONATION, year_month=YEAR_MONTH
+    )
+    assert sequence.last_value == 5
+    assert sequence_exists(MonthlySequenceName.DONATION, YEAR_MONTH)
+
+
+@pytest.mark.django_db
+def test_sync_sequence_of_unused_sequence_keeps_counter_row():
+    # given
+    MonthlySequence.reserve(MonthlySequenceName.DONATION, 2, YEAR_MONTH)
+    MonthlySequence.create_sequence(MonthlySequenceName.DONATION, YEAR_MONTH)
+
+    # when
+    MonthlySequence.sync_sequence(MonthlySequenceName.DONATION, YEAR_MONTH)
+
+    # then
+    sequence = MonthlySequence.objects.get(
+        name=MonthlySequenceName.DONATION, year_month=YEAR_MONTH
+    )
+    assert sequence.last_value == 2
+
+
+@pytest.mark.django_db
+def test_dropped_sequence_continues_from_counter_row():
+    # given
+    MonthlySequence.create_sequence(MonthlySequenceName.DONATION, YEAR_MONTH)
+    MonthlySequence.reserve(MonthlySequenceName.DONATION, 5, YEAR_MONTH)
+
+    # when
+    MonthlySequence.sync_sequence(MonthlySequenceName.DONATION, YEAR_MONTH, drop=True)
+
+    # then
+    assert not sequence_exists(MonthlySequenceName.DONATION, YEAR_MONTH)
+    assert MonthlySequence.next_value(MonthlySequenceName.DONATION, YEAR_MONTH) == 6
+
+
+@pytest.mark.django_db
+def test_maintain_creates_sequences_of_current_and_next_month(settings):
+    # given
+    settings.MONTHLY_SEQUENCE_RETENTION_MONTHS = 3
+    year_month = get_year_month()
+
+    # when
+    MonthlySequence.maintain()
+
+    # then
+    for name in [
+        MonthlySequenceName.BARCODE,
+        MonthlySequenceName.DONATION,
+        MonthlySequenceName.BALANCE_EVENT,
+    ]:
+        assert sequence_exists(name, year_month)
+        assert sequence_exists(name, add_months(year_month, 1))
+
+
+@pytest.mark.django_db
+def test_maintain_drops_expired_sequences(settings):
+    # given
+    settings.MONTHLY_SEQUENCE_RETENTION_MONTHS = 3
+    year_month = get_year_month()
+    expired_year_month = add_months(year_month, -5)
+    grace_year_month = add_months(year_month, -4)
+    for month in [expired_year_month, grace_year_month]:
+        MonthlySequence.create_sequence(MonthlySequenceName.DONATION, month)
+        MonthlySequence.reserve(MonthlySequenceName.DONATION, 2, month)
+
+    # when
+    MonthlySequence.maintain()
+
+    # then
+    assert not sequence_exists(MonthlySequenceName.DONATION, expired_year_month)
+    assert sequence_exists(MonthlySequenceName.DONATION, grace_year_month)
+    assert (
+        MonthlySequence.next_value(MonthlySequenceName.DONATION, expired_year_month)
+        == 3
+    )
+
+
+@pytest.mark.parametrize(
+    ("year_month", "months", "expected_year_month"),
+    [(2410, 1, 2411), (2412, 1, 2501), (2401, -1, 2312), (2405, -17, 2212)],
+)
+def test_add_months(year_month, months, expected_year_month):
+    # when
+    result = add_months(year_month, months)
+
+    # then
+    assert result == expected_year_month
+
+
+@pytest.mark.django_db
+def test_unsaved_instances_use_no_numbers():
+    # given
+    year_month = get_year_month()
+    last_event_number = MonthlySequence.next_value(
+        MonthlySequenceName.BALANCE_EVENT, year_month
+    )
+    last_donation_number = MonthlySequence.next_value(
+        MonthlySequenceName.DONATION, year_month
+    )
+
+    # when
+    BalanceEvent(type="BONUS")
+    Donation()
+    event = BalanceEvent.objects.create(type="BONUS")
+    donation = Donation.objects.create()
+
+    # then
+    assert event.number == last_event_number + 1
+    assert donation.number == last_donation_number + 1
+
+
+@pytest.mark.django_db
+def test_assign_reserves_block_for_instances():
+    # given
+    events = [BalanceEvent(number=None) for _ in range(3)]
+
+    # when
+    MonthlySequence.assign(
+        MonthlySequenceName.BALANCE_EVENT, events, year_month=YEAR_MONTH
+    )
+
+    # then
+    assert [event.number for event in events] == [1, 2, 3]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reservations_are_unique():
+    # given
+    # Numbers of the month without a sequence are allocated from the counter row.
+    year_month = 2412
+    workers = 8
+    reservations_per_worker = 50
+
+    def reserve_numbers():
+        numbers = []
+        try:
+            for i in range(reservations_per_worker):
+                with transaction.atomic():
+                    numbers.extend(
+                        MonthlySequence.reserve(
+                            MonthlySequenceName.BALANCE_EVENT, i % 3 + 1, year_month
+                        )
+                    )
+        finally:
+            connection.close()
+        return numbers
+
+    # when
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = [executor.submit(reserve_numbers) for _ in range(workers)]
+        numbers = [number for result in results for number in result.result()]
+
+    # then
+    assert len(numbers) == len(set(numbers))
+    assert sorted(numbers) == list(range(1, len(numbers) + 1))
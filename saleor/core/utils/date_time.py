@@ -1,6 +1,7 @@
 from datetime import datetime
 
 import pytz
+from django.utils import timezone
 
 
 def convert_to_utc_date_time(date):
@@ -8,3 +9,23 @@ def convert_to_utc_date_time(date):
     if date is None:
         return
     return datetime.combine(date, datetime.min.time(), tzinfo=pytz.UTC)
+
+
+def get_year_month(date_time=None) -> int:
+    """Return the `YYMM` number of the given or current month.
+
+    Aware date times are converted to UTC first, the month of the same moment
+    doesn't depend on the time zone it's expressed in.
+    """
+    if date_time is None:
+        date_time = timezone.now()
+    elif timezone.is_aware(date_time):
+        date_time = date_time.astimezone(pytz.UTC)
+    return int(date_time.strftime("%y%m"))
+
+
+def add_months(year_month: int, months: int) -> int:
+    """Return the `YYMM` number of the month the given number of months later."""
+    year, month = divmod(year_month, 100)
+    index = year * 12 + month - 1 + months
+    return index // 12 * 100 + index % 12 + 1
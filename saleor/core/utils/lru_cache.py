@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from django.conf import settings
+
+
+class LRUCache:
+    """Thread-safe, process-level least recently used cache.
+
+    The maximum size is read from the named setting, so it can be changed in
+    tests; a size of `0` disables the cache. Entries may also expire after a
+    timeout. Hits and misses are counted to report the hit rate.
+    """
+
+    def __init__(self, maxsize_setting: str):
+        self.maxsize_setting = maxsize_setting
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Any, tuple[Optional[float], Any]] = OrderedDict()
+
+    @property
+    def maxsize(self) -> int:
+        return getattr(settings, self.maxsize_setting)
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            expires_at, value = self._entries.get(key, (None, None))
+            if value is not None and expires_at is not None:
+                if expires_at <= time.monotonic():
+                    del self._entries[key]
+                    value = None
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, timeout: Optional[float] = None):
+        maxsize = self.maxsize
+        if maxsize <= 0 or (timeout is not None and timeout <= 0):
+            return
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._entries)
@@ -13,7 +13,14 @@ from ..core import JobStatus
 from . import events
 from .models import ExportEvent, ExportFile
 from .notifications import send_export_failed_info
-from .utils.export import export_gift_cards, export_products, export_voucher_codes
+from .utils.export import (
+    export_balance_events,
+    export_barcodes,
+    export_donations,
+    export_gift_cards,
+    export_products,
+    export_voucher_codes,
+)
 
 task_logger = get_task_logger(__name__)
 
@@ -24,6 +31,9 @@ class ExportTask(celery.Task):
         "export-products": "products",
         "export-gift-cards": "gift cards",
         "export-voucher-codes": "voucher codes",
+        "export-donations": "donations",
+        "export-barcodes": "barcodes",
+        "export-balance-events": "balance events",
     }
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
@@ -92,6 +102,39 @@ def export_voucher_codes_task(
     export_voucher_codes(export_file, file_type, voucher_id, ids)
 
 
+@app.task(name="export-donations", base=ExportTask)
+def export_donations_task(
+    export_file_id: int,
+    scope: dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    export_donations(export_file, scope, file_type, delimiter)
+
+
+@app.task(name="export-barcodes", base=ExportTask)
+def export_barcodes_task(
+    export_file_id: int,
+    scope: dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    export_barcodes(export_file, scope, file_type, delimiter)
+
+
+@app.task(name="export-balance-events", base=ExportTask)
+def export_balance_events_task(
+    export_file_id: int,
+    scope: dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    export_balance_events(export_file, scope, file_type, delimiter)
+
+
 @app.task
 def delete_old_export_files():
     now = timezone.now()
@@ -0,0 +1,190 @@
+import csv
+import datetime
+import io
+import tracemalloc
+from decimal import Decimal
+from unittest.mock import patch
+
+import openpyxl
+import pytest
+from django.db import connection
+from django.db.models import F
+
+from ....account import BalanceEvents, ledger
+from ....account.models import BalanceEvent
+from ....barcode import encode_barcode
+from ....barcode.models import Barcode
+from ....donation.models import Donation
+from ... import FileTypes
+from ...utils.export import (
+    BALANCE_EVENT_EXPORT_FIELDS,
+    _format_balance_event_row,
+    export_balance_events,
+    export_barcodes,
+    export_donations,
+    queryset_values_in_batches,
+    write_rows_to_file,
+)
+
+
+def _read_csv(export_file):
+    export_file.content_file.open("rb")
+    content = export_file.content_file.read().decode("utf-8")
+    export_file.content_file.close()
+    return list(csv.reader(io.StringIO(content)))
+
+
+def test_queryset_values_in_batches(django_assert_num_queries):
+    # given
+    barcodes = Barcode.objects.bulk_create(
+        [Barcode(year_month=202403, sub=sub) for sub in range(1, 6)]
+    )
+
+    # when
+    with django_assert_num_queries(3):
+        batches = list(
+            queryset_values_in_batches(
+                Barcode.objects.all(), ["pk", "sub"], batch_size=2
+            )
+        )
+
+    # then
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [row for batch in batches for row in batch] == [
+        (barcode.pk, barcode.sub) for barcode in barcodes
+    ]
+
+
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_balance_events_with_filter(
+    send_notification_mock, user_export_file, customer_user
+):
+    # given
+    ledger.post(customer_user, Decimal(5), BalanceEvents.BONUS)
+    BalanceEvent.objects.update(date=F("date") - datetime.timedelta(days=10))
+    event = ledger.post(customer_user, Decimal(-2), BalanceEvents.CONSUMED)
+    today = event.date.date().isoformat()
+    scope = {"filter": {"date": {"gte": today, "lte": today}}}
+
+    # when
+    export_balance_events(user_export_file, scope, FileTypes.CSV)
+
+    # then
+    header, *rows = _read_csv(user_export_file)
+    assert header == [
+        "id",
+        "number",
+        "date",
+        "type",
+        "account",
+        "code",
+        "name",
+        "delta",
+        "balance",
+    ]
+    assert len(rows) == 1
+    assert rows[0][0] == str(event.pk)
+    assert rows[0][3] == BalanceEvents.CONSUMED
+    assert Decimal(rows[0][7]) == Decimal(-2)
+    send_notification_mock.assert_called_once_with(user_export_file, "balance events")
+
+
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_barcodes_to_xlsx(send_notification_mock, user_export_file):
+    # given
+    barcode = Barcode.objects.create(year_month=202403, sub=7, used=True)
+
+    # when
+    export_barcodes(user_export_file, {"all": ""}, FileTypes.XLSX)
+
+    # then
+    user_export_file.content_file.open("rb")
+    workbook = openpyxl.load_workbook(user_export_file.content_file)
+    user_export_file.content_file.close()
+    rows = list(workbook.active.values)
+    assert rows[0] == ("id", "number", "year month", "used", "created at")
+    assert rows[1][:4] == (
+        barcode.pk,
+        encode_barcode(barcode.year_month, barcode.sub),
+        202403,
+        True,
+    )
+
+
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_donations_by_ids(send_notification_mock, user_export_file):
+    # given
+    donations = Donation.objects.bulk_create(
+        [Donation(title="Book"), Donation(title="Lamp")]
+    )
+
+    # when
+    export_donations(user_export_file, {"ids": [donations[1].pk]}, FileTypes.CSV)
+
+    # then
+    _header, *rows = _read_csv(user_export_file)
+    assert len(rows) == 1
+    assert rows[0][0] == str(donations[1].pk)
+    assert rows[0][2] == "Lamp"
+
+
+@pytest.mark.parametrize("file_type", [FileTypes.CSV, FileTypes.XLSX])
+def test_write_rows_to_file_memory_does_not_grow_with_rows(file_type):
+    # given
+    date = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+    row = (1, "2403000001", date, "consumed", "account", "code", "name", 1, 10)
+
+    def batches(count, batch_size=10000):
+        for _ in range(count // batch_size):
+            yield [row] * batch_size
+
+    def peak_memory(count):
+        tracemalloc.start()
+        temporary_file = write_rows_to_file(
+            ["header"] * len(row), batches(count), ",", file_type
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        temporary_file.close()
+        return peak
+
+    # when
+    small_peak = peak_memory(20000)
+    large_peak = peak_memory(200000)
+
+    # then
+    assert large_peak < small_peak * 2
+
+
+@pytest.mark.slow
+def test_export_one_million_ledger_rows_to_csv(customer_user):
+    # given
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {BalanceEvent._meta.db_table} "
+            "(date, type, number, user_id, balance, delta) "
+            "SELECT now(), %s, n, %s, n, -1 FROM generate_series(1, %s) AS n",
+            [BalanceEvents.CONSUMED, customer_user.pk, 1000000],
+        )
+    events_count = BalanceEvent.objects.count()
+
+    # when
+    tracemalloc.start()
+    temporary_file = write_rows_to_file(
+        list(BALANCE_EVENT_EXPORT_FIELDS.keys()),
+        queryset_values_in_batches(
+            BalanceEvent.objects.all(),
+            list(BALANCE_EVENT_EXPORT_FIELDS.values()),
+            _format_balance_event_row,
+        ),
+        ",",
+        FileTypes.CSV,
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # then
+    line_count = sum(1 for _ in temporary_file)
+    temporary_file.close()
+    assert line_count == events_count + 1
+    assert peak < 50 * 1024 * 1024
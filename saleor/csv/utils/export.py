@@ -1,12 +1,20 @@
+import csv
+import io
 import uuid
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import date, datetime
 from tempfile import NamedTemporaryFile
 from typing import IO, TYPE_CHECKING, Any, Optional, Union
 
+import openpyxl
 import petl as etl
 from django.utils import timezone
 
+from ...account.models import BalanceEvent
+from ...barcode import encode_barcode
+from ...barcode.models import Barcode
 from ...discount.models import VoucherCode
+from ...donation.models import Donation
 from ...giftcard.models import GiftCard
 from ...product.models import Product
 from .. import FileTypes
@@ -121,6 +129,137 @@ def export_voucher_codes(
     send_export_download_link_notification(export_file, "voucher codes")
 
 
+DONATION_EXPORT_FIELDS = {
+    "id": "pk",
+    "number": "number",
+    "title": "title",
+    "donator": "donator",
+    "barcode": "barcode_code",
+    "status": "status",
+    "quantity": "quantity",
+    "price amount": "price_amount",
+    "currency": "currency",
+    "created at": "created_at",
+    "updated at": "updated_at",
+}
+
+BARCODE_EXPORT_FIELDS = {
+    "id": "pk",
+    "number": "sub",
+    "year month": "year_month",
+    "used": "used",
+    "created at": "created_at",
+}
+
+BALANCE_EVENT_EXPORT_FIELDS = {
+    "id": "pk",
+    "number": "number",
+    "date": "date",
+    "type": "type",
+    "account": "user__account",
+    "code": "user__code",
+    "name": "user__first_name",
+    "delta": "delta",
+    "balance": "balance",
+}
+
+
+def export_donations(
+    export_file: "ExportFile",
+    scope: dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    from ...graphql.donation.filters import DonationFilter
+
+    file_name = get_filename("donation", file_type)
+    if "filter" in scope:
+        scope["filter"] = parse_date_range_input(
+            scope["filter"], ["created", "updated"]
+        )
+    queryset = get_queryset(Donation, DonationFilter, scope)
+
+    temporary_file = write_rows_to_file(
+        list(DONATION_EXPORT_FIELDS.keys()),
+        queryset_values_in_batches(queryset, list(DONATION_EXPORT_FIELDS.values())),
+        delimiter,
+        file_type,
+    )
+
+    save_csv_file_in_export_file(export_file, temporary_file, file_name)
+    temporary_file.close()
+
+    send_export_download_link_notification(export_file, "donations")
+
+
+def _format_barcode_row(row: Sequence) -> list:
+    pk, sub, year_month, used, created_at = row
+    return [pk, encode_barcode(year_month, sub), year_month, used, created_at]
+
+
+def export_barcodes(
+    export_file: "ExportFile",
+    scope: dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    from ...graphql.barcode.filters import BarcodeFilter
+
+    file_name = get_filename("barcode", file_type)
+    queryset = get_queryset(Barcode, BarcodeFilter, scope)
+
+    temporary_file = write_rows_to_file(
+        list(BARCODE_EXPORT_FIELDS.keys()),
+        queryset_values_in_batches(
+            queryset, list(BARCODE_EXPORT_FIELDS.values()), _format_barcode_row
+        ),
+        delimiter,
+        file_type,
+    )
+
+    save_csv_file_in_export_file(export_file, temporary_file, file_name)
+    temporary_file.close()
+
+    send_export_download_link_notification(export_file, "barcodes")
+
+
+def _format_balance_event_row(row: Sequence) -> list:
+    pk, number, event_date, *rest = row
+    if event_date and number:
+        number = event_date.strftime("%y%m") + str(number).zfill(6)
+    return [pk, number, event_date, *rest]
+
+
+def export_balance_events(
+    export_file: "ExportFile",
+    scope: dict[str, Union[str, dict]],
+    file_type: str,
+    delimiter: str = ",",
+):
+    from ...graphql.events.filters import BalanceEventFilter
+
+    file_name = get_filename("balance_event", file_type)
+    if "filter" in scope:
+        scope["filter"] = parse_date_range_input(scope["filter"], ["date"])
+    queryset = get_queryset(BalanceEvent, BalanceEventFilter, scope)
+
+    temporary_file = write_rows_to_file(
+        list(BALANCE_EVENT_EXPORT_FIELDS.keys()),
+        queryset_values_in_batches(
+            queryset,
+            list(BALANCE_EVENT_EXPORT_FIELDS.values()),
+            _format_balance_event_row,
+        ),
+        delimiter,
+        file_type,
+    )
+
+    save_csv_file_in_export_file(export_file, temporary_file, file_name)
+    temporary_file.close()
+
+    send_export_download_link_notification(export_file, "balance events")
+
+
 def get_filename(model_name: str, file_type: str) -> str:
     hash = uuid.uuid4()
     return "{}_data_{}_{}.{}".format(
@@ -169,6 +308,18 @@ def parse_input(data: Any) -> dict[str, Union[str, dict]]:
     return data
 
 
+def parse_date_range_input(data: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    """Parse dates of the range filters, Celery passes them as strings."""
+    for field in fields:
+        value = data.get(field)
+        if not isinstance(value, dict):
+            continue
+        for bound in ["gte", "lte"]:
+            if isinstance(value.get(bound), str):
+                value[bound] = date.fromisoformat(value[bound][:10])
+    return data
+
+
 def create_file_with_headers(file_headers: list[str], delimiter: str, file_type: str):
     table = etl.wrap([file_headers])
 
@@ -261,6 +412,72 @@ def queryset_in_batches(queryset):
         start_pk = pks[-1]
 
 
+def queryset_values_in_batches(
+    queryset: "QuerySet",
+    fields: list[str],
+    format_row: Optional[Callable[[Sequence], Sequence]] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[list[Sequence]]:
+    """Yield rows of the fields in batches, paginated with the primary key.
+
+    The first field must be `pk`. Every batch is a single query which continues
+    after the last row of the previous one, so the whole queryset is never
+    loaded into memory and the export doesn't slow down with the offset.
+    """
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        batch_qs = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(batch_qs.values_list(*fields)[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        yield [format_row(row) for row in rows] if format_row else rows
+        if len(rows) < batch_size:
+            break
+
+
+def _to_cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def write_rows_to_file(
+    headers: list[str],
+    batches: Iterable[Iterable[Sequence]],
+    delimiter: str,
+    file_type: str,
+):
+    """Write the headers and the rows to a new temporary file.
+
+    Rows are written as they come, CSV files directly and XLSX files with
+    a write-only workbook, so memory usage doesn't depend on the number of rows.
+    """
+    if file_type == FileTypes.CSV:
+        temp_file = NamedTemporaryFile("wb+", suffix=".csv")
+        text_file = io.TextIOWrapper(temp_file, encoding="utf-8", newline="")
+        writer = csv.writer(text_file, delimiter=delimiter)
+        writer.writerow(headers)
+        for rows in batches:
+            writer.writerows([_to_cell(value) for value in row] for row in rows)
+        text_file.flush()
+        text_file.detach()
+    else:
+        temp_file = NamedTemporaryFile("wb+", suffix=".xlsx")
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+        worksheet.append(headers)
+        for rows in batches:
+            for row in rows:
+                worksheet.append([_to_cell(value) for value in row])
+        workbook.save(temp_file.name)
+    temp_file.seek(0)
+    return temp_file
+
+
 def append_to_file(
     export_data: list[dict[str, Union[str, bool]]],
     headers: list[str],
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.24 on 2026-10-17 09:30
+
+from django.db import migrations
+from django.db.models import Max
+from django.db.models.functions import TruncMonth
+
+
+def seed_donation_sequence(apps, _schema_editor):
+    Donation = apps.get_model("donation", "Donation")
+    MonthlySequence = apps.get_model("core", "MonthlySequence")
+    rows = (
+        Donation.objects.annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(last_value=Max("number"))
+        .order_by()
+    )
+    MonthlySequence.objects.bulk_create(
+        [
+            MonthlySequence(
+                name="donation",
+                year_month=int(row["month"].strftime("%y%m")),
+                last_value=row["last_value"] or 0,
+            )
+            for row in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donation", "0009_alter_donation_number"),
+        ("core", "0011_monthlysequence"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_donation_sequence, migrations.RunPython.noop),
+    ]
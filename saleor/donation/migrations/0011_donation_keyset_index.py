@@ -0,0 +1,32 @@
+# Generated by Django 3.2.24 on 2026-10-17 12:00
+
+from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donation", "0010_seed_donation_sequence"),
+    ]
+
+    atomic = False
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="donation",
+            options={
+                "ordering": ("-created_at", "-pk"),
+                "permissions": (
+                    ("manage_donations", "Manage donations"),
+                    ("add_donations", "Add donations"),
+                ),
+            },
+        ),
+        AddIndexConcurrently(
+            model_name="donation",
+            index=BTreeIndex(
+                fields=["created_at", "id"], name="donation_created_at_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 3.2.24 on 2026-10-17 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+SUB_MODULUS = 100000
+
+
+def decode_barcode(code):
+    year_month, sub = divmod(int(code), SUB_MODULUS)
+    year, month = divmod(year_month, 100)
+    if year > 99 or not 1 <= month <= 12 or sub < 1:
+        return None
+    return year_month, sub
+
+
+def link_donations_to_barcodes(apps, _schema_editor):
+    """Link donations to barcodes of their codes, creating missing barcodes.
+
+    Barcode counters are advanced past the created barcodes, so their subs are
+    not reserved for printed barcodes.
+    """
+    Barcode = apps.get_model("barcode", "Barcode")
+    Donation = apps.get_model("donation", "Donation")
+    MonthlySequence = apps.get_model("core", "MonthlySequence")
+    codes = (
+        Donation.objects.filter(barcode_code__regex=r"^\s*[1-9][0-9]{0,10}\s*$")
+        .values_list("barcode_code", flat=True)
+        .distinct()
+        .order_by()
+    )
+    keys = {code: decode_barcode(code) for code in codes}
+    keys = {code: key for code, key in keys.items() if key}
+    existing = {
+        (barcode.year_month, barcode.sub): barcode
+        for barcode in Barcode.objects.filter(
+            year_month__in={year_month for year_month, _sub in keys.values()}
+        )
+    }
+    # Barcodes of donations are used, including the ones created here.
+    Barcode.objects.filter(pk__in=[b.pk for b in existing.values()]).update(used=True)
+    missing = [
+        Barcode(year_month=year_month, sub=sub, used=True)
+        for year_month, sub in set(keys.values()) - existing.keys()
+    ]
+    for barcode in Barcode.objects.bulk_create(missing, batch_size=BATCH_SIZE):
+        existing[(barcode.year_month, barcode.sub)] = barcode
+
+    last_subs = {}
+    for barcode in missing:
+        last_subs[barcode.year_month] = max(
+            barcode.sub, last_subs.get(barcode.year_month, 0)
+        )
+    for year_month, last_sub in last_subs.items():
+        sequence, _ = MonthlySequence.objects.get_or_create(
+            name="barcode", year_month=year_month
+        )
+        if sequence.last_value < last_sub:
+            sequence.last_value = last_sub
+            sequence.save(update_fields=["last_value"])
+
+    donations = []
+    for donation in Donation.objects.filter(barcode_code__in=keys.keys()).only(
+        "pk", "barcode_code"
+    ):
+        donation.barcode = existing[keys[donation.barcode_code]]
+        donations.append(donation)
+    Donation.objects.bulk_update(donations, ["barcode"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("barcode", "0005_barcode_year_month_sub_unique"),
+        ("core", "0011_monthlysequence"),
+        ("donation", "0011_donation_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="donation",
+            old_name="barcode",
+            new_name="barcode_code",
+        ),
+        migrations.AddField(
+            model_name="donation",
+            name="barcode",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="donations",
+                to="barcode.barcode",
+            ),
+        ),
+        migrations.RunPython(link_donations_to_barcodes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.24 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donation", "0012_donation_barcode_fk"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="donation",
+            name="number",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
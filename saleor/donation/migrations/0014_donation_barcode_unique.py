@@ -0,0 +1,48 @@
+# Generated by Django 3.2.24 on 2026-10-18 13:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def unlink_duplicated_barcodes(apps, _schema_editor):
+    """Keep barcodes linked only to the first donation created with them.
+
+    Codes of the other donations are kept in `barcode_code`.
+    """
+    Donation = apps.get_model("donation", "Donation")
+    duplicated = (
+        Donation.objects.filter(barcode__isnull=False)
+        .values("barcode")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values_list("barcode", flat=True)
+        .order_by()
+    )
+    for barcode_id in duplicated:
+        first = (
+            Donation.objects.filter(barcode_id=barcode_id)
+            .order_by("created_at", "pk")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        Donation.objects.filter(barcode_id=barcode_id).exclude(pk=first).update(
+            barcode=None
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donation", "0013_alter_donation_number"),
+    ]
+
+    operations = [
+        migrations.RunPython(unlink_duplicated_barcodes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="donation",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(barcode__isnull=False),
+                fields=("barcode",),
+                name="donation_barcode_unique",
+            ),
+        ),
+    ]
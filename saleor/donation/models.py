@@ -1,30 +1,37 @@
 import uuid
-from datetime import datetime
 
 from django.conf import settings
+from django.contrib.postgres.indexes import BTreeIndex
 from django.db import models
 from django.utils import timezone
 from django_prices.models import MoneyField
 
 from saleor import settings
 
+from ..core import MonthlySequenceName
+from ..core.models import MonthlySequence
 from ..permission.enums import DonationPermissions
 from . import DonationStatus
 
 
 def get_donation_number():
-    now = timezone.now()
-    current_year_month = datetime(now.year, now.month, 1, tzinfo=now.tzinfo)
-    return Donation.objects.filter(created_at__gte=current_year_month).count() + 1
+    return MonthlySequence.next_value(MonthlySequenceName.DONATION)
 
 
 class Donation(models.Model):
     id = models.UUIDField(
         primary_key=True, editable=False, unique=True, default=uuid.uuid4
     )
-    number = models.IntegerField(default=get_donation_number, null=True, blank=True)
+    number = models.IntegerField(null=True, blank=True)
     donator = models.CharField(max_length=128, null=True, blank=True)
-    barcode = models.CharField(max_length=256, null=True, blank=True)
+    barcode = models.ForeignKey(
+        "barcode.Barcode",
+        related_name="donations",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    barcode_code = models.CharField(max_length=256, null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(default=timezone.now, editable=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
@@ -52,8 +59,24 @@ class Donation(models.Model):
     quantity = models.PositiveIntegerField(default=1)
 
     class Meta:
-        ordering = ("-created_at", "pk")
+        ordering = ("-created_at", "-pk")
+        indexes = [
+            BTreeIndex(fields=["created_at", "id"], name="donation_created_at_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["barcode"],
+                condition=models.Q(barcode__isnull=False),
+                name="donation_barcode_unique",
+            ),
+        ]
         permissions = (
             (DonationPermissions.MANAGE_DONATIONS.codename, "Manage donations"),
             (DonationPermissions.ADD_DONATIONS.codename, "Add donations"),
         )
+
+    def save(self, *args, **kwargs):
+        # Numbers are allocated on insert only, so unsaved donations don't use them.
+        if self._state.adding and self.number is None:
+            self.number = get_donation_number()
+        super().save(*args, **kwargs)
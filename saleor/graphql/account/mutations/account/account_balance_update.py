@@ -1,12 +1,13 @@
-import graphene
+from decimal import Decimal
 
-from saleor.account.events import change_balance_event
+import graphene
 
-from .....account import models
+from .....account import ledger, models
 from .....account.search import prepare_user_search_document_value
 from .....account.utils import (
     remove_the_oldest_user_address_if_address_limit_is_reached,
 )
+from .....core.prices import quantize_price
 from .....core.tracing import traced_atomic_transaction
 from .....permission.enums import AccountPermissions
 from .....webhook.event_types import WebhookEventAsyncType
@@ -51,17 +52,11 @@ class BalanceUpdate(ModelMutation):
     def perform_mutation(cls, root, info: ResolveInfo, /, **data):
         user_id = data["user_id"]
         user = cls.get_node_or_error(info, user_id, field="user_id", only_type=User)
-        balance = data["balance"]
+        balance = quantize_price(Decimal(str(data["balance"])), "AXB")
         instance = user
         with traced_atomic_transaction():
-            user.balance = balance
-            user.save(update_fields=["balance"])
-            cls.post_save_action(info, instance, data)
+            ledger.set_balance(user, balance)
             response = cls.success_response(instance)
             response.user = user
 
         return response
-
-    @classmethod
-    def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
-        change_balance_event(user=instance, balance=cleaned_input["balance"])
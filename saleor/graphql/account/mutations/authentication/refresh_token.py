@@ -2,14 +2,15 @@ from typing import Optional
 
 import graphene
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
+from .....account.continuous_login import record_login
 from .....account.error_codes import AccountErrorCode
 from .....core.jwt import (
     JWT_REFRESH_TOKEN_COOKIE_NAME,
     JWT_REFRESH_TYPE,
     create_access_token,
 )
-from .....plugins.openid_connect.utils import update_continuous_days
 from ....core import ResolveInfo
 from ....core.doc_category import DOC_CATEGORY_AUTH
 from ....core.mutations import BaseMutation
@@ -135,5 +136,7 @@ class RefreshToken(BaseMutation):
             additional_payload["aud"] = audience
         token = create_access_token(user, additional_payload=additional_payload)
         if user and not user.is_anonymous:
-            update_continuous_days(user)
+            user.last_login = timezone.now()
+            user.save(update_fields=["last_login", "updated_at"])
+            record_login(user, user.last_login)
         return cls(errors=[], user=user, token=token)
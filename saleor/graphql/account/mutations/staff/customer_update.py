@@ -4,7 +4,8 @@ import graphene
 from django.db.models import QuerySet
 
 from .....account import events as account_events
-from .....account import models
+from .....account import ledger, models
+from .....core.tracing import traced_atomic_transaction
 from .....giftcard.search import mark_gift_cards_search_index_as_dirty
 from .....giftcard.utils import assign_user_gift_cards, get_user_gift_cards
 from .....order.utils import match_orders_with_new_user
@@ -68,7 +69,6 @@ class CustomerUpdate(CustomerCreate, ModelWithExtRefMutation):
 
         # Compare the data
         has_new_name = old_instance.get_full_name() != new_fullname
-        has_new_balance = old_instance.balance != new_instance.balance
         has_new_email = old_instance.email != new_email
         was_activated = not old_instance.is_active and new_instance.is_active
         was_deactivated = old_instance.is_active and not new_instance.is_active
@@ -100,11 +100,6 @@ class CustomerUpdate(CustomerCreate, ModelWithExtRefMutation):
                 account_id=old_instance.id,
             )
 
-        if has_new_balance and old_instance is not None:
-            account_events.change_balance_event(
-                user=old_instance, balance=new_instance.balance
-            )
-
     @classmethod
     def update_gift_card_search_vector(
         cls,
@@ -132,6 +127,8 @@ class CustomerUpdate(CustomerCreate, ModelWithExtRefMutation):
 
         # Clean the input and generate a new instance from the new data
         cleaned_input = cls.clean_input(info, original_instance, data)
+        # The balance is changed through the ledger, not by saving the instance.
+        balance = cleaned_input.pop("balance", None)
         metadata_list = cleaned_input.pop("metadata", None)
         private_metadata_list = cleaned_input.pop("private_metadata", None)
 
@@ -142,7 +139,15 @@ class CustomerUpdate(CustomerCreate, ModelWithExtRefMutation):
 
         # Save the new instance data
         cls.clean_instance(info, new_instance)
-        cls.save(info, new_instance, cleaned_input)
+        with traced_atomic_transaction():
+            # Saving the whole instance writes its balance as well, keep the user
+            # locked so it does not overwrite a concurrent posting.
+            new_instance.balance = ledger.lock_balances([new_instance.pk])[
+                new_instance.pk
+            ]
+            cls.save(info, new_instance, cleaned_input)
+            if balance is not None:
+                ledger.set_balance(new_instance, balance)
         cls._save_m2m(info, new_instance, cleaned_input)
 
         # Generate events by comparing the instances
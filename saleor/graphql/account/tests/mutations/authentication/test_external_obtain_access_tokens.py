@@ -1,6 +1,13 @@
 import json
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
+from ......account import BalanceEvents
+from ......account.continuous_login import (
+    get_login_day,
+    process_pending_logins,
+    record_login,
+)
 from ......plugins.base_plugin import ExternalAccessTokens
 from .....tests.utils import get_graphql_content
 
@@ -68,3 +75,48 @@ def test_external_obtain_access_tokens(
     assert data["user"]["email"] == customer_user.email
     assert mocked_plugin_fun.called
     assert mock_refresh_token_middleware.called
+
+
+@patch("saleor.core.middleware.jwt_decode_with_exception_handler")
+def test_external_obtain_access_tokens_counts_login_streak(
+    mock_refresh_token_middleware,
+    api_client,
+    customer_user,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    customer_user.continuous = 1
+    customer_user.last_streak_day = get_login_day(customer_user.last_login)
+    customer_user.save(update_fields=["continuous", "last_streak_day"])
+    login_time = customer_user.last_login + timedelta(days=1)
+    balance = customer_user.balance
+
+    def external_obtain_access_tokens(*args, **kwargs):
+        record_login(customer_user, login_time)
+        return ExternalAccessTokens(token="token1", user=customer_user)
+
+    monkeypatch.setattr(
+        "saleor.plugins.manager.PluginsManager.external_obtain_access_tokens",
+        external_obtain_access_tokens,
+    )
+    variables = {
+        "pluginId": "pluginId1",
+        "input": json.dumps({"code": "ABCD", "state": "stata-data"}),
+    }
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post_graphql(MUTATION_EXTERNAL_REFRESH, variables)
+    get_graphql_content(response)
+    processed = process_pending_logins()
+
+    # then
+    assert processed == 1
+    customer_user.refresh_from_db()
+    assert customer_user.continuous == 2
+    assert customer_user.last_streak_day == get_login_day(login_time)
+    assert customer_user.balance == balance + 1
+    assert customer_user.balance_events.filter(
+        type=BalanceEvents.CONSECUTIVE_LOGIN
+    ).exists()
@@ -0,0 +1,41 @@
+from django.apps import AppConfig, apps
+from django.db.backends.signals import connection_created
+
+
+class GraphQLAppConfig(AppConfig):
+    name = "saleor.graphql"
+
+    def ready(self):
+        from django.contrib.sites.models import Site
+
+        from ..site import models as site_models
+        from ..warehouse import models as warehouse_models
+        from .core.response_cache import (
+            CATALOG,
+            SITE,
+            install_response_cache_invalidation,
+            register_response_cache_tables,
+        )
+
+        catalog_models = [
+            *apps.get_app_config("product").get_models(include_auto_created=True),
+            *apps.get_app_config("attribute").get_models(include_auto_created=True),
+            warehouse_models.Allocation,
+            warehouse_models.PreorderAllocation,
+            warehouse_models.PreorderReservation,
+            warehouse_models.Reservation,
+            warehouse_models.Stock,
+        ]
+        site_models_list = [
+            Site,
+            site_models.SiteCarousel,
+            site_models.SiteCarouselLine,
+            site_models.SiteSettings,
+            site_models.SiteSettingsTranslation,
+        ]
+        register_response_cache_tables(catalog_models, CATALOG)
+        register_response_cache_tables(site_models_list, SITE)
+        connection_created.connect(
+            install_response_cache_invalidation,
+            dispatch_uid="install_response_cache_invalidation",
+        )
@@ -1,3 +1,4 @@
 from .barcode_batch_create import BarcodeBatchCreate
+from .barcode_batch_scan import BarcodeBatchScan
 
-__all__ = ["BarcodeBatchCreate"]
+__all__ = ["BarcodeBatchCreate", "BarcodeBatchScan"]
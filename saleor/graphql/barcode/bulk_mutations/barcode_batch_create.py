@@ -1,7 +1,13 @@
 import graphene
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import transaction
 
 from ....barcode import models
+from ....barcode.error_codes import BarcodeErrorCode
+from ....core import MonthlySequenceName
+from ....core.models import MonthlySequence
+from ....core.utils.date_time import get_year_month
 from ....permission.enums import BarcodePermissions
 from ...core import ResolveInfo
 from ...core.context import get_database_connection_name
@@ -21,6 +27,10 @@ class BarcodeBatchCreate(BaseMutation):
     class Arguments:
         count = graphene.Int(
             required=True,
+            description=(
+                "Number of barcodes to create, up to "
+                f"{settings.BARCODE_BATCH_CREATE_MAX_COUNT}."
+            ),
         )
 
     class Meta:
@@ -33,13 +43,36 @@ class BarcodeBatchCreate(BaseMutation):
         support_private_meta_field = False
 
     @classmethod
-    def perform_mutation(cls, _root, _info: ResolveInfo, **data):
-        count = data.pop("count")
+    def clean_count(cls, count: int) -> int:
+        max_count = settings.BARCODE_BATCH_CREATE_MAX_COUNT
+        if count <= 0 or count > max_count:
+            raise ValidationError(
+                {
+                    "count": ValidationError(
+                        f"Count must be between 1 and {max_count}.",
+                        code=BarcodeErrorCode.INVALID.value,
+                    )
+                }
+            )
+        return count
+
+    @classmethod
+    def perform_mutation(cls, _root, info: ResolveInfo, **data):
+        count = cls.clean_count(data.pop("count"))
+        year_month = get_year_month()
+        # The subs are reserved as one block, so the barcodes can be inserted with
+        # a single query instead of allocating the numbers one by one.
+        barcodes = [
+            models.Barcode(year_month=year_month, sub=None) for _ in range(count)
+        ]
         with transaction.atomic():
-            barcodes = [
-                models.Barcode.objects.using(
-                    get_database_connection_name(_info.context)
-                ).create()
-                for _ in range(count)
-            ]
-            return BarcodeBatchCreate(barcodes=barcodes, errors=None)
+            MonthlySequence.assign(
+                MonthlySequenceName.BARCODE,
+                barcodes,
+                field="sub",
+                year_month=year_month,
+            )
+            barcodes = models.Barcode.objects.using(
+                get_database_connection_name(info.context)
+            ).bulk_create(barcodes)
+        return BarcodeBatchCreate(barcodes=barcodes, errors=None)
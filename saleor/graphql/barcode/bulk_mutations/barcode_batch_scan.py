@@ -0,0 +1,99 @@
+import graphene
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from ....barcode import decode_barcode
+from ....barcode.error_codes import BarcodeErrorCode
+from ....barcode.utils import scan_barcodes
+from ....permission.enums import BarcodePermissions
+from ...core import ResolveInfo
+from ...core.context import get_database_connection_name
+from ...core.doc_category import DOC_CATEGORY_BARCODES
+from ...core.mutations import BaseMutation
+from ...core.types.common import BarcodeError, NonNullList
+from ..types import BarcodeScanResult
+
+
+class BarcodeBatchScan(BaseMutation):
+    results = NonNullList(
+        BarcodeScanResult,
+        description="Results of the scanned codes, in the order of the codes.",
+    )
+
+    class Arguments:
+        codes = NonNullList(
+            graphene.String,
+            required=True,
+            description=(
+                "Codes printed on the labels, up to "
+                f"{settings.BARCODE_BATCH_SCAN_MAX_COUNT}."
+            ),
+        )
+        mark_used = graphene.Boolean(
+            default_value=True,
+            description=(
+                "Whether the scanned barcodes are marked as used. Set to false to "
+                "only look them up."
+            ),
+        )
+
+    class Meta:
+        description = (
+            "Look up barcodes of the scanned codes and mark them as used. Codes of "
+            "barcodes that do not exist are returned without a barcode."
+        )
+        doc_category = DOC_CATEGORY_BARCODES
+        permissions = (BarcodePermissions.MANAGE_BARCODE,)
+        error_type_class = BarcodeError
+        error_type_field = "barcode_errors"
+        support_meta_field = False
+        support_private_meta_field = False
+
+    @classmethod
+    def clean_codes(cls, codes: list[str]) -> list[str]:
+        max_count = settings.BARCODE_BATCH_SCAN_MAX_COUNT
+        if not codes or len(codes) > max_count:
+            raise ValidationError(
+                {
+                    "codes": ValidationError(
+                        f"Number of codes must be between 1 and {max_count}.",
+                        code=BarcodeErrorCode.INVALID.value,
+                    )
+                }
+            )
+        invalid_codes = []
+        for code in codes:
+            try:
+                decode_barcode(code)
+            except ValueError:
+                invalid_codes.append(code)
+        if invalid_codes:
+            raise ValidationError(
+                {
+                    "codes": ValidationError(
+                        f"Invalid codes: {', '.join(invalid_codes)}.",
+                        code=BarcodeErrorCode.INVALID.value,
+                    )
+                }
+            )
+        return codes
+
+    @classmethod
+    def perform_mutation(cls, _root, info: ResolveInfo, **data):
+        codes = cls.clean_codes(data["codes"])
+        results = scan_barcodes(
+            codes,
+            get_database_connection_name(info.context),
+            mark_used=data.get("mark_used", True),
+        )
+        return BarcodeBatchScan(
+            results=[
+                BarcodeScanResult(
+                    code=result.code,
+                    barcode=result.barcode,
+                    used_before=result.used_before,
+                )
+                for result in results
+            ],
+            errors=None,
+        )
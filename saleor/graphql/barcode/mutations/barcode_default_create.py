@@ -1,10 +1,13 @@
 from typing import Tuple
 
 import graphene
+from django.core.exceptions import ValidationError
 
 from saleor.graphql.core.context import get_database_connection_name
 
-from ....barcode import models
+from ....barcode import decode_barcode, models
+from ....barcode.error_codes import BarcodeErrorCode
+from ....barcode.utils import get_reserved_codes
 from ..types import Barcode
 from ....permission.enums import BarcodePermissions
 from ...core import ResolveInfo
@@ -38,12 +41,33 @@ class BarcodeDefaultCreate(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, _info: ResolveInfo, **data):
-        number = data.get("number", 0)
-        year_month = number // 100000
-        sub = number % 100000
-        barcode, created = models.Barcode.objects.using(
+        code = str(data.get("number", 0))
+        try:
+            year_month, sub = decode_barcode(code)
+        except ValueError:
+            raise ValidationError(
+                {
+                    "number": ValidationError(
+                        "Number is not a valid barcode.",
+                        code=BarcodeErrorCode.INVALID.value,
+                    )
+                }
+            )
+        barcodes = models.Barcode.objects.using(
             get_database_connection_name(_info.context)
-        ).get_or_create(year_month=year_month, sub=sub)
+        )
+        printed = barcodes.filter(year_month=year_month, sub=sub).exists()
+        # Subs which were not reserved yet belong to barcodes printed later.
+        if not printed and not get_reserved_codes([code]):
+            raise ValidationError(
+                {
+                    "number": ValidationError(
+                        "Barcode was not printed.",
+                        code=BarcodeErrorCode.INVALID.value,
+                    )
+                }
+            )
+        barcode, created = barcodes.get_or_create(year_month=year_month, sub=sub)
 
         used_before = barcode.used
 
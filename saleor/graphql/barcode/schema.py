@@ -13,7 +13,7 @@ from .filters import BarcodeFilterInput
 from .sorters import BarcodeSortingInput
 from .types import BarcodeCountableConnection
 from .mutations import BarcodeDefaultCreate
-from .bulk_mutations import BarcodeBatchCreate
+from .bulk_mutations import BarcodeBatchCreate, BarcodeBatchScan
 
 
 class BarcodeQueries(graphene.ObjectType):
@@ -39,3 +39,5 @@ class BarcodeMutations(graphene.ObjectType):
     barcode_default_create = BarcodeDefaultCreate.Field()
 
     barcode_batch_create = BarcodeBatchCreate.Field()
+
+    barcode_batch_scan = BarcodeBatchScan.Field()
@@ -0,0 +1,71 @@
+import pytest
+
+from .....barcode.models import Barcode
+from ....tests.utils import get_graphql_content
+
+BARCODE_BATCH_CREATE_MUTATION = """
+    mutation BarcodeBatchCreate($count: Int!) {
+        barcodeBatchCreate(count: $count) {
+            barcodes {
+                id
+                number
+                createdAt
+            }
+            errors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize("count", [10, 500, 5000])
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_barcode_batch_create(
+    count,
+    staff_api_client,
+    permission_manage_barcode,
+    django_assert_max_num_queries,
+    count_queries,
+    _monthly_sequences,
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_barcode)
+
+    # when
+    with django_assert_max_num_queries(10):
+        response = staff_api_client.post_graphql(
+            BARCODE_BATCH_CREATE_MUTATION, {"count": count}
+        )
+
+    # then
+    data = get_graphql_content(response)["data"]["barcodeBatchCreate"]
+    assert not data["errors"]
+    assert len(data["barcodes"]) == count
+    numbers = [barcode["number"] for barcode in data["barcodes"]]
+    assert len(set(numbers)) == count
+    assert Barcode.objects.count() == count
+
+
+@pytest.mark.django_db
+def test_barcode_batch_create_over_limit(
+    staff_api_client, permission_manage_barcode, settings
+):
+    # given
+    settings.BARCODE_BATCH_CREATE_MAX_COUNT = 5
+
+    # when
+    response = staff_api_client.post_graphql(
+        BARCODE_BATCH_CREATE_MUTATION,
+        {"count": 6},
+        permissions=[permission_manage_barcode],
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["barcodeBatchCreate"]
+    assert data["errors"][0]["field"] == "count"
+    assert data["errors"][0]["code"] == "INVALID"
+    assert not Barcode.objects.exists()
@@ -0,0 +1,124 @@
+import pytest
+
+from ....barcode import encode_barcode
+from ....barcode.models import Barcode
+from ...tests.utils import get_graphql_content
+
+BARCODE_BATCH_SCAN_MUTATION = """
+    mutation BarcodeBatchScan($codes: [String!]!, $markUsed: Boolean) {
+        barcodeBatchScan(codes: $codes, markUsed: $markUsed) {
+            results {
+                code
+                usedBefore
+                barcode {
+                    code
+                    used
+                }
+            }
+            errors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def barcodes(db):
+    return Barcode.objects.bulk_create(
+        [
+            Barcode(year_month=2403, sub=1, used=False),
+            Barcode(year_month=2403, sub=2, used=True),
+        ]
+    )
+
+
+def test_barcode_batch_scan_marks_barcodes_used(
+    staff_api_client,
+    permission_manage_barcode,
+    barcodes,
+    django_assert_max_num_queries,
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_barcode)
+    unused, used = barcodes
+    missing_code = encode_barcode(2403, 3)
+    codes = [unused.code, used.code, missing_code, unused.code]
+
+    # when
+    with django_assert_max_num_queries(10):
+        response = staff_api_client.post_graphql(
+            BARCODE_BATCH_SCAN_MUTATION, {"codes": codes}
+        )
+
+    # then
+    data = get_graphql_content(response)["data"]["barcodeBatchScan"]
+    assert not data["errors"]
+    assert data["results"] == [
+        {
+            "code": "240300001",
+            "usedBefore": False,
+            "barcode": {"code": "240300001", "used": True},
+        },
+        {
+            "code": "240300002",
+            "usedBefore": True,
+            "barcode": {"code": "240300002", "used": True},
+        },
+        {"code": missing_code, "usedBefore": None, "barcode": None},
+        {
+            "code": "240300001",
+            "usedBefore": True,
+            "barcode": {"code": "240300001", "used": True},
+        },
+    ]
+    unused.refresh_from_db()
+    assert unused.used
+    assert not Barcode.objects.filter(year_month=2403, sub=3).exists()
+
+
+def test_barcode_batch_scan_look_up_only(
+    staff_api_client, permission_manage_barcode, barcodes
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_barcode)
+    unused, _used = barcodes
+
+    # when
+    response = staff_api_client.post_graphql(
+        BARCODE_BATCH_SCAN_MUTATION, {"codes": [unused.code], "markUsed": False}
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["barcodeBatchScan"]
+    assert data["results"][0]["usedBefore"] is False
+    unused.refresh_from_db()
+    assert not unused.used
+
+
+def test_barcode_batch_scan_invalid_codes(
+    staff_api_client, permission_manage_barcode, barcodes
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_barcode)
+
+    # when
+    response = staff_api_client.post_graphql(
+        BARCODE_BATCH_SCAN_MUTATION,
+        {"codes": [barcodes[0].code, "A-12", "0123", "7"]},
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["barcodeBatchScan"]
+    assert data["results"] is None
+    assert data["errors"] == [
+        {
+            "field": "codes",
+            "code": "INVALID",
+            "message": "Invalid codes: A-12, 0123, 7.",
+        }
+    ]
+    barcodes[0].refresh_from_db()
+    assert not barcodes[0].used
@@ -4,7 +4,7 @@ from ..core import ResolveInfo
 from ...barcode import models
 from ...graphql.core.doc_category import DOC_CATEGORY_BARCODES
 from ..core.connection import CountableConnection
-from ..core.types import ModelObjectType
+from ..core.types import BaseObjectType, ModelObjectType
 
 
 class Barcode(ModelObjectType[models.Barcode]):
@@ -16,6 +16,9 @@ class Barcode(ModelObjectType[models.Barcode]):
         required=False, description="Whether the barcode is used or not."
     )
     number = graphene.Int(required=False, description="the number of the barcode")
+    code = graphene.String(
+        required=True, description="The code printed on the label of the barcode."
+    )
 
     class Meta:
         description = "Represents barcode."
@@ -26,8 +29,29 @@ class Barcode(ModelObjectType[models.Barcode]):
     def resolve_number(root: models.Barcode, info: ResolveInfo):
         return root.year_month * 100000 + root.sub
 
+    @staticmethod
+    def resolve_code(root: models.Barcode, _info: ResolveInfo):
+        return root.code
+
 
 class BarcodeCountableConnection(CountableConnection):
     class Meta:
         doc_category = DOC_CATEGORY_BARCODES
         node = Barcode
+
+
+class BarcodeScanResult(BaseObjectType):
+    code = graphene.String(required=True, description="The scanned code.")
+    barcode = graphene.Field(
+        Barcode, description="The barcode of the code, null if it does not exist."
+    )
+    used_before = graphene.Boolean(
+        description=(
+            "Whether the barcode was used before it was scanned, null if it does "
+            "not exist."
+        )
+    )
+
+    class Meta:
+        description = "Represents the result of scanning a barcode."
+        doc_category = DOC_CATEGORY_BARCODES
@@ -11,8 +11,10 @@ from typing import (
 
 import graphene
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import BooleanField, F, Func, Q, QuerySet, Value
+from django.db.models import Field as DjangoField
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
 from graphene.relay import Connection
 from graphql import GraphQLError
 from graphql.language.ast import FragmentSpread
@@ -26,6 +28,7 @@ from ..channel.utils import get_default_channel_slug_or_graphql_error
 from ..core.enums import OrderDirection
 from ..core.types import BaseConnection, NonNullList
 from ..utils.sorting import sort_queryset_for_connection
+from .total_count import get_total_count
 
 if TYPE_CHECKING:
     from ..core import ResolveInfo
@@ -147,6 +150,67 @@ def _prepare_filter(
     return filter_kwargs
 
 
+class _RowValue(Func):
+    template = "(%(expressions)s)"
+
+
+class _RowValueComparison(Func):
+    template = "%(expressions)s"
+
+    def __init__(self, lhs: _RowValue, rhs: _RowValue, operator: str):
+        super().__init__(lhs, rhs, output_field=BooleanField())
+        self.arg_joiner = f" {operator} "
+
+
+def _get_keyset_fields(
+    qs: QuerySet, sorting_fields: list[str], sorting_direction: str
+) -> Optional[list[DjangoField]]:
+    """Return model fields of the sorting if the queryset can use keyset pagination.
+
+    Keyset pagination compares row values, e.g. `(date, id) < (%s, %s)`, which
+    PostgreSQL resolves with a composite index instead of scanning all preceding
+    rows. It requires the queryset to be sorted by non-nullable columns of the
+    model, all in the direction of the cursor filter.
+    """
+    prefix = "-" if sorting_direction == "lt" else ""
+    ordering = tuple(f"{prefix}{field_name}" for field_name in sorting_fields)
+    if tuple(qs.query.order_by) != ordering or qs.query.extra_order_by:
+        return None
+    opts = qs.model._meta
+    fields = []
+    for field_name in sorting_fields:
+        if field_name in qs.query.annotations:
+            return None
+        try:
+            field = opts.pk if field_name == "pk" else opts.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.null or field.is_relation:
+            return None
+        fields.append(field)
+    return fields
+
+
+def _prepare_keyset_filter(
+    cursor: list[str],
+    sorting_fields: list[str],
+    fields: list[DjangoField],
+    sorting_direction: str,
+) -> _RowValueComparison:
+    try:
+        values = [field.to_python(value) for field, value in zip(fields, cursor)]
+    except (ValidationError, ValueError, TypeError):
+        raise GraphQLError("Received cursor is invalid.")
+    operator = ">" if sorting_direction == "gt" else "<"
+    return _RowValueComparison(
+        _RowValue(*[F(field_name) for field_name in sorting_fields]),
+        _RowValue(
+            *[Value(value, output_field=field) for field, value in zip(fields, values)]
+        ),
+        operator,
+    )
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -284,16 +348,20 @@ def connection_from_queryset_slice(
     )
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(
-            cursor,
-            sorting_fields,
-            sorting_direction,
-            _get_id_coercion(qs),
-        )
-        if cursor
-        else Q()
-    )
+    filter_kwargs: Union[Q, _RowValueComparison] = Q()
+    if cursor:
+        keyset_fields = _get_keyset_fields(qs, sorting_fields, sorting_direction)
+        if keyset_fields and None not in cursor:
+            filter_kwargs = _prepare_keyset_filter(
+                cursor, sorting_fields, keyset_fields, sorting_direction
+            )
+        else:
+            filter_kwargs = _prepare_filter(
+                cursor,
+                sorting_fields,
+                sorting_direction,
+                _get_id_coercion(qs),
+            )
     try:
         filtered_qs = qs.filter(filter_kwargs)
     except ValueError:
@@ -304,14 +372,10 @@ def connection_from_queryset_slice(
     )
 
     if "total_count" in connection_type._meta.fields:
-
-        def get_total_count():
-            return qs.count()
-
         return connection_type(
             edges=edges,
             page_info=pageinfo_type(**page_info),
-            total_count=get_total_count,
+            total_count=lambda: get_total_count(qs),
         )
 
     return connection_type(
@@ -0,0 +1,129 @@
+"""Caches of parsed and validated GraphQL documents.
+
+Storefronts send the same few operations over and over again. Instead of
+parsing, validating and computing the cost of every incoming query, documents
+are kept in a process-level LRU cache keyed by the SHA-256 hash of the query,
+and query costs are memoized per hash and shape of the variables.
+
+Clients may also send only the hash of a query that was sent before, following
+the Automatic Persisted Queries protocol.
+"""
+import hashlib
+import json
+from functools import partial
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument
+from graphql.error import GraphQLError
+from graphql.execution import ExecutionResult
+from graphql.validation import validate
+
+from ...core.utils.lru_cache import LRUCache
+from .validators.query_cost import validate_query_cost
+
+PERSISTED_QUERY_CACHE_KEY = "persisted_query:{query_hash}"
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+document_cache = LRUCache("GRAPHQL_DOCUMENT_CACHE_SIZE")
+query_cost_cache = LRUCache("GRAPHQL_QUERY_COST_CACHE_SIZE")
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _execute_validated(validation_errors, execute, *args, **kwargs):
+    if validation_errors:
+        return ExecutionResult(errors=validation_errors, invalid=True)
+    return execute(*args, validate=False, **kwargs)
+
+
+def get_validated_document(backend, schema, query: str, query_hash: str):
+    """Return the parsed document of the query, validated only once.
+
+    Validation errors are reported when the document is executed, the same way
+    as by documents returned by the backend.
+    """
+    key = (id(schema), query_hash)
+    document = document_cache.get(key)
+    if document is None:
+        document = backend.document_from_string(schema, query)
+        validation_errors = validate(schema, document.document_ast)
+        document = GraphQLDocument(
+            schema=document.schema,
+            document_string=document.document_string,
+            document_ast=document.document_ast,
+            execute=partial(_execute_validated, validation_errors, document.execute),
+        )
+        document_cache.set(key, document)
+    return document
+
+
+def get_variables_shape(value):
+    """Return the parts of the variables that can change the cost of a query.
+
+    Costs depend on numbers (`first`, `last`) and on lengths of lists, so
+    strings are replaced with a placeholder unless they hold a number.
+    """
+    if isinstance(value, dict):
+        return {key: get_variables_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [get_variables_shape(item) for item in value]
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return "<str>"
+    return value
+
+
+def get_query_cost(
+    schema, document: GraphQLDocument, query_hash: str, variables, cost_map, maximum
+):
+    """Memoized `validate_query_cost` for the same query and variables shape."""
+    try:
+        shape = json.dumps(get_variables_shape(variables), sort_keys=True)
+    except (TypeError, ValueError):
+        return validate_query_cost(schema, document, variables, cost_map, maximum)
+    key = (id(schema), query_hash, shape, maximum)
+    result = query_cost_cache.get(key)
+    if result is None:
+        result = validate_query_cost(schema, document, variables, cost_map, maximum)
+        query_cost_cache.set(key, result)
+    return result
+
+
+def get_persisted_query(
+    query: Optional[str], extensions
+) -> tuple[Optional[str], Optional[GraphQLError]]:
+    """Resolve an Automatic Persisted Query.
+
+    Returns the query to execute and an error if the query can't be resolved.
+    """
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return query, None
+    if not isinstance(extensions, dict):
+        return query, None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return query, None
+    query_hash = persisted_query.get("sha256Hash")
+    if persisted_query.get("version") != 1 or not isinstance(query_hash, str):
+        return query, GraphQLError(PERSISTED_QUERY_NOT_SUPPORTED)
+    key = PERSISTED_QUERY_CACHE_KEY.format(query_hash=query_hash)
+    if not query:
+        query = cache.get(key)
+        if query is None:
+            # Clients recognize the error by its message and resend the query.
+            return None, GraphQLError(PERSISTED_QUERY_NOT_FOUND)
+        return query, None
+    if not isinstance(query, str) or get_query_hash(query) != query_hash:
+        return query, GraphQLError("Provided sha256Hash does not match the query.")
+    cache.set(key, query, timeout=settings.PERSISTED_QUERY_CACHE_TIMEOUT)
+    return query, None
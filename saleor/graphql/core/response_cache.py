@@ -0,0 +1,163 @@
+"""Response cache of anonymous storefront queries.
+
+Only queries sent without an authentication token whose root fields are all
+listed in `CACHEABLE_FIELDS` are cached, for `GRAPHQL_RESPONSE_CACHE_TIMEOUT`
+seconds; the cache is disabled when the setting is `0`. Responses are keyed by
+the host, the hash of the query, the operation name and the variables, which
+carry the channel and the language of the request.
+
+Every root field belongs to a group of database tables. Any `INSERT`, `UPDATE`
+or `DELETE` of a table of a group bumps the generation of the group, which is a
+part of the cache key, so all cached responses that depend on the group are
+invalidated at once. The statements are inspected by a database execute wrapper
+installed on every connection, so queryset updates, bulk operations and raw SQL
+of requests, Celery tasks and management commands are all covered. Copies kept
+by clients and proxies are not, so cached responses are sent with
+`Cache-Control: private, no-cache` unless `GRAPHQL_RESPONSE_CACHE_PUBLIC` is set.
+"""
+import hashlib
+import json
+import re
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpRequest
+from graphql import GraphQLDocument
+from graphql.language.ast import Field, OperationDefinition
+
+from ... import __version__ as saleor_version
+from ...core.auth import get_token_from_request
+
+CATALOG = "catalog"
+SITE = "site"
+
+CACHEABLE_FIELDS = {
+    "__typename": (),
+    "categories": (CATALOG,),
+    "category": (CATALOG,),
+    "collection": (CATALOG,),
+    "collections": (CATALOG,),
+    "product": (CATALOG,),
+    "products": (CATALOG,),
+    "productType": (CATALOG,),
+    "productTypes": (CATALOG,),
+    "productVariant": (CATALOG,),
+    "productVariants": (CATALOG,),
+    "carousel": (SITE,),
+    "shop": (SITE,),
+}
+
+GENERATION_CACHE_KEY = "graphql_response_cache:generation:{group}"
+RESPONSE_CACHE_KEY = "graphql_response_cache:{version}:{generations}:{hash}"
+
+WRITE_STATEMENT_RE = re.compile(
+    r'^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)"?', re.IGNORECASE
+)
+
+# Populated by `register_response_cache_tables` when the apps are ready.
+GROUPS_BY_TABLE: dict[str, str] = {}
+
+
+def _get_operation(
+    document: GraphQLDocument, operation_name: Optional[str]
+) -> Optional[OperationDefinition]:
+    operations = [
+        definition
+        for definition in document.document_ast.definitions
+        if isinstance(definition, OperationDefinition)
+    ]
+    if operation_name:
+        for operation in operations:
+            if operation.name and operation.name.value == operation_name:
+                return operation
+        return None
+    return operations[0] if len(operations) == 1 else None
+
+
+def get_cached_groups(
+    request: HttpRequest, document: GraphQLDocument, operation_name: Optional[str]
+) -> Optional[set[str]]:
+    """Return groups of models the response depends on if it can be cached."""
+    if not settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+        return None
+    if get_token_from_request(request) or getattr(request, "app", None):
+        return None
+    operation = _get_operation(document, operation_name)
+    if operation is None or operation.operation != "query":
+        return None
+    groups: set[str] = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, Field):
+            return None
+        field_groups = CACHEABLE_FIELDS.get(selection.name.value)
+        if field_groups is None:
+            return None
+        groups.update(field_groups)
+    return groups
+
+
+def get_response_cache_key(
+    request: HttpRequest,
+    groups: set[str],
+    query_hash: str,
+    operation_name: Optional[str],
+    variables,
+) -> str:
+    generation_keys = {
+        group: GENERATION_CACHE_KEY.format(group=group) for group in sorted(groups)
+    }
+    generations = cache.get_many(generation_keys.values())
+    generation = ".".join(
+        f"{group}{generations.get(key, 0)}" for group, key in generation_keys.items()
+    )
+    request_hash = hashlib.sha256(
+        json.dumps(
+            [request.get_host().lower(), query_hash, operation_name, variables],
+            sort_keys=True,
+            cls=DjangoJSONEncoder,
+        ).encode("utf-8")
+    ).hexdigest()
+    return RESPONSE_CACHE_KEY.format(
+        version=saleor_version, generations=generation, hash=request_hash
+    )
+
+
+def _bump_generation(group: str):
+    key = GENERATION_CACHE_KEY.format(group=group)
+    if cache.add(key, 1, timeout=None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def invalidate_response_cache(group: str, using: Optional[str] = None):
+    """Drop all cached responses depending on the group once changes commit."""
+    # Bump both now and after commit, responses computed by other requests while
+    # the transaction was open could have been cached with the old data.
+    _bump_generation(group)
+    transaction.on_commit(lambda: _bump_generation(group), using=using)
+
+
+def register_response_cache_tables(models, group: str):
+    for model in models:
+        GROUPS_BY_TABLE[model._meta.db_table] = group
+
+
+def invalidate_response_cache_on_write(execute, sql, params, many, context):
+    result = execute(sql, params, many, context)
+    if settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+        match = WRITE_STATEMENT_RE.match(sql)
+        group = GROUPS_BY_TABLE.get(match.group(1)) if match else None
+        if group:
+            invalidate_response_cache(group, using=context["connection"].alias)
+    return result
+
+
+def install_response_cache_invalidation(sender, connection, **kwargs):
+    if invalidate_response_cache_on_write not in connection.execute_wrappers:
+        connection.execute_wrappers.append(invalidate_response_cache_on_write)
@@ -0,0 +1,165 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from graphql import get_default_backend
+from graphql.validation import validate
+
+from ...api import schema
+from ...query_cost_map import COST_MAP
+from ..document_cache import (
+    PERSISTED_QUERY_NOT_FOUND,
+    document_cache,
+    get_query_cost,
+    get_query_hash,
+    get_validated_document,
+    get_variables_shape,
+    query_cost_cache,
+)
+
+QUERY_SHOP = """
+    query {
+        shop {
+            name
+        }
+    }
+"""
+
+QUERY_CATEGORIES = """
+    query Categories($first: Int) {
+        categories(first: $first) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_document_cache():
+    document_cache.clear()
+    query_cost_cache.clear()
+    cache.clear()
+    yield
+    document_cache.clear()
+    query_cost_cache.clear()
+    cache.clear()
+
+
+def _persisted_query_extensions(query):
+    return {"persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}}
+
+
+def test_repeated_query_is_parsed_once(api_client, site_settings):
+    # when
+    for _ in range(3):
+        response = api_client.post_graphql(QUERY_SHOP)
+        assert response.status_code == 200
+
+    # then
+    assert len(document_cache) == 1
+    assert document_cache.hits == 2
+    assert document_cache.misses == 1
+
+
+def test_cached_document_keeps_validation_errors(api_client):
+    # given
+    query = "query { shop { notExistingField } }"
+
+    # when
+    responses = [api_client.post_graphql(query) for _ in range(2)]
+
+    # then
+    for response in responses:
+        assert response.status_code == 400
+        assert "notExistingField" in response.json()["errors"][0]["message"]
+    assert document_cache.hits == 1
+
+
+def test_persisted_query_not_found(api_client):
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions(QUERY_SHOP)})
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["errors"][0]["message"] == PERSISTED_QUERY_NOT_FOUND
+
+
+def test_persisted_query_registered_and_executed_by_hash(api_client, site_settings):
+    # given
+    extensions = _persisted_query_extensions(QUERY_SHOP)
+    response = api_client.post({"query": QUERY_SHOP, "extensions": extensions})
+    assert response.status_code == 200
+
+    # when
+    response = api_client.post({"extensions": extensions})
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    # given
+    extensions = _persisted_query_extensions("query { shop { name } }")
+
+    # when
+    response = api_client.post({"query": QUERY_CATEGORIES, "extensions": extensions})
+
+    # then
+    assert response.status_code == 400
+    assert not cache.get(f"persisted_query:{get_query_hash(QUERY_CATEGORIES)}")
+
+
+def test_get_variables_shape():
+    variables = {"first": 10, "ids": ["a", "b"], "filter": {"search": "x"}}
+    assert get_variables_shape(variables) == {
+        "first": 10,
+        "ids": ["<str>", "<str>"],
+        "filter": {"search": "<str>"},
+    }
+
+
+def test_query_cost_memoized_per_variables_shape():
+    # given
+    backend = get_default_backend()
+    query_hash = get_query_hash(QUERY_CATEGORIES)
+    document = get_validated_document(backend, schema, QUERY_CATEGORIES, query_hash)
+
+    # when
+    cost_10 = get_query_cost(schema, document, query_hash, {"first": 10}, COST_MAP, 0)
+    cost_20 = get_query_cost(schema, document, query_hash, {"first": 20}, COST_MAP, 0)
+    cost_10_again = get_query_cost(
+        schema, document, query_hash, {"first": 10}, COST_MAP, 0
+    )
+
+    # then
+    assert cost_10[0] != cost_20[0]
+    assert cost_10_again == cost_10
+    assert query_cost_cache.hits == 1
+
+
+@patch("saleor.graphql.core.document_cache.validate", wraps=validate)
+def test_cached_document_is_parsed_and_validated_once(mocked_validate):
+    # given
+    backend = get_default_backend()
+    query_hash = get_query_hash(QUERY_CATEGORIES)
+    runs = 50
+
+    # when
+    with patch.object(
+        backend, "document_from_string", wraps=backend.document_from_string
+    ) as mocked_parse:
+        documents = [
+            get_validated_document(backend, schema, QUERY_CATEGORIES, query_hash)
+            for _ in range(runs)
+        ]
+
+    # then
+    mocked_parse.assert_called_once_with(schema, QUERY_CATEGORIES)
+    mocked_validate.assert_called_once()
+    assert all(document is documents[0] for document in documents)
+    assert document_cache.hits == runs - 1
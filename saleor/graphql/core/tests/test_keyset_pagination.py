@@ -0,0 +1,210 @@
+import datetime
+import statistics
+import time
+
+import graphene
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ....account.models import BalanceEvent
+from ....tests.models import Book
+from ..connection import (
+    CountableConnection,
+    _get_keyset_fields,
+    create_connection_slice,
+    to_global_cursor,
+)
+from ..fields import ConnectionField
+
+
+class BalanceEventType(graphene.ObjectType):
+    pk = graphene.Int()
+
+
+class BalanceEventTypeCountableConnection(CountableConnection):
+    class Meta:
+        node = BalanceEventType
+
+
+class Query(graphene.ObjectType):
+    events = ConnectionField(BalanceEventTypeCountableConnection)
+
+    @staticmethod
+    def resolve_events(_root, info, **kwargs):
+        qs = BalanceEvent.objects.all()
+        return create_connection_slice(
+            qs, info, kwargs, BalanceEventTypeCountableConnection
+        )
+
+
+schema = graphene.Schema(query=Query)
+
+QUERY_EVENTS = """
+    query Events($first: Int, $last: Int, $after: String, $before: String){
+        events(first: $first, last: $last, after: $after, before: $before) {
+            edges {
+                node {
+                    pk
+                }
+            }
+            pageInfo {
+                startCursor
+                endCursor
+                hasNextPage
+                hasPreviousPage
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def events_with_equal_dates(db):
+    now = timezone.now()
+    dates = [now, now, now, now + datetime.timedelta(seconds=1)] + [
+        now - datetime.timedelta(seconds=index) for index in range(1, 4)
+    ]
+    events = BalanceEvent.objects.bulk_create(
+        [
+            BalanceEvent(date=date, type="BONUS", number=index)
+            for index, date in enumerate(dates)
+        ]
+    )
+    return sorted(events, key=lambda event: (event.date, event.pk))
+
+
+def test_keyset_pagination_compares_row_values(events_with_equal_dates):
+    # given
+    event = events_with_equal_dates[3]
+    cursor = to_global_cursor([event.date, event.pk])
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        result = schema.execute(QUERY_EVENTS, variables={"first": 2, "after": cursor})
+
+    # then
+    assert not result.errors
+    assert [edge["node"]["pk"] for edge in result.data["events"]["edges"]] == [
+        event.pk for event in events_with_equal_dates[4:6]
+    ]
+    sql = queries[0]["sql"]
+    assert '("account_balanceevent"."date", "account_balanceevent"."id") > (' in sql
+    assert " OR " not in sql
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3, 8])
+def test_keyset_pagination_forward(page_size, events_with_equal_dates):
+    # given
+    end_cursor = None
+    has_next_page = True
+    pks = []
+
+    # when
+    while has_next_page:
+        variables = {"first": page_size, "after": end_cursor}
+        result = schema.execute(QUERY_EVENTS, variables=variables)
+        assert not result.errors
+        content = result.data["events"]
+        has_next_page = content["pageInfo"]["hasNextPage"]
+        end_cursor = content["pageInfo"]["endCursor"]
+        pks += [edge["node"]["pk"] for edge in content["edges"]]
+
+    # then
+    assert pks == [event.pk for event in events_with_equal_dates]
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3, 8])
+def test_keyset_pagination_backward(page_size, events_with_equal_dates):
+    # given
+    start_cursor = None
+    has_previous_page = True
+    pks = []
+
+    # when
+    while has_previous_page:
+        variables = {"last": page_size, "before": start_cursor}
+        result = schema.execute(QUERY_EVENTS, variables=variables)
+        assert not result.errors
+        content = result.data["events"]
+        has_previous_page = content["pageInfo"]["hasPreviousPage"]
+        start_cursor = content["pageInfo"]["startCursor"]
+        pks = [edge["node"]["pk"] for edge in content["edges"]] + pks
+
+    # then
+    assert pks == [event.pk for event in events_with_equal_dates]
+
+
+def test_keyset_pagination_invalid_cursor(events_with_equal_dates):
+    # given
+    cursor = to_global_cursor(["not a date", events_with_equal_dates[0].pk])
+
+    # when
+    result = schema.execute(QUERY_EVENTS, variables={"first": 2, "after": cursor})
+
+    # then
+    assert len(result.errors) == 1
+    assert str(result.errors[0]) == "Received cursor is invalid."
+
+
+@pytest.mark.parametrize(
+    ("qs", "sorting_fields", "sorting_direction", "eligible"),
+    [
+        (BalanceEvent.objects.order_by("-date", "-pk"), ["date", "pk"], "lt", True),
+        (BalanceEvent.objects.order_by("date", "pk"), ["date", "pk"], "gt", True),
+        # sorting in mixed directions
+        (BalanceEvent.objects.order_by("-date", "pk"), ["date", "pk"], "lt", False),
+        # nullable field
+        (BalanceEvent.objects.order_by("number", "pk"), ["number", "pk"], "gt", False),
+        (Book.objects.order_by("pk"), ["pk"], "gt", True),
+    ],
+)
+def test_get_keyset_fields(qs, sorting_fields, sorting_direction, eligible):
+    # when
+    fields = _get_keyset_fields(qs, sorting_fields, sorting_direction)
+
+    # then
+    assert (fields is not None) is eligible
+
+
+@pytest.mark.slow
+def test_keyset_pagination_latency_does_not_depend_on_page(db):
+    # given
+    page_size = 20
+    pages = 10000
+    now = timezone.now()
+    events = BalanceEvent.objects.bulk_create(
+        [
+            BalanceEvent(
+                date=now + datetime.timedelta(seconds=index // 3),
+                type="BONUS",
+                number=index,
+            )
+            for index in range(page_size * pages)
+        ],
+        batch_size=10000,
+    )
+    events.sort(key=lambda event: (event.date, event.pk))
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE account_balanceevent")
+    deep_event = events[page_size * (pages - 1) - 1]
+    deep_cursor = to_global_cursor([deep_event.date, deep_event.pk])
+
+    def median_latency(cursor):
+        latencies = []
+        for _ in range(5):
+            started_at = time.perf_counter()
+            result = schema.execute(
+                QUERY_EVENTS, variables={"first": page_size, "after": cursor}
+            )
+            latencies.append(time.perf_counter() - started_at)
+            assert not result.errors
+        return statistics.median(latencies)
+
+    # when
+    first_page = median_latency(None)
+    deep_page = median_latency(deep_cursor)
+
+    # then
+    assert deep_page < first_page * 3
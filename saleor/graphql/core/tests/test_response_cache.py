@@ -0,0 +1,190 @@
+import graphene
+import pytest
+from django.core.cache import cache
+
+from ....warehouse.models import Stock
+from ...tests.utils import get_graphql_content
+
+QUERY_SHOP = """
+    query {
+        shop {
+            name
+            description
+        }
+    }
+"""
+
+QUERY_VARIANT_QUANTITY = """
+    query ($id: ID!, $channel: String) {
+        productVariant(id: $id, channel: $channel) {
+            quantityAvailable
+        }
+    }
+"""
+
+QUERY_STATISTICS = """
+    query {
+        statistics {
+            views
+        }
+    }
+"""
+
+QUERY_ME = """
+    query {
+        shop {
+            name
+        }
+        me {
+            email
+        }
+    }
+"""
+
+
+@pytest.fixture
+def _response_cache_enabled(settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_anonymous_query_response_is_cached(
+    api_client, site_settings, _response_cache_enabled
+):
+    # given
+    first_response = api_client.post_graphql(QUERY_SHOP)
+
+    # when
+    response = api_client.post_graphql(QUERY_SHOP)
+
+    # then
+    assert first_response["X-Cache"] == "MISS"
+    assert response["X-Cache"] == "HIT"
+    assert response["Cache-Control"] == "private, no-cache"
+    assert get_graphql_content(response) == get_graphql_content(first_response)
+
+
+def test_anonymous_query_response_public_cache_control(
+    api_client, site_settings, settings, _response_cache_enabled
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_PUBLIC = True
+
+    # when
+    response = api_client.post_graphql(QUERY_SHOP)
+
+    # then
+    assert response["Cache-Control"] == "public, max-age=60"
+
+
+def test_response_cache_invalidated_on_queryset_update(
+    api_client, site_settings, _response_cache_enabled
+):
+    # given
+    api_client.post_graphql(QUERY_SHOP)
+
+    # when
+    type(site_settings).objects.filter(pk=site_settings.pk).update(
+        description="Changed without signals"
+    )
+    response = api_client.post_graphql(QUERY_SHOP)
+
+    # then
+    assert response["X-Cache"] == "MISS"
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["description"] == "Changed without signals"
+
+
+def test_response_cache_invalidated_on_stock_bulk_update(
+    api_client, variant, channel_USD, _response_cache_enabled
+):
+    # given
+    variables = {"id": graphene.Node.to_global_id("ProductVariant", variant.pk)}
+    variables["channel"] = channel_USD.slug
+    api_client.post_graphql(QUERY_VARIANT_QUANTITY, variables)
+    stocks = list(variant.stocks.all())
+    for stock in stocks:
+        stock.quantity = 0
+
+    # when
+    Stock.objects.bulk_update(stocks, ["quantity"])
+    response = api_client.post_graphql(QUERY_VARIANT_QUANTITY, variables)
+
+    # then
+    assert response["X-Cache"] == "MISS"
+    content = get_graphql_content(response)
+    assert content["data"]["productVariant"]["quantityAvailable"] == 0
+
+
+def test_response_cache_key_depends_on_host(
+    api_client, site_settings, _response_cache_enabled
+):
+    # given
+    api_client.post_graphql(QUERY_SHOP)
+
+    # when
+    response = api_client.post_graphql(QUERY_SHOP, HTTP_HOST="127.0.0.1")
+
+    # then
+    assert response["X-Cache"] == "MISS"
+
+
+def test_response_cache_invalidated_on_model_change(
+    api_client, site_settings, _response_cache_enabled
+):
+    # given
+    api_client.post_graphql(QUERY_SHOP)
+
+    # when
+    site_settings.description = "New description"
+    site_settings.save(update_fields=["description"])
+    response = api_client.post_graphql(QUERY_SHOP)
+
+    # then
+    assert response["X-Cache"] == "MISS"
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["description"] == "New description"
+
+
+def test_authenticated_query_is_not_cached(
+    staff_api_client, site_settings, _response_cache_enabled
+):
+    # when
+    responses = [staff_api_client.post_graphql(QUERY_SHOP) for _ in range(2)]
+
+    # then
+    for response in responses:
+        assert "X-Cache" not in response
+        assert "Cache-Control" not in response
+
+
+def test_query_with_not_cacheable_field_is_not_cached(
+    api_client, site_settings, _response_cache_enabled
+):
+    # when
+    responses = [api_client.post_graphql(QUERY_ME) for _ in range(2)]
+
+    # then
+    for response in responses:
+        assert "X-Cache" not in response
+
+
+def test_response_cache_disabled_by_default(api_client, site_settings):
+    # when
+    response = api_client.post_graphql(QUERY_SHOP)
+
+    # then
+    assert "X-Cache" not in response
+
+
+def test_statistics_query_is_not_cached(
+    api_client, site_settings, _response_cache_enabled
+):
+    # when
+    responses = [api_client.post_graphql(QUERY_STATISTICS) for _ in range(2)]
+
+    # then
+    for response in responses:
+        assert "X-Cache" not in response
@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from ....tests.models import Book
+from ..total_count import estimate_count, get_total_count
+
+
+@pytest.fixture
+def books(db):
+    return Book.objects.bulk_create([Book(name=f"Book{index}") for index in range(5)])
+
+
+@pytest.fixture
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_get_total_count_is_exact_by_default(books):
+    # when
+    total_count = get_total_count(Book.objects.all())
+
+    # then
+    assert total_count == len(books)
+
+
+@patch("saleor.graphql.core.total_count.estimate_count", return_value=500000)
+def test_get_total_count_returns_estimate_above_threshold(
+    estimate_count_mock, books, settings
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 100000
+
+    # when
+    total_count = get_total_count(Book.objects.all())
+
+    # then
+    assert total_count == 500000
+
+
+@patch("saleor.graphql.core.total_count.estimate_count", return_value=500000)
+def test_get_total_count_counts_filtered_queryset(estimate_count_mock, books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 100000
+
+    # when
+    total_count = get_total_count(Book.objects.filter(name=books[0].name))
+
+    # then
+    assert total_count == 1
+    estimate_count_mock.assert_not_called()
+
+
+@patch("saleor.graphql.core.total_count.estimate_count", return_value=10)
+def test_get_total_count_counts_below_threshold(estimate_count_mock, books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 100000
+
+    # when
+    total_count = get_total_count(Book.objects.all())
+
+    # then
+    assert total_count == len(books)
+
+
+def test_estimate_count(books):
+    # when
+    estimate = estimate_count(Book.objects.filter(name__startswith="Book"))
+
+    # then
+    assert isinstance(estimate, int)
+
+
+@pytest.mark.usefixtures("_clear_cache")
+def test_get_total_count_is_cached_per_query(
+    books, settings, django_assert_num_queries
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 60
+    get_total_count(Book.objects.all())
+    Book.objects.create(name="New book")
+
+    # when
+    with django_assert_num_queries(0):
+        total_count = get_total_count(Book.objects.all())
+    filtered_count = get_total_count(Book.objects.filter(name="New book"))
+
+    # then
+    assert total_count == len(books)
+    assert filtered_count == 1
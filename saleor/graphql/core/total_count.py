@@ -0,0 +1,66 @@
+"""Total counts of the collections returned by connections.
+
+`totalCount` is resolved only when the field is selected. Counting millions of
+rows takes longer than fetching a page of them, so:
+
+- when the queryset is not filtered and the planner estimates more rows than
+  `GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD`, the estimate is returned instead of
+  the exact count; the estimate is opt-in, it is disabled when the setting is
+  `0`, the default. Estimates of filtered querysets can be off by orders of
+  magnitude, so they are always counted exactly,
+- counts are cached for `GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT` seconds, keyed by
+  the hash of the SQL of the queryset and its parameters; the cache is disabled
+  when the setting is `0`.
+"""
+import hashlib
+import json
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+TOTAL_COUNT_CACHE_KEY = "graphql_total_count:{database}:{hash}"
+
+
+def _get_cache_key(qs: QuerySet) -> str:
+    sql, params = qs.order_by().query.sql_with_params()
+    query_hash = hashlib.sha256(f"{sql}{params!r}".encode()).hexdigest()
+    return TOTAL_COUNT_CACHE_KEY.format(database=qs.db, hash=query_hash)
+
+
+def estimate_count(qs: QuerySet) -> Optional[int]:
+    """Return the number of rows of the queryset estimated by the planner."""
+    connection = connections[qs.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = qs.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_total_count(qs: QuerySet) -> int:
+    threshold = settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD
+    timeout = settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT
+    if timeout:
+        key = _get_cache_key(qs)
+        total_count = cache.get(key)
+        if total_count is not None:
+            return total_count
+
+    total_count = None
+    if threshold and not qs.query.where:
+        estimate = estimate_count(qs)
+        if estimate is not None and estimate > threshold:
+            total_count = estimate
+    if total_count is None:
+        total_count = qs.count()
+
+    if timeout:
+        cache.set(key, total_count, timeout=timeout)
+    return total_count
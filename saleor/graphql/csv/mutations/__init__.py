@@ -1,5 +1,15 @@
+from .export_balance_events import ExportBalanceEvents
+from .export_barcodes import ExportBarcodes
+from .export_donations import ExportDonations
 from .export_gift_cards import ExportGiftCards
 from .export_products import ExportProducts
 from .export_voucher_codes import ExportVoucherCodes
 
-__all__ = ["ExportGiftCards", "ExportProducts", "ExportVoucherCodes"]
+__all__ = [
+    "ExportBalanceEvents",
+    "ExportBarcodes",
+    "ExportDonations",
+    "ExportGiftCards",
+    "ExportProducts",
+    "ExportVoucherCodes",
+]
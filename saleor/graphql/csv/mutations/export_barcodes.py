@@ -0,0 +1,71 @@
+import graphene
+
+from ....csv import models as csv_models
+from ....csv.events import export_started_event
+from ....csv.tasks import export_barcodes_task
+from ....permission.enums import BarcodePermissions
+from ....webhook.event_types import WebhookEventAsyncType
+from ...app.dataloaders import get_app_promise
+from ...barcode.filters import BarcodeFilterInput
+from ...barcode.types import Barcode
+from ...core import ResolveInfo
+from ...core.doc_category import DOC_CATEGORY_BARCODES
+from ...core.types import BaseInputObjectType, ExportError, NonNullList
+from ...core.utils import WebhookEventInfo
+from ..enums import ExportScope, FileTypeEnum
+from .base_export import BaseExportMutation
+
+
+class ExportBarcodesInput(BaseInputObjectType):
+    scope = ExportScope(
+        description="Determine which barcodes should be exported.", required=True
+    )
+    filter = BarcodeFilterInput(
+        description="Filtering options for barcodes.", required=False
+    )
+    ids = NonNullList(
+        graphene.ID,
+        description="List of barcode IDs to export.",
+        required=False,
+    )
+    file_type = FileTypeEnum(description="Type of exported file.", required=True)
+
+    class Meta:
+        doc_category = DOC_CATEGORY_BARCODES
+
+
+class ExportBarcodes(BaseExportMutation):
+    class Arguments:
+        input = ExportBarcodesInput(
+            required=True, description="Fields required to export barcodes."
+        )
+
+    class Meta:
+        description = "Export barcodes to csv/xlsx file."
+        doc_category = DOC_CATEGORY_BARCODES
+        permissions = (BarcodePermissions.MANAGE_BARCODE,)
+        error_type_class = ExportError
+        webhook_events_info = [
+            WebhookEventInfo(
+                type=WebhookEventAsyncType.NOTIFY_USER,
+                description="A notification for the exported file.",
+            ),
+        ]
+
+    @classmethod
+    def perform_mutation(  # type: ignore[override]
+        cls, _root, info: ResolveInfo, /, *, input
+    ):
+        scope = cls.get_scope(input, Barcode)
+        file_type = input["file_type"]
+
+        app = get_app_promise(info.context).get()
+
+        export_file = csv_models.ExportFile.objects.create(
+            app=app, user=info.context.user
+        )
+        export_started_event(export_file=export_file, app=app, user=info.context.user)
+        export_barcodes_task.delay(export_file.pk, scope, file_type)
+
+        export_file.refresh_from_db()
+        return cls(export_file=export_file)
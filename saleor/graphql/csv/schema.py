@@ -6,7 +6,14 @@ from ..core.connection import create_connection_slice, filter_connection_queryse
 from ..core.fields import FilterConnectionField, PermissionsField
 from ..core.utils import from_global_id_or_error
 from .filters import ExportFileFilterInput
-from .mutations import ExportGiftCards, ExportProducts, ExportVoucherCodes
+from .mutations import (
+    ExportBalanceEvents,
+    ExportBarcodes,
+    ExportDonations,
+    ExportGiftCards,
+    ExportProducts,
+    ExportVoucherCodes,
+)
 from .resolvers import resolve_export_file, resolve_export_files
 from .sorters import ExportFileSortingInput
 from .types import ExportFile, ExportFileCountableConnection
@@ -43,3 +50,6 @@ class CsvMutations(graphene.ObjectType):
     export_products = ExportProducts.Field()
     export_gift_cards = ExportGiftCards.Field()
     export_voucher_codes = ExportVoucherCodes.Field()
+    export_donations = ExportDonations.Field()
+    export_barcodes = ExportBarcodes.Field()
+    export_balance_events = ExportBalanceEvents.Field()
@@ -1,9 +1,14 @@
+from collections import defaultdict
+from decimal import Decimal
+
 import graphene
+from django.db import transaction
+from django.db.models import QuerySet
 from django.utils import timezone
 
 from saleor.graphql.core import ResolveInfo
 
-from ....account import BalanceEvents
+from ....account import BalanceEvents, ledger
 from ....account import models as account_models
 from ....donation import DonationStatus
 from ....donation import models as donation_models
@@ -11,9 +16,31 @@ from ....permission.enums import DonationPermissions
 from ...core.doc_category import DOC_CATEGORY_DONATIONS
 from ...core.mutations import BaseBulkMutation
 from ...core.types.common import DonationBulkError, NonNullList
-from django.db.models.manager import BaseManager
 from ..types import Donation
 
+
+def get_balance_delta(donation: donation_models.Donation, accepted: bool) -> Decimal:
+    """Return the change of the donator's balance caused by completing a donation."""
+    amount = donation.price_amount or Decimal(0)
+    if donation.status != DonationStatus.COMPLETED and accepted:
+        return amount
+    if donation.status == DonationStatus.COMPLETED and not accepted:
+        return -amount
+    return Decimal(0)
+
+
+def get_donators_by_code(codes) -> dict[str, int]:
+    """Return ids of the users with the given codes.
+
+    Codes shared by more than one user are ambiguous and skipped.
+    """
+    users_by_code: dict[str, list[int]] = defaultdict(list)
+    users = account_models.User.objects.filter(code__in=codes).values_list("code", "pk")
+    for code, pk in users:
+        users_by_code[code].append(pk)
+    return {code: pks[0] for code, pks in users_by_code.items() if len(pks) == 1}
+
+
 class DonationBulkComplete(BaseBulkMutation):
     count = graphene.Int(
         required=True,
@@ -28,6 +55,7 @@ class DonationBulkComplete(BaseBulkMutation):
         accepted = graphene.Boolean(
             required=True,
         )
+
     class Meta:
         description = "Complete donations"
         doc_category = DOC_CATEGORY_DONATIONS
@@ -38,72 +66,51 @@ class DonationBulkComplete(BaseBulkMutation):
         error_type_field = "donation_errors"
 
     @classmethod
-    def bulk_action(cls, info: ResolveInfo, queryset: BaseManager[Donation], accepted: bool, **data):
-        donations = list(queryset)
-        updates = []
-        updated_users = []
-        events = []
-        for donation in donations:
-            donation.updated_at = timezone.now()
-            if (
-                donation.status != DonationStatus.COMPLETED
-                and accepted
-                and donation.donator
-            ):
-                try:
-                    user = account_models.User.objects.get(code=donation.donator)
-                    user.balance += donation.price_amount or 0
-                    updated_users.append(user)
-                    events.append(
-                        account_models.BalanceEvent(
-                            user=user,
-                            type=BalanceEvents.DONATION_GRANTED,
-                            balance=user.balance,
-                            delta=(donation.price_amount or 0),
-                        )
-                    )
-                except (
-                    account_models.User.DoesNotExist,
-                    account_models.User.MultipleObjectsReturned,
-                ):
-                    pass
-            elif (
-                donation.status == DonationStatus.COMPLETED
-                and not accepted
-                and donation.donator
-            ):
-                try:
-                    user = account_models.User.objects.get(code=donation.donator)
-                    user.balance -= donation.price_amount or 0
-                    updated_users.append(user)
-                    events.append(
-                        account_models.BalanceEvent(
-                            user=user,
-                            type=BalanceEvents.DONATION_REJECTED,
-                            balance=user.balance,
-                            delta=-(donation.price_amount or 0),
-                        )
+    def bulk_action(
+        cls,
+        info: ResolveInfo,
+        queryset: QuerySet[donation_models.Donation],
+        accepted: bool,
+        **data,
+    ):
+        with transaction.atomic():
+            donations = list(queryset.select_for_update().order_by("created_at", "pk"))
+            deltas = [
+                (donation, get_balance_delta(donation, accepted))
+                for donation in donations
+                if donation.donator
+            ]
+            donators = get_donators_by_code(
+                {donation.donator for donation, delta in deltas if delta}
+            )
+
+            postings = []
+            for donation, delta in deltas:
+                user_id = donators.get(donation.donator)
+                if not delta or user_id is None:
+                    continue
+                postings.append(
+                    ledger.Posting(
+                        user_id=user_id,
+                        delta=delta,
+                        type=(
+                            BalanceEvents.DONATION_GRANTED
+                            if delta > 0
+                            else BalanceEvents.DONATION_REJECTED
+                        ),
                     )
-                except (
-                    account_models.User.DoesNotExist,
-                    account_models.User.MultipleObjectsReturned,
-                ):
-                    pass
-
-            if accepted:
-                donation.status = DonationStatus.COMPLETED
-            else:
-                donation.status = DonationStatus.REJECTED
-
-            updates.append(donation)
-
-        donation_models.Donation.objects.bulk_update(
-            donations,
-            fields=[
-                "status",
-                "updated_at",
-            ],
-        )
-        account_models.User.objects.bulk_update(updated_users, fields=["balance"])
-        account_models.BalanceEvent.objects.bulk_create(events)
-        return DonationBulkComplete(count=len(updates))
\ No newline at end of file
+                )
+
+            now = timezone.now()
+            status = DonationStatus.COMPLETED if accepted else DonationStatus.REJECTED
+            for donation in donations:
+                donation.status = status
+                donation.updated_at = now
+
+            donation_models.Donation.objects.bulk_update(
+                donations, fields=["status", "updated_at"]
+            )
+            # The ledger applies all deltas of a donator at once and records an
+            # event with the running balance for every donation.
+            ledger.post_many(postings)
+        return DonationBulkComplete(count=len(donations))
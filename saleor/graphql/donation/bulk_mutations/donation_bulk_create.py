@@ -0,0 +1,300 @@
+from collections import Counter, defaultdict
+
+import graphene
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from graphene.utils.str_converters import to_camel_case
+
+from ....account.models import User
+from ....barcode import decode_barcode, encode_barcode
+from ....barcode.models import Barcode
+from ....barcode.utils import get_barcodes_by_codes, get_reserved_codes
+from ....core import MonthlySequenceName
+from ....core.models import MonthlySequence
+from ....core.tracing import traced_atomic_transaction
+from ....donation import models
+from ....donation.error_codes import DonationErrorCode
+from ....permission.enums import DonationPermissions
+from ...core import ResolveInfo
+from ...core.context import get_database_connection_name
+from ...core.doc_category import DOC_CATEGORY_DONATIONS
+from ...core.enums import ErrorPolicyEnum
+from ...core.mutations import BaseMutation
+from ...core.types import BaseObjectType, NonNullList
+from ...core.types.common import DonationBulkError
+from ..mutations.donation_create import DonationCreateInput
+from ..mutations.utils import (
+    DONATION_BARCODE_CONSTRAINT,
+    validate_donation_price,
+    validate_donation_quantity,
+)
+from ..types import Donation
+
+
+class DonationBulkResult(BaseObjectType):
+    donation = graphene.Field(Donation, description="Donation data.")
+    errors = NonNullList(
+        DonationBulkError,
+        required=False,
+        description="List of errors occurred on create attempt.",
+    )
+
+    class Meta:
+        doc_category = DOC_CATEGORY_DONATIONS
+
+
+class DonationBulkCreate(BaseMutation):
+    count = graphene.Int(
+        required=True,
+        description="Returns how many objects were created.",
+    )
+    results = NonNullList(
+        DonationBulkResult,
+        required=True,
+        default_value=[],
+        description="List of the created donations.",
+    )
+
+    class Arguments:
+        donations = NonNullList(
+            DonationCreateInput,
+            required=True,
+            description="Input list of donations to create.",
+        )
+        error_policy = ErrorPolicyEnum(
+            required=False,
+            description="Policies of error handling. DEFAULT: "
+            + ErrorPolicyEnum.REJECT_EVERYTHING.name,
+        )
+
+    class Meta:
+        description = (
+            "Creates donations. Donators and barcodes of all donations are validated "
+            "together and the donations are inserted at once."
+        )
+        doc_category = DOC_CATEGORY_DONATIONS
+        permissions = (
+            DonationPermissions.MANAGE_DONATIONS,
+            DonationPermissions.ADD_DONATIONS,
+        )
+        error_type_class = DonationBulkError
+        support_meta_field = False
+        support_private_meta_field = False
+
+    @classmethod
+    def add_indexes_to_errors(cls, index, error, index_error_map):
+        for key, value in error.error_dict.items():
+            for e in value:
+                index_error_map[index].append(
+                    DonationBulkError(
+                        path=to_camel_case(key),
+                        message=e.messages[0],
+                        code=e.code,
+                    )
+                )
+
+    @classmethod
+    def add_error(cls, index, path, message, index_error_map):
+        index_error_map[index].append(
+            DonationBulkError(
+                path=path, message=message, code=DonationErrorCode.INVALID.value
+            )
+        )
+
+    @classmethod
+    def add_duplicated_barcode_error(cls, index, index_error_map):
+        cls.add_error(
+            index,
+            "barcode",
+            "Barcode should not be duplicated for donation",
+            index_error_map,
+        )
+
+    @classmethod
+    def get_taken_codes(cls, barcodes, database_connection_name) -> set[str]:
+        """Return codes of the barcodes which belong to donations."""
+        taken = set(
+            models.Donation.objects.using(database_connection_name)
+            .filter(barcode__in=[barcode.pk for barcode in barcodes.values()])
+            .values_list("barcode_id", flat=True)
+        )
+        return {code for code, barcode in barcodes.items() if barcode.pk in taken}
+
+    @classmethod
+    def clean_barcodes(cls, donations_data, index_error_map, database_connection_name):
+        """Return codes of the valid barcodes, per index of the donation.
+
+        Codes must be canonical, printed or reserved, unique in the input and not
+        used by other donations. The barcodes are locked until the donations are
+        saved, so they can't be linked to other donations in the meantime.
+        """
+        codes = {}
+        for index, donation_data in enumerate(donations_data):
+            try:
+                codes[index] = encode_barcode(*decode_barcode(donation_data.barcode))
+            except ValueError:
+                cls.add_error(
+                    index, "barcode", "Barcode is not a valid code.", index_error_map
+                )
+
+        counts = Counter(codes.values())
+        duplicated = {code for code, count in counts.items() if count > 1}
+        barcodes = get_barcodes_by_codes(
+            codes.values(), database_connection_name, for_update=True
+        )
+        taken = cls.get_taken_codes(barcodes, database_connection_name)
+        reserved = get_reserved_codes(set(codes.values()) - barcodes.keys())
+        for index, code in list(codes.items()):
+            if code in duplicated or code in taken:
+                cls.add_duplicated_barcode_error(index, index_error_map)
+                del codes[index]
+            elif code not in barcodes and code not in reserved:
+                cls.add_error(
+                    index, "barcode", "Barcode was not printed.", index_error_map
+                )
+                del codes[index]
+        return codes
+
+    @classmethod
+    def clean_donations(cls, info: ResolveInfo, donations_data, index_error_map):
+        database_connection_name = get_database_connection_name(info.context)
+        barcode_codes = cls.clean_barcodes(
+            donations_data, index_error_map, database_connection_name
+        )
+        donators = set(
+            User.objects.using(database_connection_name)
+            .filter(code__in={data.donator for data in donations_data})
+            .values_list("code", flat=True)
+        )
+
+        cleaned_inputs_map = {}
+        for index, donation_data in enumerate(donations_data):
+            for validate in (validate_donation_price, validate_donation_quantity):
+                try:
+                    validate(donation_data)
+                except ValidationError as exc:
+                    cls.add_indexes_to_errors(index, exc, index_error_map)
+            if donation_data.donator not in donators:
+                cls.add_error(
+                    index, "donator", "Donator does not exist", index_error_map
+                )
+            if index_error_map[index]:
+                continue
+            cleaned_inputs_map[index] = {
+                "title": donation_data.title,
+                "description": donation_data.description,
+                "quantity": donation_data.quantity,
+                "currency": donation_data.price.currency,
+                "price_amount": donation_data.price.amount,
+                "donator": donation_data.donator,
+                "barcode_code": barcode_codes[index],
+            }
+        return cleaned_inputs_map
+
+    @classmethod
+    def get_barcodes(cls, codes, database_connection_name) -> dict[str, Barcode]:
+        """Return used barcodes of the cleaned codes, creating the ones not printed.
+
+        The codes of barcodes which were not printed are reserved, see
+        `clean_barcodes`.
+        """
+        barcodes = get_barcodes_by_codes(
+            codes, database_connection_name, for_update=True
+        )
+        missing = [
+            Barcode(year_month=year_month, sub=sub, used=True)
+            for year_month, sub in (decode_barcode(code) for code in codes)
+            if encode_barcode(year_month, sub) not in barcodes
+        ]
+        if missing:
+            # Barcodes created concurrently are fetched with the existing ones.
+            Barcode.objects.using(database_connection_name).bulk_create(
+                missing, ignore_conflicts=True
+            )
+            barcodes = get_barcodes_by_codes(
+                codes, database_connection_name, for_update=True
+            )
+        unused = [barcode.pk for barcode in barcodes.values() if not barcode.used]
+        if unused:
+            Barcode.objects.using(database_connection_name).filter(
+                pk__in=unused
+            ).update(used=True)
+        return barcodes
+
+    @classmethod
+    def create_donations(
+        cls, cleaned_inputs_map, database_connection_name
+    ) -> dict[int, models.Donation]:
+        barcodes = cls.get_barcodes(
+            [data["barcode_code"] for data in cleaned_inputs_map.values()],
+            database_connection_name,
+        )
+        donations = {
+            index: models.Donation(
+                number=None, barcode=barcodes[data["barcode_code"]], **data
+            )
+            for index, data in cleaned_inputs_map.items()
+        }
+        # The numbers are reserved as one block instead of one by one.
+        MonthlySequence.assign(MonthlySequenceName.DONATION, donations.values())
+        models.Donation.objects.using(database_connection_name).bulk_create(
+            donations.values()
+        )
+        return donations
+
+    @classmethod
+    def save(
+        cls, info: ResolveInfo, cleaned_inputs_map, index_error_map, error_policy
+    ) -> dict[int, models.Donation]:
+        """Create the donations, rejecting the ones of barcodes taken meanwhile.
+
+        Barcodes which were not printed can't be locked while the input is
+        cleaned, they may be linked to donations created concurrently.
+        """
+        database_connection_name = get_database_connection_name(info.context)
+        while cleaned_inputs_map:
+            try:
+                with transaction.atomic(using=database_connection_name):
+                    return cls.create_donations(
+                        cleaned_inputs_map, database_connection_name
+                    )
+            except IntegrityError as e:
+                if DONATION_BARCODE_CONSTRAINT not in str(e):
+                    raise
+                taken = cls.get_taken_codes(
+                    get_barcodes_by_codes(
+                        [data["barcode_code"] for data in cleaned_inputs_map.values()],
+                        database_connection_name,
+                    ),
+                    database_connection_name,
+                )
+                if not taken:
+                    raise
+            for index, data in list(cleaned_inputs_map.items()):
+                if data["barcode_code"] in taken:
+                    cls.add_duplicated_barcode_error(index, index_error_map)
+                    del cleaned_inputs_map[index]
+            if error_policy == ErrorPolicyEnum.REJECT_EVERYTHING.value:
+                return {}
+        return {}
+
+    @classmethod
+    @traced_atomic_transaction()
+    def perform_mutation(cls, _root, info: ResolveInfo, /, **data):
+        index_error_map: dict = defaultdict(list)
+        error_policy = data.get("error_policy", ErrorPolicyEnum.REJECT_EVERYTHING.value)
+        donations_data = data["donations"]
+
+        cleaned_inputs_map = cls.clean_donations(info, donations_data, index_error_map)
+        if any(index_error_map.values()):
+            if error_policy == ErrorPolicyEnum.REJECT_EVERYTHING.value:
+                cleaned_inputs_map = {}
+
+        donations = cls.save(info, cleaned_inputs_map, index_error_map, error_policy)
+        results = [
+            DonationBulkResult(
+                donation=donations.get(index), errors=index_error_map[index]
+            )
+            for index in range(len(donations_data))
+        ]
+        return DonationBulkCreate(count=len(donations), results=results)
@@ -1,24 +1,29 @@
+from collections import defaultdict
+
 from ...donation.models import Donation
 from ..core.dataloaders import DataLoader
 
 
-class DonationByDonatorDataloader(DataLoader):
-    context_key = "donation_by_user"
+class DonationsByDonatorLoader(DataLoader):
+    context_key = "donations_by_donator"
 
     def batch_load(self, keys):
-        return (
-            Donation.objects.using(self.database_connection_name)
-            .filter(donator_id__in=keys)
-            .all()
+        donations = Donation.objects.using(self.database_connection_name).filter(
+            donator__in=keys
         )
+        donations_by_donator_map = defaultdict(list)
+        for donation in donations.iterator():
+            donations_by_donator_map[donation.donator].append(donation)
+        return [donations_by_donator_map.get(donator, []) for donator in keys]
 
 
-class DonationByIdDataLoader(DataLoader):
+class DonationByIdLoader(DataLoader):
     context_key = "donation_by_id"
 
     def batch_load(self, keys):
-        return (
-            Donation.objects.using(self.database_connection_name)
-            .filter(id__in=keys)
-            .all()
+        donation_map = Donation.objects.using(self.database_connection_name).in_bulk(
+            keys
         )
+        # Keys are IDs decoded from global IDs, strings of the UUID primary keys.
+        donation_map = {str(pk): donation for pk, donation in donation_map.items()}
+        return [donation_map.get(str(donation_id)) for donation_id in keys]
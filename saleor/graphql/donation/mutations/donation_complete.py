@@ -1,15 +1,12 @@
 import graphene
 from django.utils import timezone
 
-from saleor.account.events import (
-    donation_granted_balance_event,
-    donation_rejected_balance_event,
-)
 from saleor.graphql.core.types.base import BaseInputObjectType
 from saleor.graphql.donation.mutations.utils import (
     validate_complete_permission,
 )
 
+from ....account import BalanceEvents, ledger
 from ....account.models import User
 from ....donation import DonationStatus, models
 from ....webhook.event_types import WebhookEventAsyncType
@@ -75,9 +72,7 @@ class DonationComplete(ModelMutation):
         ):
             try:
                 user = User.objects.get(code=instance.donator)
-                user.balance += instance.price_amount
-                user.save(update_fields=["balance"])
-                donation_granted_balance_event(user=user, donation=instance)
+                ledger.post(user, instance.price_amount, BalanceEvents.DONATION_GRANTED)
             except (User.DoesNotExist, User.MultipleObjectsReturned):
                 pass
         elif (
@@ -87,8 +82,8 @@ class DonationComplete(ModelMutation):
         ):
             try:
                 user = User.objects.get(code=instance.donator)
-                user.balance -= instance.price_amount
-                user.save(update_fields=["balance"])
-                donation_rejected_balance_event(user=user, donation=instance)
+                ledger.post(
+                    user, -instance.price_amount, BalanceEvents.DONATION_REJECTED
+                )
             except (User.DoesNotExist, User.MultipleObjectsReturned):
                 pass
@@ -13,8 +13,9 @@ from ...core.utils import WebhookEventInfo
 from ...payment.mutations.payment.payment_check_balance import MoneyInput
 from ..types import Donation
 from .utils import (
+    clean_donation_barcode,
+    save_donation,
     validate_create_permission,
-    validate_donation_barcode,
     validate_donation_price,
     validate_donation_quantity,
     validate_donator,
@@ -71,14 +72,20 @@ class DonationCreate(ModelMutation):
     ):
         validate_donation_price(input)
         validate_donation_quantity(input)
-        validate_donation_barcode(info, instance, input)
         validate_donator(info, input)
         validate_create_permission(info, instance)
 
     @classmethod
     def clean_input(cls, info: ResolveInfo, instance: models.Donation, input):
         cls.validate_creation_input(info, instance, input)
+        barcode_code = clean_donation_barcode(info, instance, input)
         input = super().clean_input(info, instance, input)
+        del input["barcode"]
+        input["barcode_code"] = barcode_code
         input["currency"] = input["price"].currency
         input["price_amount"] = input["price"].amount
         return input
+
+    @classmethod
+    def save(cls, info: ResolveInfo, instance: models.Donation, cleaned_input):
+        save_donation(info, instance, cleaned_input)
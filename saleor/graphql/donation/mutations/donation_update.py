@@ -10,7 +10,8 @@ from ...core.types.base import BaseInputObjectType
 from ...core.types.common import DonationError
 from ...core.utils import WebhookEventInfo
 from ...donation.mutations.utils import (
-    validate_donation_barcode,
+    clean_donation_barcode,
+    save_donation,
     validate_donation_price,
     validate_donation_quantity,
     validate_donator,
@@ -74,9 +75,6 @@ class DonationUpdate(ModelMutation):
         if input.get("quantity", None):
             validate_donation_quantity(input)
 
-        if input.get("barcode", None):
-            validate_donation_barcode(info, instance, input)
-
         if input.get("donator", None):
             validate_donator(info, input)
 
@@ -85,10 +83,22 @@ class DonationUpdate(ModelMutation):
     @classmethod
     def clean_input(cls, info: ResolveInfo, instance: models.Donation, input):
         cls.validate_donation_input(info, instance, input)
+        barcode_code = (
+            clean_donation_barcode(info, instance, input)
+            if input.get("barcode", None)
+            else None
+        )
         input = super().clean_input(info, instance, input)
+        if "barcode" in input:
+            del input["barcode"]
+            input["barcode_code"] = barcode_code
         if input.get("price", None):
             input["currency"] = input["price"].currency
             input["price_amount"] = input["price"].amount
         input["status"] = DonationStatus.UNREVIEWED
         input["updated_at"] = timezone.now()
         return input
+
+    @classmethod
+    def save(cls, info: ResolveInfo, instance: models.Donation, cleaned_input):
+        save_donation(info, instance, cleaned_input)
@@ -1,7 +1,11 @@
+from django.db import IntegrityError, transaction
 from django.forms import ValidationError
 
 from saleor.account.models import User
 
+from ....barcode import decode_barcode, encode_barcode
+from ....barcode.models import Barcode
+from ....barcode.utils import get_barcodes_by_codes, get_reserved_codes
 from ....donation import DonationStatus, models
 from ....permission.enums import DonationPermissions
 from ....permission.utils import has_one_of_permissions
@@ -35,21 +39,93 @@ def validate_donation_quantity(input):
         )
 
 
-def validate_donation_barcode(info: ResolveInfo, instance, input):
-    if (
-        models.Donation.objects.using(get_database_connection_name(info.context))
-        .exclude(pk=instance.pk)
-        .filter(barcode=input["barcode"])
-        .exists()
-    ):
+DONATION_BARCODE_CONSTRAINT = "donation_barcode_unique"
+
+
+def _get_duplicated_barcode_error():
+    return ValidationError(
+        {
+            "barcode": ValidationError(
+                "Barcode should not be duplicated for donation",
+                code=DonationErrorCode.INVALID,
+            )
+        }
+    )
+
+
+def clean_donation_barcode(info: ResolveInfo, instance, input) -> str:
+    """Return the canonical code of the scanned barcode.
+
+    The barcode must not belong to another donation. Barcodes of reserved codes
+    which were not printed are created when the donation is saved, see
+    `save_donation`.
+    """
+    database_connection_name = get_database_connection_name(info.context)
+    try:
+        code = encode_barcode(*decode_barcode(input["barcode"]))
+    except ValueError:
         raise ValidationError(
             {
                 "barcode": ValidationError(
-                    "Barcode should not be duplicated for donation",
-                    code=DonationErrorCode.INVALID,
+                    "Barcode is not a valid code.", code=DonationErrorCode.INVALID
+                )
+            }
+        )
+    barcode = get_barcodes_by_codes([code], database_connection_name).get(code)
+    if not barcode and not get_reserved_codes([code]):
+        raise ValidationError(
+            {
+                "barcode": ValidationError(
+                    "Barcode was not printed.", code=DonationErrorCode.INVALID
                 )
             }
         )
+    if (
+        barcode
+        and models.Donation.objects.using(database_connection_name)
+        .exclude(pk=instance.pk)
+        .filter(barcode=barcode)
+        .exists()
+    ):
+        raise _get_duplicated_barcode_error()
+    return code
+
+
+def get_donation_barcode(code: str, database_connection_name: str) -> Barcode:
+    """Return the used barcode of the code, creating it if it was not printed.
+
+    The code must be reserved, see `get_reserved_codes`.
+    """
+    year_month, sub = decode_barcode(code)
+    barcode, _ = Barcode.objects.using(database_connection_name).get_or_create(
+        year_month=year_month, sub=sub, defaults={"used": True}
+    )
+    if not barcode.used:
+        Barcode.objects.using(database_connection_name).filter(pk=barcode.pk).update(
+            used=True
+        )
+        barcode.used = True
+    return barcode
+
+
+def save_donation(info: ResolveInfo, instance: models.Donation, cleaned_input):
+    """Save the donation and link it to the barcode of its cleaned code."""
+    database_connection_name = get_database_connection_name(info.context)
+    try:
+        with transaction.atomic(using=database_connection_name):
+            if "barcode_code" in cleaned_input:
+                code = cleaned_input["barcode_code"]
+                instance.barcode = (
+                    get_donation_barcode(code, database_connection_name)
+                    if code
+                    else None
+                )
+            instance.save()
+    except IntegrityError as e:
+        # The barcode was linked to another donation since it was cleaned.
+        if DONATION_BARCODE_CONSTRAINT in str(e):
+            raise _get_duplicated_barcode_error()
+        raise
 
 
 def validate_donator(info: ResolveInfo, input):
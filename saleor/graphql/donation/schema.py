@@ -7,6 +7,7 @@ from ..core.fields import BaseField, FilterConnectionField
 from ..donation.bulk_mutations.donation_bulk_complete import (
     DonationBulkComplete,
 )
+from ..donation.bulk_mutations.donation_bulk_create import DonationBulkCreate
 from .filters import DonationFilterInput
 from .mutations import DonationComplete, DonationCreate, DonationDelete, DonationUpdate
 from .resolvers import resolve_donation_by_id, resolve_donations
@@ -49,3 +50,4 @@ class DonationMutations(graphene.ObjectType):
     donation_delete = DonationDelete.Field()
     donation_complete = DonationComplete.Field()
     donation_bulk_complete = DonationBulkComplete.Field()
+    donation_bulk_create = DonationBulkCreate.Field()
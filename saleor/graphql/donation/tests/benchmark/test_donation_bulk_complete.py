@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+import graphene
+import pytest
+
+from .....account import BalanceEvents
+from .....account.models import BalanceEvent
+from .....donation import DonationStatus
+from .....donation.models import Donation
+from ....tests.utils import get_graphql_content
+
+DONATION_BULK_COMPLETE_MUTATION = """
+    mutation DonationBulkComplete($ids: [ID!]!, $accepted: Boolean!) {
+        donationBulkComplete(ids: $ids, accepted: $accepted) {
+            count
+            errors {
+                field
+                message
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def donators(customer_user, customer_user2):
+    customer_user.code = "520000000001"
+    customer_user.balance = Decimal(100)
+    customer_user2.code = "520000000002"
+    customer_user2.balance = Decimal(0)
+    customer_user.save(update_fields=["code", "balance"])
+    customer_user2.save(update_fields=["code", "balance"])
+    return [customer_user, customer_user2]
+
+
+@pytest.fixture
+def unreviewed_donations(donators):
+    return Donation.objects.bulk_create(
+        [
+            Donation(
+                number=i,
+                donator=donators[i % 2].code,
+                status=DonationStatus.UNREVIEWED,
+                price_amount=Decimal(2),
+                currency="CNY",
+            )
+            for i in range(1000)
+        ]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_donation_bulk_complete_1k_donations(
+    staff_api_client,
+    donators,
+    unreviewed_donations,
+    permission_manage_donations,
+    django_assert_max_num_queries,
+    count_queries,
+    _monthly_sequences,
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("Donation", donation.pk)
+            for donation in unreviewed_donations
+        ],
+        "accepted": True,
+    }
+
+    # when
+    with django_assert_max_num_queries(20):
+        response = staff_api_client.post_graphql(
+            DONATION_BULK_COMPLETE_MUTATION, variables
+        )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationBulkComplete"]
+    assert data["count"] == 1000
+    first, second = donators
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.balance == Decimal(1100)
+    assert second.balance == Decimal(1000)
+    assert not Donation.objects.exclude(status=DonationStatus.COMPLETED).exists()
+
+    granted = BalanceEvent.objects.filter(type=BalanceEvents.DONATION_GRANTED)
+    events = granted.filter(user=first).order_by("pk")
+    assert events.count() == 500
+    assert [event.balance for event in events[:2]] == [Decimal(102), Decimal(104)]
+    assert events.last().balance == Decimal(1100)
+    numbers = granted.values_list("number", flat=True)
+    assert len(set(numbers)) == 1000
+
+
+@pytest.mark.django_db
+def test_donation_bulk_complete_reject_completed_donations(
+    staff_api_client,
+    donators,
+    unreviewed_donations,
+    permission_manage_donations,
+):
+    # given
+    Donation.objects.update(status=DonationStatus.COMPLETED)
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("Donation", donation.pk)
+            for donation in unreviewed_donations[:10]
+        ],
+        "accepted": False,
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_BULK_COMPLETE_MUTATION,
+        variables,
+        permissions=[permission_manage_donations],
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationBulkComplete"]
+    assert data["count"] == 10
+    first, second = donators
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.balance == Decimal(90)
+    assert second.balance == Decimal(-10)
+    assert (
+        BalanceEvent.objects.filter(type=BalanceEvents.DONATION_REJECTED).count() == 10
+    )
@@ -0,0 +1,91 @@
+import pytest
+
+from .....barcode import encode_barcode
+from .....barcode.models import Barcode
+from .....core import MonthlySequenceName
+from .....core.models import MonthlySequence
+from .....donation.models import Donation
+from ....tests.utils import get_graphql_content
+
+DONATION_BULK_CREATE_MUTATION = """
+    mutation DonationBulkCreate(
+        $donations: [DonationCreateInput!]!, $errorPolicy: ErrorPolicyEnum
+    ) {
+        donationBulkCreate(donations: $donations, errorPolicy: $errorPolicy) {
+            count
+            results {
+                donation {
+                    number
+                    barcode
+                }
+                errors {
+                    path
+                    code
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def donators(customer_user, customer_user2):
+    customer_user.code = "520000000001"
+    customer_user2.code = "520000000002"
+    customer_user.save(update_fields=["code"])
+    customer_user2.save(update_fields=["code"])
+    return [customer_user, customer_user2]
+
+
+def _get_donation_input(donator, barcode):
+    return {
+        "title": "Book",
+        "description": "A book",
+        "quantity": 1,
+        "price": {"amount": 10, "currency": "CNY"},
+        "name": donator.first_name,
+        "donator": donator.code,
+        "barcode": barcode,
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_donation_bulk_create_1k_donations(
+    staff_api_client,
+    donators,
+    permission_manage_donations,
+    django_assert_max_num_queries,
+    count_queries,
+    _monthly_sequences,
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+    MonthlySequence.objects.create(
+        name=MonthlySequenceName.BARCODE, year_month=2403, last_value=1000
+    )
+    Barcode.objects.bulk_create(
+        [Barcode(year_month=2403, sub=sub, used=False) for sub in range(1, 501)]
+    )
+    variables = {
+        "donations": [
+            _get_donation_input(donators[i % 2], encode_barcode(2403, i + 1))
+            for i in range(1000)
+        ]
+    }
+
+    # when
+    with django_assert_max_num_queries(20):
+        response = staff_api_client.post_graphql(
+            DONATION_BULK_CREATE_MUTATION, variables
+        )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationBulkCreate"]
+    assert data["count"] == 1000
+    assert not any(result["errors"] for result in data["results"])
+    numbers = [result["donation"]["number"] for result in data["results"]]
+    assert len(set(numbers)) == 1000
+    assert Donation.objects.filter(barcode__isnull=False).count() == 1000
+    assert Barcode.objects.count() == 1000
+    assert not Barcode.objects.filter(used=False).exists()
@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .....donation.models import Donation
+from ....tests.utils import get_graphql_content
+
+DONATIONS_QUERY = """
+    query Donations {
+        donations(first: 20) {
+            edges {
+                node {
+                    number
+                    donator {
+                        email
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def donations(customer_user, customer_user2):
+    customer_user.code = "520000000001"
+    customer_user2.code = "520000000002"
+    customer_user.save(update_fields=["code"])
+    customer_user2.save(update_fields=["code"])
+    donators = [customer_user.code, customer_user2.code, "missing"]
+    return Donation.objects.bulk_create(
+        [
+            Donation(
+                number=i,
+                donator=donators[i % 3],
+                price_amount=Decimal(2),
+                currency="CNY",
+            )
+            for i in range(20)
+        ]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_donations_donator_resolved_with_one_query(
+    staff_api_client,
+    donations,
+    customer_user,
+    customer_user2,
+    permission_manage_users,
+    count_queries,
+):
+    # given
+    staff_api_client.user.user_permissions.add(
+        permission_manage_users, Permission.objects.get(codename="add_donations")
+    )
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        response = staff_api_client.post_graphql(DONATIONS_QUERY)
+
+    # then
+    edges = get_graphql_content(response)["data"]["donations"]["edges"]
+    assert len(edges) == 20
+    donators = [edge["node"]["donator"] for edge in edges]
+    assert {donator["email"] for donator in donators if donator} == {
+        customer_user.email,
+        customer_user2.email,
+    }
+    assert donators.count(None) == 6
+    user_queries = [
+        query["sql"]
+        for query in queries.captured_queries
+        if '"account_user"."code" IN' in query["sql"]
+    ]
+    assert len(user_queries) == 1
@@ -0,0 +1,182 @@
+from unittest.mock import Mock
+
+import graphene
+import pytest
+
+from ....barcode.models import Barcode
+from ....core import MonthlySequenceName
+from ....core.models import MonthlySequence
+from ....donation.models import Donation
+from ...tests.utils import get_graphql_content
+from ..mutations.utils import clean_donation_barcode
+
+DONATION_CREATE_MUTATION = """
+    mutation DonationCreate($input: DonationCreateInput!) {
+        donationCreate(input: $input) {
+            donation {
+                id
+                barcode
+            }
+            errors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def donator(customer_user):
+    customer_user.code = "520030910001"
+    customer_user.save(update_fields=["code"])
+    return customer_user
+
+
+def _get_variables(donator, barcode):
+    return {
+        "input": {
+            "title": "Book",
+            "description": "A book",
+            "quantity": 1,
+            "price": {"amount": 10, "currency": "CNY"},
+            "name": donator.first_name,
+            "donator": donator.code,
+            "barcode": barcode,
+        }
+    }
+
+
+def test_donation_create_links_barcode(
+    staff_api_client, permission_manage_donations, donator
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+    barcode = Barcode.objects.create(year_month=2403, sub=7)
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_CREATE_MUTATION, _get_variables(donator, barcode.code)
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationCreate"]
+    assert not data["errors"]
+    assert data["donation"]["barcode"] == barcode.code
+    _, donation_pk = graphene.Node.from_global_id(data["donation"]["id"])
+    donation = Donation.objects.get(pk=donation_pk)
+    assert donation.barcode == barcode
+    barcode.refresh_from_db()
+    assert barcode.used
+
+
+def test_donation_create_duplicated_barcode(
+    staff_api_client, permission_manage_donations, donator
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+    barcode = Barcode.objects.create(year_month=2403, sub=7)
+    Donation.objects.create(barcode=barcode, barcode_code=barcode.code)
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_CREATE_MUTATION, _get_variables(donator, barcode.code)
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationCreate"]
+    assert data["errors"] == [{"field": "barcode", "code": "INVALID"}]
+    assert Donation.objects.filter(barcode=barcode).count() == 1
+
+
+def test_donation_create_invalid_barcode(
+    staff_api_client, permission_manage_donations, donator
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_CREATE_MUTATION, _get_variables(donator, "not a code")
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationCreate"]
+    assert data["errors"] == [{"field": "barcode", "code": "INVALID"}]
+    assert not Barcode.objects.exists()
+
+
+def test_donation_create_creates_barcode_not_printed(
+    staff_api_client, permission_manage_donations, donator
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+    MonthlySequence.objects.create(
+        name=MonthlySequenceName.BARCODE, year_month=2403, last_value=7
+    )
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_CREATE_MUTATION, _get_variables(donator, "240300007")
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationCreate"]
+    assert not data["errors"]
+    barcode = Barcode.objects.get()
+    assert (barcode.year_month, barcode.sub) == (2403, 7)
+    assert barcode.used
+    assert barcode.donations.count() == 1
+
+
+def test_donation_create_code_not_reserved(
+    staff_api_client, permission_manage_donations, donator
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+    MonthlySequence.objects.create(
+        name=MonthlySequenceName.BARCODE, year_month=2403, last_value=6
+    )
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_CREATE_MUTATION, _get_variables(donator, "240300007")
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationCreate"]
+    assert data["errors"] == [{"field": "barcode", "code": "INVALID"}]
+    assert not Barcode.objects.exists()
+
+
+@pytest.mark.parametrize("code", ["7", "241300001", "240300000", "10000000001"])
+def test_donation_create_code_of_invalid_month_or_sub(
+    code, staff_api_client, permission_manage_donations, donator
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_donations)
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_CREATE_MUTATION, _get_variables(donator, code)
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationCreate"]
+    assert data["errors"] == [{"field": "barcode", "code": "INVALID"}]
+    assert not Barcode.objects.exists()
+
+
+def test_clean_donation_barcode_does_not_create_barcode():
+    # given
+    info = Mock(context=Mock(allow_replica=False))
+    MonthlySequence.objects.create(
+        name=MonthlySequenceName.BARCODE, year_month=2403, last_value=7
+    )
+
+    # when
+    code = clean_donation_barcode(info, Donation(), {"barcode": " 240300007 "})
+
+    # then
+    assert code == "240300007"
+    assert not Barcode.objects.exists()
@@ -0,0 +1,198 @@
+from unittest.mock import patch
+
+import pytest
+
+from ....barcode import encode_barcode
+from ....barcode.models import Barcode
+from ....core import MonthlySequenceName
+from ....core.models import MonthlySequence
+from ....donation.models import Donation
+from ...tests.utils import get_graphql_content
+from ..bulk_mutations.donation_bulk_create import DonationBulkCreate
+
+DONATION_BULK_CREATE_MUTATION = """
+    mutation DonationBulkCreate(
+        $donations: [DonationCreateInput!]!, $errorPolicy: ErrorPolicyEnum
+    ) {
+        donationBulkCreate(donations: $donations, errorPolicy: $errorPolicy) {
+            count
+            results {
+                donation {
+                    number
+                    barcode
+                }
+                errors {
+                    path
+                    code
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def donators(customer_user, customer_user2):
+    customer_user.code = "520000000001"
+    customer_user2.code = "520000000002"
+    customer_user.save(update_fields=["code"])
+    customer_user2.save(update_fields=["code"])
+    return [customer_user, customer_user2]
+
+
+def _get_donation_input(donator, barcode):
+    return {
+        "title": "Book",
+        "description": "A book",
+        "quantity": 1,
+        "price": {"amount": 10, "currency": "CNY"},
+        "name": donator.first_name,
+        "donator": donator.code,
+        "barcode": barcode,
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("error_policy", "expected_count"),
+    [("REJECT_EVERYTHING", 0), ("REJECT_FAILED_ROWS", 1)],
+)
+def test_donation_bulk_create_errors_per_row(
+    error_policy,
+    expected_count,
+    staff_api_client,
+    donators,
+    permission_manage_donations,
+):
+    # given
+    donator = donators[0]
+    MonthlySequence.objects.create(
+        name=MonthlySequenceName.BARCODE, year_month=2403, last_value=2
+    )
+    barcode = encode_barcode(2403, 1)
+    variables = {
+        "donations": [
+            _get_donation_input(donator, barcode),
+            _get_donation_input(donator, "not-a-code"),
+            {
+                **_get_donation_input(donator, encode_barcode(2403, 2)),
+                "donator": "missing",
+            },
+        ],
+        "errorPolicy": error_policy,
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_BULK_CREATE_MUTATION,
+        variables,
+        permissions=[permission_manage_donations],
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationBulkCreate"]
+    assert data["count"] == expected_count
+    first, invalid_barcode, missing_donator = data["results"]
+    assert not first["errors"]
+    assert [error["path"] for error in invalid_barcode["errors"]] == ["barcode"]
+    assert [error["path"] for error in missing_donator["errors"]] == ["donator"]
+    assert Donation.objects.count() == expected_count
+    if expected_count:
+        assert first["donation"]["barcode"] == barcode
+    else:
+        assert first["donation"] is None
+
+
+@pytest.mark.django_db
+def test_donation_bulk_create_codes_not_reserved(
+    staff_api_client, donators, permission_manage_donations
+):
+    # given
+    donator = donators[0]
+    MonthlySequence.objects.create(
+        name=MonthlySequenceName.BARCODE, year_month=2403, last_value=1
+    )
+    variables = {
+        "donations": [
+            _get_donation_input(donator, encode_barcode(2403, 1)),
+            _get_donation_input(donator, encode_barcode(2403, 2)),
+            _get_donation_input(donator, encode_barcode(2404, 1)),
+        ],
+        "errorPolicy": "REJECT_FAILED_ROWS",
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_BULK_CREATE_MUTATION,
+        variables,
+        permissions=[permission_manage_donations],
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationBulkCreate"]
+    assert data["count"] == 1
+    reserved, not_reserved, other_month = data["results"]
+    assert not reserved["errors"]
+    assert [error["path"] for error in not_reserved["errors"]] == ["barcode"]
+    assert [error["path"] for error in other_month["errors"]] == ["barcode"]
+    assert list(Barcode.objects.values_list("year_month", "sub")) == [(2403, 1)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("error_policy", "expected_count"),
+    [("REJECT_EVERYTHING", 0), ("REJECT_FAILED_ROWS", 1)],
+)
+def test_donation_bulk_create_barcode_taken_after_cleaning(
+    error_policy,
+    expected_count,
+    staff_api_client,
+    donators,
+    permission_manage_donations,
+):
+    # given
+    donator = donators[0]
+    taken, free = Barcode.objects.bulk_create(
+        [Barcode(year_month=2403, sub=1), Barcode(year_month=2403, sub=2)]
+    )
+    clean_barcodes = DonationBulkCreate.clean_barcodes
+
+    def clean_barcodes_and_take_barcode(*args):
+        codes = clean_barcodes(*args)
+        # Donations which don't lock the barcode may take it before the save.
+        Donation.objects.create(barcode=taken, barcode_code=taken.code)
+        return codes
+
+    variables = {
+        "donations": [
+            _get_donation_input(donator, taken.code),
+            _get_donation_input(donator, free.code),
+        ],
+        "errorPolicy": error_policy,
+    }
+
+    # when
+    with patch.object(
+        DonationBulkCreate,
+        "clean_barcodes",
+        side_effect=clean_barcodes_and_take_barcode,
+    ):
+        response = staff_api_client.post_graphql(
+            DONATION_BULK_CREATE_MUTATION,
+            variables,
+            permissions=[permission_manage_donations],
+        )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationBulkCreate"]
+    assert data["count"] == expected_count
+    first, second = data["results"]
+    assert [error["path"] for error in first["errors"]] == ["barcode"]
+    assert first["donation"] is None
+    assert not second["errors"]
+    if expected_count:
+        assert second["donation"]["barcode"] == free.code
+    else:
+        assert second["donation"] is None
+    assert Donation.objects.filter(barcode=taken).count() == 1
+    assert Donation.objects.filter(barcode=free).count() == expected_count
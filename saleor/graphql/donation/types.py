@@ -59,6 +59,10 @@ class Donation(ModelObjectType[models.Donation]):
     def resolve_description(root: models.Donation, _info: ResolveInfo):
         return root.description
 
+    @staticmethod
+    def resolve_barcode(root: models.Donation, _info: ResolveInfo):
+        return root.barcode_code
+
     @staticmethod
     def resolve_created_at(root: models.Donation, _info: ResolveInfo):
         return root.created_at
@@ -80,15 +84,20 @@ class Donation(ModelObjectType[models.Donation]):
         if not root.donator:
             return None
         requestor = get_user_or_app_from_context(info.context)
-        donator = UserByUserCodeLoader(info.context).load(root.donator).get()
-        check_is_owner_or_has_one_of_perms(
-            requestor,
-            donator,
-            AccountPermissions.MANAGE_USERS,
-            AccountPermissions.READ_USERS,
-            DonationPermissions.ADD_DONATIONS,
+
+        def _resolve_donator(donator):
+            check_is_owner_or_has_one_of_perms(
+                requestor,
+                donator,
+                AccountPermissions.MANAGE_USERS,
+                AccountPermissions.READ_USERS,
+                DonationPermissions.ADD_DONATIONS,
+            )
+            return donator
+
+        return (
+            UserByUserCodeLoader(info.context).load(root.donator).then(_resolve_donator)
         )
-        return donator
 
     @staticmethod
     def resolve_status(root: models.Donation, _info: ResolveInfo):
@@ -1,5 +1,8 @@
+from datetime import datetime, time, timedelta
+
 import django_filters
 from django.db.models import Q
+from django.utils import timezone
 
 from ...account.models import BalanceEvent, CustomerEvent
 from ...order.models import OrderEvent
@@ -14,7 +17,6 @@ from ..core.filters import (
 from ..core.types.common import DateRangeInput
 from ..core.types.filter_input import FilterInputObjectType
 from ..order.enums import OrderEventsEnum
-from ..utils.filters import filter_range_field
 
 
 def filter_user(qs, _, value):
@@ -34,7 +36,14 @@ def filter_account(qs, _, value):
 
 
 def filter_date_range(qs, _, value):
-    return filter_range_field(qs, "date__date", value)
+    # Compare the raw column so that the `(user, date)` indexes can be used.
+    gte, lte = value.get("gte"), value.get("lte")
+    if gte:
+        qs = qs.filter(date__gte=timezone.make_aware(datetime.combine(gte, time.min)))
+    if lte:
+        lte = datetime.combine(lte + timedelta(days=1), time.min)
+        qs = qs.filter(date__lt=timezone.make_aware(lte))
+    return qs
 
 
 def filter_type(qs, _, value):
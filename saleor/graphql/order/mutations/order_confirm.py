@@ -2,27 +2,18 @@ from typing import cast
 
 import graphene
 from django.core.exceptions import ValidationError
-from django.db import transaction
 
-from saleor.core.prices import quantize_price
-from saleor.core.tracing import traced_atomic_transaction
 from saleor.graphql.core.enums import PaymentErrorCode
-from saleor.graphql.core.types.common import PaymentError
-from saleor.order import events as order_events
-from saleor.account import events as account_events
-from saleor.payment import ChargeStatus
-from saleor.payment.utils import create_payment
 
+from ....account import ledger
 from ....account.models import User
-from ....order import OrderStatus, models
+from ....order import models
+from ....order.actions import confirm_order_paid_with_balance
 from ....order.error_codes import OrderErrorCode
-from ....order.fetch import fetch_order_info
 from ....order.utils import update_order_display_gross_prices
-from ....permission.enums import OrderPermissions
 from ...core import ResolveInfo
 from ...core.mutations import ModelMutation
 from ...core.types import OrderError
-from ...site.dataloaders import get_site_promise
 from ..types import Order
 
 
@@ -88,30 +79,9 @@ class OrderConfirm(ModelMutation):
             )
 
         update_order_display_gross_prices(order)
-
-        order.save(update_fields=["status", "updated_at", "display_gross_prices"])
-
-        order_info = fetch_order_info(order)
-
-        if user.balance >= order.total_net_amount:
-            with traced_atomic_transaction():
-                payment = order.get_last_payment()
-                order.status = OrderStatus.UNFULFILLED
-                order.charge_status = ChargeStatus.FULLY_CHARGED
-                order.total_charged_amount = order.total_net_amount
-                payment.charge_status = ChargeStatus.FULLY_CHARGED
-                payment.captured_amount = order.total_net_amount
-                user.balance -= order.total_net_amount
-                user.balance = quantize_price(user.balance, "AXB")
-                order.save(
-                    update_fields=["status", "charge_status", "total_charged_amount"]
-                )
-                user.save(update_fields=["balance"])
-                payment.save(update_fields=["charge_status", "captured_amount"])
-                order_events.order_confirmed_event(order=order, user=user, app=None)
-                account_events.consumption_balance_event(user=user, order=order)
-                return OrderConfirm(order=order)
-        else:
+        try:
+            confirmed = confirm_order_paid_with_balance(order, user)
+        except ledger.InsufficientBalance:
             raise ValidationError(
                 {
                     "balance": ValidationError(
@@ -120,3 +90,14 @@ class OrderConfirm(ModelMutation):
                     )
                 }
             )
+        if not confirmed:
+            raise ValidationError(
+                {
+                    "id": ValidationError(
+                        "Provided order id belongs to an order with status "
+                        "different than unconfirmed.",
+                        code=OrderErrorCode.INVALID.value,
+                    )
+                }
+            )
+        return OrderConfirm(order=order)
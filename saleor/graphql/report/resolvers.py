@@ -1,24 +1,27 @@
-from datetime import datetime
+from datetime import date as date_type
 
-from django.db.models import Max, Min, Q, Sum
+from django.db.models import Count, Max, Min, Sum
 from django.forms import ValidationError
 
-from ...account.models import User
-from ...donation.models import Donation, DonationStatus
-from ...order import OrderStatus
-from ...order.models import Order
+from ...order.models import OrderLine
+from ...report import ReportKind
+from ...report.utils import (
+    get_reportable_customers,
+    get_reportable_donations,
+    get_reportable_orders,
+)
 from ..core import ResolveInfo
 from ..core.context import get_database_connection_name
 from ..core.types.common import DateRangeInput
-from ..utils.filters import filter_range_field
-from .types import BaseReport, Granularity, get_relative_delta
+from .types import BaseReport, Granularity
+from .utils import aggregate_with_daily_reports, group_by_bucket, merge_buckets
 
 
 def _revise_date_input(qs, field, date: DateRangeInput) -> DateRangeInput:
-    if not date.lte:
-        date.lte = qs.aggregate(lte=Max(field + "__date"))["lte"]
-    if not date.gte:
-        date.gte = qs.aggregate(gte=Min(field + "__date"))["gte"]
+    if not date.lte or not date.gte:
+        limits = qs.aggregate(lte=Max(field + "__date"), gte=Min(field + "__date"))
+        date.lte = date.lte or limits["lte"]
+        date.gte = date.gte or limits["gte"]
 
     if date.lte is None or date.gte is None:
         raise ValidationError(message="Range not found.")
@@ -26,96 +29,105 @@ def _revise_date_input(qs, field, date: DateRangeInput) -> DateRangeInput:
     return date
 
 
-def _split_date_input(
-    date: DateRangeInput, granularity: Granularity
-) -> list[dict[str, datetime]]:
-    ranges: list[dict[str, datetime]] = []
-    delta = get_relative_delta(granularity)
-    x = date.gte
-    y = date.lte
-    while x + delta < y:
-        ranges.append(dict(gte=x, lte=x + delta))
-        x = x + delta
-    ranges.append(dict(gte=x, lte=x + delta))
-    return ranges
-
-
 def resolve_order_reports(
     info: ResolveInfo, date: DateRangeInput, granularity: Granularity
 ) -> list[BaseReport]:
-    qs = Order.objects.using(get_database_connection_name(info.context)).exclude(
-        Q(status=OrderStatus.CANCELED)
-        | Q(status=OrderStatus.UNCONFIRMED)
-        | Q(status=OrderStatus.EXPIRED)
-    )
+    database_connection_name = get_database_connection_name(info.context)
+    qs = get_reportable_orders(database_connection_name)
     try:
         date = _revise_date_input(qs, "created_at", date)
     except ValidationError:
         return list()
 
-    results = []
-    for dt in _split_date_input(date, granularity):
-        qss = qs.all()
-        qss = filter_range_field(qss, "created_at", dt)
-        qss = qss.annotate(quantity_ordered=Sum("lines__quantity"))
-        collectionTotal = qss.count()
-        agg = qss.aggregate(
-            quantitiesTotal=Sum("quantity_ordered"), amountTotal=Sum("total_net_amount")
+    def compute_live(gte: date_type, lte: date_type):
+        # Order totals and line quantities are grouped separately, joining the
+        # lines would multiply the order amounts by the number of lines.
+        orders = group_by_bucket(
+            qs,
+            "created_at",
+            gte,
+            lte,
+            granularity,
+            collectionTotal=Count("pk"),
+            amountTotal=Sum("total_net_amount"),
         )
-        results.append(
-            BaseReport(
-                collectionTotal=collectionTotal,
-                quantitiesTotal=agg["quantitiesTotal"],
-                amountTotal=agg["amountTotal"],
-            )
+        lines = group_by_bucket(
+            OrderLine.objects.using(database_connection_name).filter(
+                order__in=qs.values("pk")
+            ),
+            "order__created_at",
+            gte,
+            lte,
+            granularity,
+            quantitiesTotal=Sum("quantity"),
         )
-    return results
+        return merge_buckets(orders, lines)
+
+    buckets = aggregate_with_daily_reports(
+        ReportKind.ORDERS,
+        date.gte,
+        date.lte,
+        granularity,
+        compute_live,
+        using=database_connection_name,
+    )
+    return [BaseReport(**bucket) for bucket in buckets]
 
 
 def resolve_customers_registered(
     info: ResolveInfo, date: DateRangeInput, granularity: Granularity
 ) -> list[int]:
-    qs = User.objects.using(get_database_connection_name(info.context))
+    database_connection_name = get_database_connection_name(info.context)
+    qs = get_reportable_customers(database_connection_name)
     try:
         date = _revise_date_input(qs, "date_joined", date)
     except ValidationError:
         return list()
 
-    results: list[int] = []
-
-    for dt in _split_date_input(date, granularity):
-        qss = qs.all()
-        qss = filter_range_field(qss, "date_joined", dt)
-        results.append(qss.count())
+    def compute_live(gte: date_type, lte: date_type):
+        return group_by_bucket(
+            qs, "date_joined", gte, lte, granularity, collectionTotal=Count("pk")
+        )
 
-    return results
+    buckets = aggregate_with_daily_reports(
+        ReportKind.CUSTOMERS,
+        date.gte,
+        date.lte,
+        granularity,
+        compute_live,
+        using=database_connection_name,
+    )
+    return [bucket["collectionTotal"] for bucket in buckets]
 
 
 def resolve_donation_reports(
     info: ResolveInfo, date: DateRangeInput, granularity: Granularity
 ) -> list[BaseReport]:
-    qs = Donation.objects.using(get_database_connection_name(info.context)).filter(
-        status=DonationStatus.COMPLETED
-    )
-
+    database_connection_name = get_database_connection_name(info.context)
+    qs = get_reportable_donations(database_connection_name)
     try:
         date = _revise_date_input(qs, "created_at", date)
     except ValidationError:
         return list()
 
-    results: list[BaseReport] = []
-    for dt in _split_date_input(date, granularity):
-        qss = qs.all()
-        qss = filter_range_field(qss, "created_at", dt)
-        collectionTotal = qss.count()
-        agg = qss.aggregate(
-            quantitiesTotal=Sum("quantity"), amountTotal=Sum("price_amount")
+    def compute_live(gte: date_type, lte: date_type):
+        return group_by_bucket(
+            qs,
+            "created_at",
+            gte,
+            lte,
+            granularity,
+            collectionTotal=Count("pk"),
+            quantitiesTotal=Sum("quantity"),
+            amountTotal=Sum("price_amount"),
         )
-        results.append(
-            BaseReport(
-                collectionTotal=collectionTotal,
-                quantitiesTotal=agg["quantitiesTotal"],
-                amountTotal=agg["amountTotal"],
-            )
-        )
-    return results
+
+    buckets = aggregate_with_daily_reports(
+        ReportKind.DONATIONS,
+        date.gte,
+        date.lte,
+        granularity,
+        compute_live,
+        using=database_connection_name,
+    )
+    return [BaseReport(**bucket) for bucket in buckets]
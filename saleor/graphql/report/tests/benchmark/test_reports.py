@@ -0,0 +1,140 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+import pytz
+
+from .....donation import DonationStatus
+from .....donation.models import Donation
+from .....order import OrderStatus
+from .....order.models import Order
+from ....tests.utils import get_graphql_content
+
+ORDER_REPORTS_QUERY = """
+    query OrderReports($date: DateRangeInput!, $granularity: Granularity!) {
+        orderReports(date: $date, granularity: $granularity) {
+            collectionTotal
+            quantitiesTotal
+            amountTotal
+        }
+    }
+"""
+
+DONATION_REPORTS_QUERY = """
+    query DonationReports($date: DateRangeInput!, $granularity: Granularity!) {
+        donationReports(date: $date, granularity: $granularity) {
+            collectionTotal
+            quantitiesTotal
+            amountTotal
+        }
+    }
+"""
+
+CUSTOMER_REPORTS_QUERY = """
+    query CustomerReports($date: DateRangeInput!, $granularity: Granularity!) {
+        customerReports(date: $date, granularity: $granularity)
+    }
+"""
+
+YEAR_RANGE = {"gte": "2024-01-01", "lte": "2024-12-31"}
+
+
+@pytest.fixture
+def orders_for_reports(order_list):
+    start = datetime.datetime(2024, 1, 1, 12, tzinfo=pytz.utc)
+    for i, order in enumerate(order_list):
+        order.status = OrderStatus.FULFILLED
+        order.created_at = start + datetime.timedelta(days=100 * i)
+        order.total_net_amount = Decimal(10)
+    Order.objects.bulk_update(order_list, ["status", "created_at", "total_net_amount"])
+    return order_list
+
+
+@pytest.fixture
+def donations_for_reports():
+    start = datetime.datetime(2024, 1, 1, 12, tzinfo=pytz.utc)
+    return Donation.objects.bulk_create(
+        [
+            Donation(
+                number=i,
+                status=DonationStatus.COMPLETED,
+                created_at=start + datetime.timedelta(days=i),
+                price_amount=Decimal(5),
+                currency="CNY",
+                quantity=2,
+            )
+            for i in range(100)
+        ]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_order_reports_daily_for_a_year(
+    staff_api_client,
+    orders_for_reports,
+    permission_manage_orders,
+    django_assert_max_num_queries,
+    count_queries,
+):
+    # given
+    variables = {"date": YEAR_RANGE, "granularity": "DAILY"}
+    staff_api_client.user.user_permissions.add(permission_manage_orders)
+
+    # when
+    # one query per bucket type instead of two per day of the year
+    with django_assert_max_num_queries(10):
+        response = staff_api_client.post_graphql(ORDER_REPORTS_QUERY, variables)
+
+    # then
+    data = get_graphql_content(response)["data"]["orderReports"]
+    assert len(data) == 366
+    assert sum(report["collectionTotal"] for report in data) == len(orders_for_reports)
+    assert sum(report["amountTotal"] for report in data) == 30
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_donation_reports_daily_for_a_year(
+    staff_api_client,
+    donations_for_reports,
+    permission_manage_donations,
+    count_queries,
+):
+    # given
+    variables = {"date": YEAR_RANGE, "granularity": "DAILY"}
+
+    # when
+    response = staff_api_client.post_graphql(
+        DONATION_REPORTS_QUERY, variables, permissions=[permission_manage_donations]
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["donationReports"]
+    assert len(data) == 366
+    assert data[0] == {"collectionTotal": 1, "quantitiesTotal": 2, "amountTotal": 5.0}
+    assert data[-1] == {"collectionTotal": 0, "quantitiesTotal": 0, "amountTotal": 0.0}
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_customer_reports_monthly(
+    staff_api_client,
+    customer_user,
+    permission_manage_users,
+    count_queries,
+):
+    # given
+    customer_user.date_joined = datetime.datetime(2024, 3, 15, tzinfo=pytz.utc)
+    customer_user.save(update_fields=["date_joined"])
+    variables = {"date": YEAR_RANGE, "granularity": "MONTHLY"}
+
+    # when
+    response = staff_api_client.post_graphql(
+        CUSTOMER_REPORTS_QUERY, variables, permissions=[permission_manage_users]
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["customerReports"]
+    assert len(data) == 12
+    assert data[2] >= 1
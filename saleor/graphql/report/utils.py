@@ -0,0 +1,142 @@
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Optional
+
+from django.db.models import DateField, QuerySet, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncYear
+from django.db.models.functions.datetime import TruncBase
+from django.utils import timezone
+
+from ...report.models import DailyReport
+from ...report.utils import get_daily_reports_boundary
+from .types import Granularity, get_relative_delta
+
+
+def get_trunc_function(g: Granularity) -> type[TruncBase]:
+    if g == Granularity.DAILY:
+        return TruncDay
+    elif g == Granularity.MONTHLY:
+        return TruncMonth
+    else:
+        return TruncYear
+
+
+def truncate_date(value: date, granularity: Granularity) -> date:
+    if granularity == Granularity.DAILY:
+        return value
+    elif granularity == Granularity.MONTHLY:
+        return value.replace(day=1)
+    else:
+        return value.replace(month=1, day=1)
+
+
+def get_bucket_starts(gte: date, lte: date, granularity: Granularity) -> list[date]:
+    """Return the first day of every bucket that overlaps the `gte`-`lte` range."""
+    delta = get_relative_delta(granularity)
+    start = truncate_date(gte, granularity)
+    buckets = []
+    while start <= lte:
+        buckets.append(start)
+        start = start + delta
+    return buckets
+
+
+def get_datetime_range(gte: date, lte: date) -> tuple[datetime, datetime]:
+    """Convert an inclusive date range into a half-open datetime range.
+
+    Comparing the raw column against datetimes, instead of using the `__date`
+    transform, lets the database use an index on the column.
+    """
+    return (
+        timezone.make_aware(datetime.combine(gte, time.min)),
+        timezone.make_aware(datetime.combine(lte + timedelta(days=1), time.min)),
+    )
+
+
+def group_by_bucket(
+    qs: QuerySet,
+    field: str,
+    gte: date,
+    lte: date,
+    granularity: Granularity,
+    **aggregates,
+) -> dict[date, dict[str, Any]]:
+    """Compute the given aggregates for every bucket in a single grouped query.
+
+    The queryset is grouped by the `field` truncated to the requested granularity,
+    so the number of queries does not depend on the number of buckets. Returns
+    the aggregated values by the first day of the bucket.
+    """
+    start, end = get_datetime_range(gte, lte)
+    trunc = get_trunc_function(granularity)
+    rows = (
+        qs.filter(**{f"{field}__gte": start, f"{field}__lt": end})
+        .annotate(bucket=trunc(field, output_field=DateField()))
+        .order_by()
+        .values("bucket")
+        .annotate(**aggregates)
+    )
+    return {row.pop("bucket"): row for row in rows}
+
+
+def merge_buckets(*values_by_bucket: dict[date, dict[str, Any]]):
+    merged: dict[date, dict[str, Any]] = {}
+    for values in values_by_bucket:
+        for bucket, row in values.items():
+            merged_row = merged.setdefault(bucket, {})
+            for name, value in row.items():
+                merged_row[name] = (merged_row.get(name) or 0) + (value or 0)
+    return merged
+
+
+def fill_buckets(
+    values_by_bucket: dict[date, dict[str, Any]],
+    gte: date,
+    lte: date,
+    granularity: Granularity,
+    names: Iterable[str],
+) -> list[dict[str, Any]]:
+    """Return the values of every bucket in the range, filling gaps with zeros."""
+    results = []
+    for bucket in get_bucket_starts(gte, lte, granularity):
+        row = values_by_bucket.get(bucket, {})
+        results.append({name: row.get(name) or 0 for name in names})
+    return results
+
+
+def aggregate_with_daily_reports(
+    kind: str,
+    gte: date,
+    lte: date,
+    granularity: Granularity,
+    compute_live: Callable[[date, date], dict[date, dict[str, Any]]],
+    using: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """Aggregate report buckets from the stored daily reports.
+
+    Days that are not covered by the daily reports yet (usually only today) are
+    grouped by `compute_live` from the source tables and added to the buckets.
+    """
+    boundary = get_daily_reports_boundary(kind, using)
+    stored: dict[date, dict[str, Any]] = {}
+    live: dict[date, dict[str, Any]] = {}
+    if gte < boundary:
+        stored = group_by_bucket(
+            DailyReport.objects.using(using).filter(kind=kind),
+            "date",
+            gte,
+            min(lte, boundary - timedelta(days=1)),
+            granularity,
+            collectionTotal=Sum("collection_total"),
+            quantitiesTotal=Sum("quantities_total"),
+            amountTotal=Sum("amount_total"),
+        )
+    if boundary <= lte:
+        live = compute_live(max(gte, boundary), lte)
+    return fill_buckets(
+        merge_buckets(stored, live),
+        gte,
+        lte,
+        granularity,
+        ["collectionTotal", "quantitiesTotal", "amountTotal"],
+    )
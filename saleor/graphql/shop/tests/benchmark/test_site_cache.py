@@ -0,0 +1,80 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .....site.cache import invalidate_site_cache
+from .....site.models import SiteCarousel, SiteCarouselLine
+from ....tests.utils import get_graphql_content
+
+QUERY_SITE = """
+    query {
+        shop {
+            name
+            description
+            headerText
+        }
+        carousel {
+            urls
+        }
+        statistics {
+            views
+            users
+        }
+    }
+"""
+
+QUERY_TYPENAME = """
+    query {
+        __typename
+    }
+"""
+
+
+@pytest.fixture
+def _site_cache_enabled(settings):
+    settings.SITE_CACHE_TIMEOUT = 60
+    invalidate_site_cache()
+    cache.clear()
+    yield
+    invalidate_site_cache()
+    cache.clear()
+
+
+def _count_queries(api_client, query):
+    with CaptureQueriesContext(connection) as context:
+        content = get_graphql_content(api_client.post_graphql(query))
+    return len(context.captured_queries), content
+
+
+@pytest.mark.django_db
+def test_warm_site_cache_adds_no_queries(
+    api_client, site_settings, _site_cache_enabled
+):
+    # given
+    carousel = SiteCarousel.objects.create(site=site_settings)
+    SiteCarouselLine.objects.create(carousel=carousel, url="https://example.com/1")
+    baseline, _ = _count_queries(api_client, QUERY_TYPENAME)
+    _count_queries(api_client, QUERY_SITE)
+
+    # when
+    count, content = _count_queries(api_client, QUERY_SITE)
+
+    # then
+    assert count == baseline
+    assert content["data"]["carousel"]["urls"] == ["https://example.com/1"]
+    assert content["data"]["statistics"]["views"] == 0
+
+
+@pytest.mark.django_db
+def test_site_cache_invalidated_on_save(api_client, site_settings, _site_cache_enabled):
+    # given
+    _count_queries(api_client, QUERY_SITE)
+
+    # when
+    site_settings.description = "New description"
+    site_settings.save(update_fields=["description"])
+    _, content = _count_queries(api_client, QUERY_SITE)
+
+    # then
+    assert content["data"]["shop"]["description"] == "New description"
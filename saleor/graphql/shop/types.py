@@ -48,6 +48,7 @@ from ..payment.types import PaymentGateway
 from ..plugins.dataloaders import plugin_manager_promise_callback
 from ..shipping.types import ShippingMethod
 from ..site.dataloaders import (
+    SiteStatisticsBySiteIdLoader,
     get_site_carousel_promise,
     get_site_promise,
     load_site_callback,
@@ -145,11 +146,12 @@ class Carousel(graphene.ObjectType):
 
     @staticmethod
     def resolve_urls(root, info: ResolveInfo):
-        try:
-            carousel = get_site_carousel_promise(info.context).get()
+        def _resolve_urls(carousel):
+            if carousel is None:
+                return []
             return [line.url for line in carousel.lines.all()]
-        except:
-            return []
+
+        return get_site_carousel_promise(info.context).then(_resolve_urls)
 
     class Meta:
         description = "Shop Carousel."
@@ -169,27 +171,43 @@ class Statistics(graphene.ObjectType):
     @staticmethod
     def get_node(root, info: ResolveInfo):
         site = get_site_promise(info.context).get()
-        return site.stat
+        return SiteStatisticsBySiteIdLoader(info.context).load(site.pk).get()
 
     @staticmethod
     @load_site_callback
     def resolve_views(root, info: ResolveInfo, site):
-        return site.stat.views
+        return (
+            SiteStatisticsBySiteIdLoader(info.context)
+            .load(site.pk)
+            .then(lambda stat: stat.views)
+        )
 
     @staticmethod
     @load_site_callback
     def resolve_users(_, info: ResolveInfo, site):
-        return site.stat.users
+        return (
+            SiteStatisticsBySiteIdLoader(info.context)
+            .load(site.pk)
+            .then(lambda stat: stat.users)
+        )
 
     @staticmethod
     @load_site_callback
     def resolve_circulated_currency(_, info: ResolveInfo, site):
-        return site.stat.circulated_currency
+        return (
+            SiteStatisticsBySiteIdLoader(info.context)
+            .load(site.pk)
+            .then(lambda stat: stat.circulated_currency)
+        )
 
     @staticmethod
     @load_site_callback
     def resolve_circulated_items(_, info: ResolveInfo, site):
-        return site.stat.circulated_items
+        return (
+            SiteStatisticsBySiteIdLoader(info.context)
+            .load(site.pk)
+            .then(lambda stat: stat.circulated_items)
+        )
 
     class Meta:
         description = "Shop Statistics."
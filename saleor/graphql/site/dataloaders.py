@@ -1,46 +1,48 @@
-from functools import partial, reduce
-from typing import Callable, Iterable, TypeVar
+from functools import partial
+from typing import Callable, TypeVar
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ImproperlyConfigured
-from django.db.models import Q
 from django.http.request import split_domain_port
 from promise import Promise
 
+from ...site.cache import (
+    get_cached_carousels,
+    get_cached_site_statistics,
+    get_cached_sites,
+    get_cached_sites_by_host,
+)
+from ...site.models import SiteCarousel
 from ..core.dataloaders import DataLoader
-from ...site.models import SiteCarousel, SiteStatistics
 
 
 class SiteByIdLoader(DataLoader[int, Site]):
     context_key = "site_by_id"
 
     def batch_load(self, keys):
-        sites_mapped = Site.objects.using(self.database_connection_name).in_bulk(keys)
-        return [sites_mapped.get(site_id) for site_id in keys]
+        return get_cached_sites(keys, self.database_connection_name)
 
 
 class SiteCarouselBySiteIdLoader(DataLoader):
     context_key = "site_carousel_by_site_id"
 
     def batch_load(self, keys):
-        carousels = SiteCarousel.objects.using(self.database_connection_name)
-        try:
-            return [carousels.get(site__pk=site_id) for site_id in keys]
-        except:
-            return []
+        return get_cached_carousels(keys, self.database_connection_name)
+
+
+class SiteStatisticsBySiteIdLoader(DataLoader):
+    context_key = "site_statistics_by_site_id"
+
+    def batch_load(self, keys):
+        return get_cached_site_statistics(keys)
 
 
 class SiteByHostLoader(DataLoader):
     context_key = "site_by_host"
 
     def batch_load(self, keys):
-        # simulate non existing `domain__iexact__in`
-        q_list = map(lambda k: Q(domain__iexact=k), keys)
-        q_list = reduce(lambda a, b: a | b, q_list)
-        sites = Site.objects.using(self.database_connection_name).filter(q_list)
-        sites_mapped = {s.domain.lower(): s for s in sites}
-        return [sites_mapped.get(host.lower()) for host in keys]
+        return get_cached_sites_by_host(keys, self.database_connection_name)
 
 
 def get_site_promise(request) -> Promise[Site]:
@@ -54,20 +56,11 @@ def get_site_promise(request) -> Promise[Site]:
         .load(host)
         .then(partial(ensure_that_site_is_not_none, request, host))
     )
-
-    try:
-        _ = site.stat
-    except:
-        _ = SiteStatistics.objects.get_or_create(site=site)
     return site
 
 
-def get_site_carousel_promise(request) -> Promise[Site]:
-    site_id = settings.SITE_ID
-    try:
-        return SiteCarouselBySiteIdLoader(request).load(site_id)
-    except:
-        raise
+def get_site_carousel_promise(request) -> Promise[SiteCarousel]:
+    return SiteCarouselBySiteIdLoader(request).load(settings.SITE_ID)
 
 
 def execute_callback_if_site_not_none(site):
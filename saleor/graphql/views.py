@@ -2,7 +2,7 @@ import hashlib
 import importlib
 import json
 from inspect import isclass
-from typing import Any, Optional, Union
+from typing import Any, Optional, Union, cast
 
 import opentracing
 import opentracing.tags
@@ -12,6 +12,7 @@ from django.db import connection
 from django.db.backends.postgresql.base import DatabaseWrapper
 from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render
+from django.utils.cache import patch_vary_headers
 from django.views.generic import View
 from graphql import GraphQLDocument, get_default_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
@@ -25,7 +26,16 @@ from ..core.utils import is_valid_ipv4, is_valid_ipv6
 from ..webhook import observability
 from .api import API_PATH, schema
 from .context import get_context_value
-from .core.validators.query_cost import validate_query_cost
+from .core.document_cache import (
+    PERSISTED_QUERY_NOT_FOUND,
+    document_cache,
+    get_persisted_query,
+    get_query_cost,
+    get_query_hash,
+    get_validated_document,
+    query_cost_cache,
+)
+from .core.response_cache import get_cached_groups, get_response_cache_key
 from .query_cost_map import COST_MAP
 from .utils import format_error, query_fingerprint, query_identifier
 
@@ -137,6 +147,9 @@ class GraphQLView(View):
                 status=400,
             )
 
+        # Filled by `execute_graphql_request` with the response cache status of
+        # every operation: "HIT", "MISS" or None if it can't be cached.
+        request.response_cache_statuses = []  # type: ignore[attr-defined]
         if isinstance(data, list):
             responses = [self.get_response(request, entry) for entry in data]
             result: Union[list, Optional[dict]] = [
@@ -145,7 +158,12 @@ class GraphQLView(View):
             status_code = max((code for response, code in responses), default=200)
         else:
             result, status_code = self.get_response(request, data)
-        return JsonResponse(data=result, status=status_code, safe=False)
+        response = JsonResponse(data=result, status=status_code, safe=False)
+        set_response_cache_headers(
+            response,
+            request.response_cache_statuses,  # type: ignore[attr-defined]
+        )
+        return response
 
     def handle_query(self, request: HttpRequest) -> JsonResponse:
         tracer = opentracing.global_tracer()
@@ -227,13 +245,14 @@ class GraphQLView(View):
         return self.root_value
 
     def parse_query(
-        self, query: Optional[str]
+        self, query: Optional[str], query_hash: Optional[str] = None
     ) -> tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
         """Attempt to parse a query (mandatory) to a gql document object.
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
-        Otherwise, it returns the parsed gql document.
+        Otherwise, it returns the parsed gql document, reusing the cached one if
+        the same query was parsed before.
         """
         if not query or not isinstance(query, str):
             return (
@@ -246,7 +265,12 @@ class GraphQLView(View):
         # Attempt to parse the query, if it fails, return the error
         try:
             return (
-                self.backend.document_from_string(self.schema, query),
+                get_validated_document(
+                    self.backend,
+                    self.schema,
+                    query,
+                    query_hash or get_query_hash(query),
+                ),
                 None,
             )
         except (ValueError, GraphQLSyntaxError) as e:
@@ -276,8 +300,21 @@ class GraphQLView(View):
             )
 
             query, variables, operation_name = self.get_graphql_params(request, data)
+            self.add_response_cache_status(request)
+            query, persisted_query_error = get_persisted_query(
+                query, data.get("extensions")
+            )
+            if persisted_query_error:
+                # Unknown hashes are not an invalid request, the client is expected
+                # to send the query again with its hash.
+                return ExecutionResult(
+                    errors=[persisted_query_error],
+                    invalid=persisted_query_error.message != PERSISTED_QUERY_NOT_FOUND,
+                )
 
-            document, error = self.parse_query(query)
+            query_hash = get_query_hash(query) if isinstance(query, str) else None
+            document, error = self.parse_query(query, query_hash)
+            span.set_tag("graphql.document_cache_hit_rate", document_cache.hit_rate)
             with observability.report_gql_operation() as operation:
                 operation.query = document
                 operation.name = operation_name
@@ -296,14 +333,16 @@ class GraphQLView(View):
             except GraphQLError as e:
                 return ExecutionResult(errors=[e], invalid=True)
 
-            query_cost, cost_errors = validate_query_cost(
+            query_cost, cost_errors = get_query_cost(
                 schema,
                 document,
+                cast(str, query_hash),
                 variables,
                 COST_MAP,
                 settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
             )
             span.set_tag("graphql.query_cost", query_cost)
+            span.set_tag("graphql.query_cost_cache_hit_rate", query_cost_cache.hit_rate)
             if settings.GRAPHQL_QUERY_MAX_COMPLEXITY and cost_errors:
                 result = ExecutionResult(errors=cost_errors, invalid=True)
                 return set_query_cost_on_result(result, query_cost)
@@ -315,6 +354,25 @@ class GraphQLView(View):
                 # executor is not a valid argument in all backends
                 extra_options["executor"] = self.executor
 
+            response_cache_key = None
+            cached_groups = (
+                None
+                if query_contains_schema
+                else get_cached_groups(request, document, operation_name)
+            )
+            if cached_groups is not None:
+                response_cache_key = get_response_cache_key(
+                    request,
+                    cached_groups,
+                    cast(str, query_hash),
+                    operation_name,
+                    variables,
+                )
+                cached_response = cache.get(response_cache_key)
+                if cached_response is not None:
+                    self.set_response_cache_status(request, "HIT")
+                    return set_query_cost_on_result(cached_response, query_cost)
+
             context = get_context_value(request)
             if app := getattr(request, "app", None):
                 span.set_tag("app.id", app.id)
@@ -341,6 +399,13 @@ class GraphQLView(View):
                         )
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
+                        if response_cache_key and not response.errors:
+                            cache.set(
+                                response_cache_key,
+                                response,
+                                timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT,
+                            )
+                            self.set_response_cache_status(request, "MISS")
 
                     return set_query_cost_on_result(response, query_cost)
             except Exception as e:
@@ -353,6 +418,18 @@ class GraphQLView(View):
                     e = GraphQLError(str(e))
                 return ExecutionResult(errors=[e], invalid=True)
 
+    @staticmethod
+    def add_response_cache_status(request: HttpRequest):
+        statuses = getattr(request, "response_cache_statuses", None)
+        if statuses is not None:
+            statuses.append(None)
+
+    @staticmethod
+    def set_response_cache_status(request: HttpRequest, status: str):
+        statuses = getattr(request, "response_cache_statuses", None)
+        if statuses:
+            statuses[-1] = status
+
     @staticmethod
     def parse_body(request: HttpRequest):
         content_type = request.content_type
@@ -448,6 +525,25 @@ def generate_cache_key(raw_query: str) -> str:
     return f"{saleor_version}-{hashed_query}"
 
 
+def set_response_cache_headers(response: JsonResponse, statuses: list[Optional[str]]):
+    """Mark responses of cacheable operations served from the response cache.
+
+    Only the server-side cache is invalidated by writes, so clients and proxies
+    are told to revalidate the responses unless `GRAPHQL_RESPONSE_CACHE_PUBLIC`
+    is enabled.
+    """
+    patch_vary_headers(response, ["Authorization", "Authorization-Bearer"])
+    if not statuses or None in statuses or response.status_code != 200:
+        return
+    if settings.GRAPHQL_RESPONSE_CACHE_PUBLIC:
+        response[
+            "Cache-Control"
+        ] = f"public, max-age={settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT}"
+    else:
+        response["Cache-Control"] = "private, no-cache"
+    response["X-Cache"] = "HIT" if all(s == "HIT" for s in statuses) else "MISS"
+
+
 def set_query_cost_on_result(execution_result: ExecutionResult, query_cost):
     if settings.GRAPHQL_QUERY_MAX_COMPLEXITY:
         execution_result.extensions.update(
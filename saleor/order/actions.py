@@ -8,10 +8,10 @@ from uuid import UUID
 
 from django.contrib.sites.models import Site
 from django.db import transaction
-from django.db.models import F
+from django.db.models import Max
 from django.utils import timezone
 
-from ..account.events import refunded_balance_event
+from ..account import ledger
 from ..account.models import User
 from ..core.exceptions import AllocationError, InsufficientStock, InsufficientStockData
 from ..core.tracing import traced_atomic_transaction
@@ -28,8 +28,8 @@ from ..payment import (
 )
 from ..payment.interface import RefundData
 from ..payment.models import Payment, Transaction, TransactionItem
-from ..payment.utils import create_payment, create_payment_information, create_transaction_for_order
-from ..site.models import SiteStatistics
+from ..payment.utils import create_payment, create_transaction_for_order
+from ..site.statistics import increment_site_statistics_on_commit
 from ..warehouse.management import (
     deallocate_stock,
     deallocate_stock_for_order,
@@ -37,7 +37,7 @@ from ..warehouse.management import (
     get_order_lines_with_track_inventory,
     remove_reservations_for_order,
 )
-from ..warehouse.models import Stock
+from ..warehouse.models import Allocation, Stock
 from . import (
     FulfillmentLineData,
     FulfillmentStatus,
@@ -146,6 +146,44 @@ def order_confirmed(
         send_order_confirmed(order, user, app, manager)
 
 
+def confirm_order_paid_with_balance(order: "Order", user: User) -> bool:
+    """Spend the user's coins on the unconfirmed order and confirm it.
+
+    The order leaves the unconfirmed status by a conditional `UPDATE` in the same
+    transaction as the balance debit, so an order confirmed concurrently is paid
+    once. Return `False` when the order is not unconfirmed any more; raise
+    `ledger.InsufficientBalance` when the user cannot afford the order.
+    """
+    amount = order.total_net_amount
+    now = timezone.now()
+    with traced_atomic_transaction():
+        confirmed = Order.objects.filter(
+            pk=order.pk, status=OrderStatus.UNCONFIRMED
+        ).update(
+            status=OrderStatus.UNFULFILLED,
+            charge_status=ChargeStatus.FULLY_CHARGED,
+            total_charged_amount=amount,
+            display_gross_prices=order.display_gross_prices,
+            updated_at=now,
+        )
+        if not confirmed:
+            return False
+        ledger.debit(user, amount)
+        payment = order.get_last_payment()
+        if payment is not None:
+            Payment.objects.filter(pk=payment.pk).update(
+                charge_status=ChargeStatus.FULLY_CHARGED,
+                captured_amount=amount,
+                modified_at=now,
+            )
+        events.order_confirmed_event(order=order, user=user, app=None)
+    order.status = OrderStatus.UNFULFILLED
+    order.charge_status = ChargeStatus.FULLY_CHARGED
+    order.total_charged_amount = amount
+    order.updated_at = now
+    return True
+
+
 def handle_fully_paid_order(
     manager: "PluginsManager",
     order_info: "OrderInfo",
@@ -987,11 +1025,18 @@ def create_fulfillments(
                 notify_customer,
             )
         )
-        site = Site.objects.get_current()
-        SiteStatistics.objects.filter(site=site).update(
-            circulated_currency=F("circulated_currency") + order.total_net_amount,
-            circulated_items=F("circulated_items")
-            + sum([line.quantity for line in order.lines.iterator()]),
+        # Count the fulfilled lines from the input instead of querying the lines.
+        fulfilled_lines = [
+            (line["order_line"], line["quantity"])
+            for lines in fulfillment_lines_for_warehouses.values()
+            for line in lines
+        ]
+        increment_site_statistics_on_commit(
+            circulated_currency=sum(
+                line.unit_price_net_amount * quantity
+                for line, quantity in fulfilled_lines
+            ),
+            circulated_items=sum(quantity for _, quantity in fulfilled_lines),
         )
 
     return fulfillments
@@ -1629,57 +1674,80 @@ def create_fulfillments_for_returned_products(
         call_event(manager.order_updated, order)
     return return_fulfillment, replace_fulfillment, new_order
 
-def create_fulfillments_for_expired_orders(
-    order: "Order",
+def create_fulfillments_for_expired_orders_in_bulk(
+    orders: list["Order"],
     manager: "PluginsManager",
-):
-    with transaction_with_commit_on_errors():
-        order_lines_to_refund = [
-            OrderLineInfo(line, line.quantity) for line in order.lines.iterator()
-        ]
-        amount_total = 0
-        for line_info in order_lines_to_refund:
-            if (line_info.line.quantity_unfulfilled > 0):
-                amount_total += line_info.line.unit_price_gross_amount * line_info.line.quantity_unfulfilled
-        
-        print(f"order {order.created_at.strftime('%Y%m%d') + str(order.number).zfill(4)} amount {amount_total}")
-        if ((order.user is not None) and amount_total > 0):
-            payment = order.get_last_payment()
-            
-            refund_data = RefundData(
-                order_lines_to_refund=order_lines_to_refund,
-                fulfillment_lines_to_refund=[],
-                refund_shipping_costs=False,
-                refund_amount_is_automatically_calculated=False,
-            )
-            payment_data = create_payment_information(
-                payment=payment,
-                manager=manager,
-                customer_id=order.user.pk,
-                refund_data=refund_data,
-                payment_token="useless",
-            )
+) -> dict[UUID, Decimal]:
+    """Move the unfulfilled lines of the orders to a canceled fulfillment each.
 
-            gateway.refund(
-                payment,
-                manager,
-                amount=amount_total,
-                channel_slug=order.channel.slug,
-                refund_data=refund_data,
-                customer_id=order.user.pk,
-            )
-
-        fulfillment = Fulfillment.objects.create(
-            status=FulfillmentStatus.CANCELED,
-            order=order,
+    Lines, allocations and fulfillment numbers of all orders are fetched at once
+    and the fulfillments and their lines are inserted with `bulk_create`.
+    Return the gross amount of the moved lines per order ID, the amount to refund.
+    """
+    order_ids = [order.pk for order in orders]
+    lines = [
+        line
+        for line in OrderLine.objects.filter(order_id__in=order_ids).order_by("pk")
+        if line.quantity_unfulfilled > 0
+    ]
+    allocated_line_ids = set(
+        Allocation.objects.filter(order_line__in=lines).values_list(
+            "order_line_id", flat=True
         )
-        _move_order_lines_to_target_fulfillment(
-            order_lines_to_move=order_lines_to_refund,
-            target_fulfillment=fulfillment,
-            manager=manager,
+    )
+    last_fulfillment_orders = dict(
+        Fulfillment.objects.filter(order_id__in=order_ids)
+        .order_by()
+        .values("order_id")
+        .annotate(last=Max("fulfillment_order"))
+        .values_list("order_id", "last")
+    )
+
+    with traced_atomic_transaction():
+        fulfillments = Fulfillment.objects.bulk_create(
+            [
+                Fulfillment(
+                    order=order,
+                    status=FulfillmentStatus.CANCELED,
+                    fulfillment_order=last_fulfillment_orders.get(order.pk, 0) + 1,
+                )
+                for order in orders
+            ]
         )
+        fulfillment_by_order_id = {
+            fulfillment.order_id: fulfillment for fulfillment in fulfillments
+        }
+
+        amounts: dict[UUID, Decimal] = defaultdict(Decimal)
+        fulfillment_lines = []
+        lines_to_deallocate = []
+        for line in lines:
+            quantity = line.quantity_unfulfilled
+            amounts[line.order_id] += line.unit_price_gross_amount * quantity
+            fulfillment_lines.append(
+                FulfillmentLine(
+                    fulfillment=fulfillment_by_order_id[line.order_id],
+                    order_line_id=line.pk,
+                    stock_id=None,
+                    quantity=quantity,
+                )
+            )
+            line.quantity_fulfilled += quantity
+            if line.pk in allocated_line_ids:
+                lines_to_deallocate.append(OrderLineInfo(line=line, quantity=quantity))
+
+        if lines_to_deallocate:
+            try:
+                deallocate_stock(lines_to_deallocate, manager)
+            except AllocationError as e:
+                logger.warning(
+                    "Unable to deallocate stock for lines.",
+                    extra={"lines": [str(line.pk) for line in e.order_lines]},
+                )
+        FulfillmentLine.objects.bulk_create(fulfillment_lines)
+        OrderLine.objects.bulk_update(lines, ["quantity_fulfilled"])
+    return amounts
 
-        return fulfillment
 
 def _calculate_refund_amount(
     return_order_lines: list[OrderLineInfo],
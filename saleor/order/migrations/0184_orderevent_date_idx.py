@@ -0,0 +1,24 @@
+# Generated by Django 3.2.24 on 2026-10-17 12:00
+
+from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("order", "0183_alter_order_number"),
+    ]
+
+    atomic = False
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="orderevent",
+            options={"ordering": ("date", "pk")},
+        ),
+        AddIndexConcurrently(
+            model_name="orderevent",
+            index=BTreeIndex(fields=["date", "id"], name="orderevent_date_idx"),
+        ),
+    ]
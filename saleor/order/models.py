@@ -839,9 +839,10 @@ class OrderEvent(models.Model):
     )
 
     class Meta:
-        ordering = ("date",)
+        ordering = ("date", "pk")
         indexes = [
-            BTreeIndex(fields=["related"], name="order_orderevent_related_id_idx")
+            BTreeIndex(fields=["related"], name="order_orderevent_related_id_idx"),
+            BTreeIndex(fields=["date", "id"], name="orderevent_date_idx"),
         ]
 
     def __repr__(self):
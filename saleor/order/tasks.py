@@ -1,10 +1,13 @@
 import logging
 from datetime import timedelta
+from decimal import Decimal
+from typing import Optional
 
-from django.db.models import Exists, F, Func, OuterRef, Subquery, Value
+from django.core.cache import cache
+from django.db.models import Exists, F, Func, OuterRef, Q, Subquery, Value
 from django.utils import timezone
 
-from saleor.order.actions import create_fulfillments_for_expired_orders
+from saleor.order.actions import create_fulfillments_for_expired_orders_in_bulk
 from saleor.payment import ChargeStatus
 
 from ..celeryconf import app
@@ -13,10 +16,15 @@ from ..core.tracing import traced_atomic_transaction
 from ..core.utils.events import call_event
 from ..discount.models import Voucher, VoucherCode, VoucherCustomer
 from ..payment.gateway import _fetch_gateway_response
+from ..payment.gateways.balance import PLUGIN_ID as BALANCE_PLUGIN_ID
+from ..payment.gateways.balance import refund_payments as refund_balance_payments
 from ..payment.models import Payment, TransactionItem
 from ..payment.utils import create_payment_information
 from ..plugins.manager import get_plugins_manager
-from ..warehouse.management import deallocate_stock_for_orders, remove_reservations_for_order
+from ..warehouse.management import (
+    deallocate_stock_for_orders,
+    remove_reservations_for_orders,
+)
 from . import OrderChargeStatus, OrderEvents, OrderStatus
 from .models import Order, OrderEvent
 from .utils import invalidate_order_prices
@@ -25,6 +33,10 @@ logger = logging.getLogger(__name__)
 
 # Batch size of 100 is about ~1MB of memory usage in task
 EXPIRE_ORDER_BATCH_SIZE = 100
+# Batches of each kind of order dispatched by a single run of the task
+EXPIRE_ORDER_MAX_BATCHES = 200
+EXPIRE_ORDER_CHECKPOINT_KEY = "expire_orders_checkpoint"
+EXPIRE_ORDER_CHECKPOINT_TIMEOUT = 60 * 60
 
 # Batch size of 5000 is about ~5MB of memory usage in task
 # It takes +/- 8 secs to delete 5000 orders
@@ -94,31 +106,93 @@ def _order_expired_events(order_ids):
     )
 
 
-def _expire_orders(manager, now):
+def _get_expirable_channels(now):
     time_diff_func_in_minutes = (
         (
             Func(Value("day"), now - OuterRef("created_at"), function="DATE_PART") * 24
             + Func(Value("hour"), now - OuterRef("created_at"), function="DATE_PART")
-        ) * 60
+        )
+        * 60
     ) + Func(Value("minute"), now - OuterRef("created_at"), function="DATE_PART")
 
-    channels = Channel.objects.filter(
+    return Channel.objects.filter(
         id=OuterRef("channel"),
         expire_orders_after__isnull=False,
         expire_orders_after__gt=0,
         expire_orders_after__lte=time_diff_func_in_minutes,
     )
 
-    # 未支付订单
-    qs = Order.objects.filter(
-        Exists(channels),
-        charge_status__in=[ChargeStatus.NOT_CHARGED, OrderChargeStatus.NONE],
-        status__in=[OrderStatus.UNCONFIRMED],
+
+# 未支付订单
+UNPAID_ORDERS_LOOKUP = Q(
+    charge_status__in=[ChargeStatus.NOT_CHARGED, OrderChargeStatus.NONE],
+    status__in=[OrderStatus.UNCONFIRMED],
+)
+# 已支付未交付订单
+PAID_ORDERS_LOOKUP = (
+    Q(
+        status__in=[
+            OrderStatus.UNCONFIRMED,
+            OrderStatus.UNFULFILLED,
+            OrderStatus.PARTIALLY_FULFILLED,
+        ]
     )
-    ids_batch = list(qs.values_list("pk", flat=True)[:EXPIRE_ORDER_BATCH_SIZE])
+    & ~UNPAID_ORDERS_LOOKUP
+)
 
-    logger.warning(f"expired order (unpaid): {len(ids_batch)}")
+
+def _lock_orders(qs):
+    """Lock the orders, skipping the ones locked by a concurrent batch."""
+    return qs.select_for_update(of=("self",), skip_locked=True).order_by("pk")
+
+
+def _dispatch_order_batches(qs, task, after) -> Optional[str]:
+    """Dispatch the task for batches of the orders following the checkpoint.
+
+    Orders are paginated by the primary key. Return the checkpoint to resume
+    from in the next run, or `None` when all the orders were dispatched.
+    """
+    qs = qs.order_by("pk")
+    for _ in range(EXPIRE_ORDER_MAX_BATCHES):
+        page = qs.filter(pk__gt=after) if after else qs
+        ids = [
+            str(pk)
+            for pk in page.values_list("pk", flat=True)[:EXPIRE_ORDER_BATCH_SIZE]
+        ]
+        if ids:
+            task.delay(ids)
+        if len(ids) < EXPIRE_ORDER_BATCH_SIZE:
+            return None
+        after = ids[-1]
+    return after
+
+
+def _refund_expired_orders(orders: list[Order], amounts: dict):
+    """Return the coins paid for the canceled lines of the orders in one batch."""
+    refunds = []
+    for order in orders:
+        payment = order.get_last_payment()
+        if order.user_id is None or payment is None:
+            continue
+        if payment.gateway != BALANCE_PLUGIN_ID:
+            # Only coins are refunded here, other payments are refunded manually.
+            logger.warning(f"Order {order.pk} was not paid with the balance.")
+            continue
+        amount = min(amounts.get(order.pk, Decimal(0)), payment.captured_amount)
+        if amount > 0:
+            refunds.append((payment, amount))
+    refund_balance_payments(refunds)
+
+
+def _expire_unpaid_orders(order_ids, manager, now):
     with traced_atomic_transaction():
+        ids_batch = list(
+            _lock_orders(
+                Order.objects.filter(UNPAID_ORDERS_LOOKUP, id__in=order_ids)
+            ).values_list("pk", flat=True)
+        )
+        if not ids_batch:
+            return
         _bulk_release_voucher_usage(ids_batch)
         _order_expired_events(ids_batch)
         deallocate_stock_for_orders(ids_batch, manager)
@@ -126,43 +200,77 @@ def _expire_orders(manager, now):
         Order.objects.filter(id__in=ids_batch).update(
             status=OrderStatus.EXPIRED, expired_at=now
         )
+    logger.warning(f"expired order (unpaid): {len(ids_batch)}")
 
-    # 已支付未交付订单
-    qs = Order.objects.filter(
-        Exists(channels),
-        status__in=[OrderStatus.UNCONFIRMED, OrderStatus.UNFULFILLED, OrderStatus.PARTIALLY_FULFILLED],
-    )
-    orders = list(qs.all())
-    logger.warning(f"expired order count: {len(orders)}")
-    for order in orders:
-        try:
-            with traced_atomic_transaction():
-                remove_reservations_for_order(order=order)
-                create_fulfillments_for_expired_orders(order, manager)
-                order.status = OrderStatus.EXPIRED
-                order.expired_at = timezone.now()
-                order.save(update_fields=["status", "updated_at"])
-                OrderEvent.objects.create(
-                    order=order,
-                    type=OrderEvents.EXPIRED,
-                )
-        except Exception as e:
-            logger.error(e)
-        # Order.objects.filter(id__in=ids_batch).update(
-        #     status=OrderStatus.EXPIRED, expired_at=now
-        # )
-        # _bulk_release_voucher_usage(ids_batch)
-        # _order_expired_events(ids_batch)
-        # deallocate_stock_for_orders(ids_batch, manager)
-        # _call_expired_order_events(ids_batch, manager)
+
+def _expire_paid_orders(order_ids, manager, now):
+    with traced_atomic_transaction():
+        orders = list(
+            _lock_orders(
+                Order.objects.filter(PAID_ORDERS_LOOKUP, id__in=order_ids)
+            ).prefetch_related("payments")
+        )
+        if not orders:
+            return
+        ids_batch = [order.pk for order in orders]
+        remove_reservations_for_orders(ids_batch)
+        amounts = create_fulfillments_for_expired_orders_in_bulk(orders, manager)
+        _refund_expired_orders(orders, amounts)
+        Order.objects.filter(id__in=ids_batch).update(
+            status=OrderStatus.EXPIRED, expired_at=now, updated_at=now
+        )
+        _order_expired_events(ids_batch)
+    logger.warning(f"expired order count: {len(ids_batch)}")
+
+
+@app.task
+def expire_unpaid_orders_task(order_ids: list[str]):
+    manager = get_plugins_manager(allow_replica=False)
+    _expire_unpaid_orders(order_ids, manager, timezone.now())
+
+
+@app.task
+def expire_paid_orders_task(order_ids: list[str]):
+    manager = get_plugins_manager(allow_replica=False)
+    now = timezone.now()
+    try:
+        _expire_paid_orders(order_ids, manager, now)
+    except Exception:
+        # Expire the orders one by one, so a broken order does not block the others.
+        logger.exception("Failed to expire a batch of orders.")
+        for order_id in order_ids:
+            try:
+                _expire_paid_orders([order_id], manager, now)
+            except Exception as e:
+                logger.error(e)
 
 
 @app.task
 def expire_orders_task():
+    """Dispatch batches of the orders to expire to parallel sub-tasks.
+
+    A run dispatches at most `EXPIRE_ORDER_MAX_BATCHES` batches of each kind of
+    order; the following runs continue from the checkpoint kept in the cache.
+    Batches dispatched twice are harmless, as the sub-tasks skip locked and
+    already expired orders.
+    """
     logger.warning(f"===expire_orders_task===")
     now = timezone.now()
-    manager = get_plugins_manager(allow_replica=False)
-    _expire_orders(manager, now)
+    channels = _get_expirable_channels(now)
+    checkpoint = cache.get(EXPIRE_ORDER_CHECKPOINT_KEY) or {}
+    checkpoint = {
+        "unpaid": _dispatch_order_batches(
+            Order.objects.filter(UNPAID_ORDERS_LOOKUP, Exists(channels)),
+            expire_unpaid_orders_task,
+            checkpoint.get("unpaid"),
+        ),
+        "paid": _dispatch_order_batches(
+            Order.objects.filter(PAID_ORDERS_LOOKUP, Exists(channels)),
+            expire_paid_orders_task,
+            checkpoint.get("paid"),
+        ),
+    }
+    cache.set(EXPIRE_ORDER_CHECKPOINT_KEY, checkpoint, EXPIRE_ORDER_CHECKPOINT_TIMEOUT)
 
 
 # @app.task
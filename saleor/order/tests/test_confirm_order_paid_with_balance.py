@@ -0,0 +1,181 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...account import BalanceEvents, ledger
+from ...account.models import BalanceEvent, User
+from ...core.models import MonthlySequence
+from .. import OrderEvents, OrderOrigin, OrderStatus
+from ..actions import confirm_order_paid_with_balance
+from ..models import Order, OrderEvent
+
+
+@pytest.fixture
+def unconfirmed_orders(customer_user, channel_USD):
+    customer_user.balance = Decimal(100)
+    customer_user.save(update_fields=["balance"])
+    return Order.objects.bulk_create(
+        [
+            Order(
+                channel=channel_USD,
+                user=customer_user,
+                user_email=customer_user.email,
+                status=OrderStatus.UNCONFIRMED,
+                origin=OrderOrigin.CHECKOUT,
+                total_net_amount=Decimal(7),
+                total_gross_amount=Decimal(7),
+                currency=channel_USD.currency_code,
+            )
+            for _ in range(40)
+        ]
+    )
+
+
+def _confirm(order_ids, user_id):
+    confirmed = 0
+    try:
+        user = User.objects.get(pk=user_id)
+        for order in Order.objects.filter(pk__in=order_ids):
+            try:
+                confirmed += confirm_order_paid_with_balance(order, user)
+            except ledger.InsufficientBalance:
+                pass
+    finally:
+        connection.close()
+    return confirmed
+
+
+def test_confirm_order_paid_with_balance(unconfirmed_orders, customer_user):
+    # given
+    order = unconfirmed_orders[0]
+
+    # when
+    confirmed = confirm_order_paid_with_balance(order, customer_user)
+
+    # then
+    assert confirmed
+    order.refresh_from_db()
+    assert order.status == OrderStatus.UNFULFILLED
+    assert order.total_charged_amount == Decimal(7)
+    customer_user.refresh_from_db()
+    assert customer_user.balance == Decimal(93)
+    assert OrderEvent.objects.filter(order=order, type=OrderEvents.CONFIRMED).exists()
+
+    # an order confirmed before is not paid again
+    assert not confirm_order_paid_with_balance(order, customer_user)
+    customer_user.refresh_from_db()
+    assert customer_user.balance == Decimal(93)
+
+
+def test_confirm_order_paid_with_insufficient_balance(
+    unconfirmed_orders, customer_user
+):
+    # given
+    order = unconfirmed_orders[0]
+    customer_user.balance = Decimal(6)
+    customer_user.save(update_fields=["balance"])
+
+    # when
+    with pytest.raises(ledger.InsufficientBalance):
+        confirm_order_paid_with_balance(order, customer_user)
+
+    # then
+    order.refresh_from_db()
+    assert order.status == OrderStatus.UNCONFIRMED
+    assert not BalanceEvent.objects.filter(type=BalanceEvents.CONSUMED).exists()
+
+
+@pytest.mark.usefixtures("_monthly_sequences")
+def test_debit_does_not_lock_monthly_sequences(customer_user):
+    # given
+    customer_user.balance = Decimal(10)
+    customer_user.save(update_fields=["balance"])
+    table = MonthlySequence._meta.db_table
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        event = ledger.debit(customer_user, Decimal(7))
+
+    # then
+    assert event.number
+    # Numbers come from the database sequence, so concurrent debits never wait
+    # for the lock of a counter row.
+    assert not [
+        query["sql"]
+        for query in queries
+        if table in query["sql"]
+        and query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_confirms_never_overdraw(unconfirmed_orders, customer_user):
+    # given
+    workers = 8
+    order_ids = [order.pk for order in unconfirmed_orders]
+    # Every order is confirmed by two workers at the same time.
+    chunks = [order_ids[i % (workers // 2) :: workers // 2] for i in range(workers)]
+
+    # when
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = [
+            executor.submit(_confirm, chunk, customer_user.pk) for chunk in chunks
+        ]
+        confirmed = sum(result.result() for result in results)
+
+    # then
+    customer_user.refresh_from_db()
+    assert confirmed == 14
+    assert customer_user.balance == Decimal(100) - 14 * Decimal(7)
+    assert Order.objects.filter(status=OrderStatus.UNFULFILLED).count() == confirmed
+    consumed = BalanceEvent.objects.filter(
+        user=customer_user, type=BalanceEvents.CONSUMED
+    )
+    assert consumed.count() == confirmed
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_confirms_throughput(customer_user, channel_USD, record_property):
+    # given
+    workers = 8
+    orders_count = 800
+    customer_user.balance = Decimal(orders_count)
+    customer_user.save(update_fields=["balance"])
+    orders = Order.objects.bulk_create(
+        [
+            Order(
+                channel=channel_USD,
+                user=customer_user,
+                user_email=customer_user.email,
+                status=OrderStatus.UNCONFIRMED,
+                origin=OrderOrigin.CHECKOUT,
+                total_net_amount=Decimal(1),
+                total_gross_amount=Decimal(1),
+                currency=channel_USD.currency_code,
+            )
+            for _ in range(orders_count)
+        ]
+    )
+    order_ids = [order.pk for order in orders]
+    # All workers debit the balance of the same customer.
+    chunks = [order_ids[i::workers] for i in range(workers)]
+
+    # when
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = [
+            executor.submit(_confirm, chunk, customer_user.pk) for chunk in chunks
+        ]
+        confirmed = sum(result.result() for result in results)
+    elapsed = time.perf_counter() - started_at
+
+    # then
+    record_property("confirms_per_second", round(confirmed / elapsed))
+    assert confirmed == orders_count
+    customer_user.refresh_from_db()
+    assert customer_user.balance == Decimal(0)
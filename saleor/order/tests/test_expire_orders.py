@@ -0,0 +1,211 @@
+import math
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ...account import BalanceEvents
+from ...account.models import BalanceEvent
+from ...payment import ChargeStatus, TransactionKind
+from ...payment.gateways.balance import PLUGIN_ID as BALANCE_PLUGIN_ID
+from .. import FulfillmentStatus, OrderEvents, OrderOrigin, OrderStatus
+from ..models import Order, OrderEvent, OrderLine
+from ..tasks import (
+    EXPIRE_ORDER_BATCH_SIZE,
+    EXPIRE_ORDER_CHECKPOINT_KEY,
+    expire_orders_task,
+    expire_paid_orders_task,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_checkpoint():
+    cache.delete(EXPIRE_ORDER_CHECKPOINT_KEY)
+
+
+@pytest.fixture
+def paid_order(order_with_lines, payment_dummy, channel_USD):
+    channel_USD.expire_orders_after = 1
+    channel_USD.save(update_fields=["expire_orders_after"])
+
+    order = order_with_lines
+    order.status = OrderStatus.UNFULFILLED
+    order.charge_status = ChargeStatus.FULLY_CHARGED
+    order.created_at = timezone.now() - timezone.timedelta(minutes=10)
+    order.save(update_fields=["status", "charge_status", "created_at"])
+    payment_dummy.gateway = BALANCE_PLUGIN_ID
+    payment_dummy.charge_status = ChargeStatus.FULLY_CHARGED
+    payment_dummy.captured_amount = payment_dummy.total
+    payment_dummy.save(update_fields=["gateway", "charge_status", "captured_amount"])
+    return order
+
+
+def test_expire_orders_task_paid_order(paid_order, payment_dummy):
+    # given
+    user = paid_order.user
+    balance = user.balance
+    line = paid_order.lines.first()
+    line.quantity_fulfilled = 1
+    line.save(update_fields=["quantity_fulfilled"])
+    refund = sum(
+        line.unit_price_gross_amount * line.quantity_unfulfilled
+        for line in paid_order.lines.all()
+    )
+
+    # when
+    expire_orders_task()
+
+    # then
+    paid_order.refresh_from_db()
+    assert paid_order.status == OrderStatus.EXPIRED
+    assert paid_order.expired_at is not None
+    assert not any(line.quantity_unfulfilled for line in paid_order.lines.all())
+
+    fulfillment = paid_order.fulfillments.get()
+    assert fulfillment.status == FulfillmentStatus.CANCELED
+    assert fulfillment.fulfillment_order == 1
+    assert (
+        sum(line.quantity for line in fulfillment.lines.all())
+        == sum(line.quantity for line in paid_order.lines.all()) - 1
+    )
+
+    user.refresh_from_db()
+    assert user.balance == balance + refund
+    event = BalanceEvent.objects.get(user=user, type=BalanceEvents.REFUNDED)
+    assert event.delta == refund
+
+    payment_dummy.refresh_from_db()
+    assert payment_dummy.captured_amount == payment_dummy.total - refund
+    assert payment_dummy.charge_status == ChargeStatus.PARTIALLY_REFUNDED
+    assert paid_order.total_charged_amount == payment_dummy.captured_amount
+    transaction = payment_dummy.transactions.get(kind=TransactionKind.REFUND)
+    assert transaction.amount == refund
+    assert OrderEvent.objects.filter(
+        order=paid_order, type=OrderEvents.EXPIRED
+    ).exists()
+
+
+def test_expire_orders_task_does_not_refund_other_gateways(paid_order, payment_dummy):
+    # given
+    payment_dummy.gateway = "mirumee.payments.dummy"
+    payment_dummy.save(update_fields=["gateway"])
+
+    # when
+    expire_orders_task()
+
+    # then
+    paid_order.refresh_from_db()
+    assert paid_order.status == OrderStatus.EXPIRED
+    assert not BalanceEvent.objects.filter(type=BalanceEvents.REFUNDED).exists()
+    payment_dummy.refresh_from_db()
+    assert payment_dummy.captured_amount == payment_dummy.total
+
+
+def test_expire_orders_task_skips_already_expired_orders(paid_order):
+    # given
+    expire_orders_task()
+
+    # when
+    expire_orders_task()
+
+    # then
+    assert paid_order.fulfillments.count() == 1
+    assert BalanceEvent.objects.filter(type=BalanceEvents.REFUNDED).count() == 1
+
+
+@patch("saleor.order.tasks.EXPIRE_ORDER_MAX_BATCHES", 1)
+@patch("saleor.order.tasks.expire_paid_orders_task.delay")
+def test_expire_orders_task_resumes_from_checkpoint(
+    mocked_delay, paid_order, channel_USD
+):
+    # given
+    Order.objects.bulk_create(
+        [
+            Order(
+                channel=channel_USD,
+                status=OrderStatus.UNFULFILLED,
+                charge_status=ChargeStatus.FULLY_CHARGED,
+                created_at=paid_order.created_at,
+                user_email="test@example.com",
+                origin=OrderOrigin.CHECKOUT,
+            )
+            for _ in range(EXPIRE_ORDER_BATCH_SIZE)
+        ]
+    )
+
+    # when
+    expire_orders_task()
+    expire_orders_task()
+    expire_orders_task()
+
+    # then
+    dispatched = [call.args[0] for call in mocked_delay.call_args_list]
+    assert [len(ids) for ids in dispatched] == [
+        EXPIRE_ORDER_BATCH_SIZE,
+        1,
+        EXPIRE_ORDER_BATCH_SIZE,
+    ]
+    assert sorted(dispatched[0] + dispatched[1]) == sorted(
+        str(pk) for pk in Order.objects.values_list("pk", flat=True)
+    )
+    assert cache.get(EXPIRE_ORDER_CHECKPOINT_KEY)["paid"] is not None
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_expire_orders_task_throughput(paid_order, channel_USD):
+    # given
+    orders_count = 2000
+    lines = list(paid_order.lines.all())
+    orders = Order.objects.bulk_create(
+        [
+            Order(
+                channel=channel_USD,
+                user=paid_order.user,
+                status=OrderStatus.UNFULFILLED,
+                charge_status=ChargeStatus.FULLY_CHARGED,
+                created_at=paid_order.created_at,
+                user_email=paid_order.user_email,
+                origin=OrderOrigin.CHECKOUT,
+            )
+            for _ in range(orders_count)
+        ]
+    )
+    OrderLine.objects.bulk_create(
+        [
+            OrderLine(
+                order=order,
+                product_name=line.product_name,
+                variant_name=line.variant_name,
+                product_sku=line.product_sku,
+                is_shipping_required=line.is_shipping_required,
+                is_gift_card=line.is_gift_card,
+                quantity=line.quantity,
+                unit_price_gross_amount=line.unit_price_gross_amount,
+                unit_price_net_amount=line.unit_price_net_amount,
+                total_price_gross_amount=line.total_price_gross_amount,
+                total_price_net_amount=line.total_price_net_amount,
+                currency=line.currency,
+            )
+            for order in orders
+            for line in lines
+        ]
+    )
+
+    # when
+    with patch(
+        "saleor.order.tasks.expire_paid_orders_task.delay",
+        wraps=expire_paid_orders_task.delay,
+    ) as delay_mock, CaptureQueriesContext(connection) as queries:
+        expire_orders_task()
+
+    # then
+    assert not Order.objects.exclude(status=OrderStatus.EXPIRED).exists()
+    assert delay_mock.call_count == math.ceil(
+        (orders_count + 1) / EXPIRE_ORDER_BATCH_SIZE
+    )
+    # Orders are expired in bulk, the queries don't grow with every order.
+    assert len(queries) < orders_count / 2
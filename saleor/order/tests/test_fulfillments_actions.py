@@ -1,10 +1,15 @@
+from decimal import ROUND_FLOOR
 from unittest.mock import patch
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from ...core.exceptions import InsufficientStock
 from ...order import OrderEvents
 from ...plugins.manager import get_plugins_manager
+from ...site.statistics import get_pending_increments
 from ...tests.utils import flush_post_commit_hooks
 from ...warehouse.models import Allocation, Stock
 from ..actions import create_fulfillments
@@ -748,3 +753,54 @@ def test_create_fulfillments_quantity_allocated_lower_than_line_quantity(
     mock_email_fulfillment.assert_called_once_with(
         order, order.fulfillments.get(), staff_user, None, manager
     )
+
+
+@patch("saleor.order.actions.send_fulfillment_confirmation_to_customer", autospec=True)
+def test_create_fulfillments_counts_site_statistics_after_commit(
+    mock_email_fulfillment,
+    staff_user,
+    order_with_lines,
+    warehouse,
+    site_settings,
+):
+    # given
+    cache.clear()
+    order = order_with_lines
+    order_line1, order_line2 = order.lines.all()
+    fulfillment_lines_for_warehouses = {
+        warehouse.pk: [
+            {"order_line": order_line1, "quantity": 3},
+            {"order_line": order_line2, "quantity": 2},
+        ]
+    }
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        create_fulfillments(
+            staff_user,
+            None,
+            order,
+            fulfillment_lines_for_warehouses,
+            manager,
+            site_settings,
+            True,
+        )
+
+    # then
+    assert not any(
+        "site_sitestatistics" in query["sql"] for query in queries.captured_queries
+    )
+    pending = get_pending_increments(site_settings.site_id)
+    assert pending["circulated_items"] == 0
+
+    flush_post_commit_hooks()
+    pending = get_pending_increments(site_settings.site_id)
+    assert pending["circulated_items"] == 5
+    currency = (
+        order_line1.unit_price_net_amount * 3 + order_line2.unit_price_net_amount * 2
+    )
+    assert pending["circulated_currency"] == currency.to_integral_value(
+        rounding=ROUND_FLOOR
+    )
+    cache.clear()
@@ -1,17 +1,23 @@
 from ast import Store
 import uuid
+from collections.abc import Iterable
+from decimal import Decimal
 
 from django.db import transaction
+from django.utils import timezone
 
-from saleor.graphql.payment.mutations import stored_payment_methods
 from saleor.order import OrderStatus
-from ... import ChargeStatus, StorePaymentMethod, TransactionKind
+from ... import ChargeStatus, PaymentError, StorePaymentMethod, TransactionKind
 from ...interface import GatewayConfig, GatewayResponse, PaymentData, PaymentMethodInfo
+from ....account import BalanceEvents, ledger
 from ....account.models import User
 from ....order.models import Order
-from ....payment.models import Payment
+from ....order.utils import update_order_charge_data
+from ....payment.models import Payment, Transaction
 from ....payment import ChargeStatus
 
+PLUGIN_ID = "aixinwu.payments.balance"
+
 
 def dummy_success():
     return True
@@ -27,7 +33,9 @@ def process_payment(
     amount = payment_information.amount
     with transaction.atomic():
         user = User.objects.get(pk=payment_information.customer_id)
-        if user.balance < amount:
+        try:
+            ledger.debit(user, amount)
+        except ledger.InsufficientBalance:
             return GatewayResponse(
                 is_success=False,
                 action_required=False,
@@ -39,20 +47,18 @@ def process_payment(
                 raw_response={"error": "Insufficient funds"},
             )
         else:
-            user.balance -= amount
-            user.save()
             order = Order.objects.get(pk=payment_information.order_id)
             order.status = OrderStatus.FULFILLED
             order.save()
             payment = Payment.objects.create(
-                gateway="AXB",
+                gateway=PLUGIN_ID,
                 currency="AXB",
                 charge_status=ChargeStatus.FULLY_CHARGED,
                 total=payment_information.amount,
                 checkout=None,
                 order=order,
                 stored_payment_methods=StorePaymentMethod.OFF_SESSION,
-                captured_amount=payment_information.amount
+                captured_amount=payment_information.amount,
             )
             return GatewayResponse(
                 is_success=True,
@@ -64,3 +70,88 @@ def process_payment(
                 error=None,
                 raw_response={"status": "ok"},
             )
+
+
+def refund_payments(refunds: Iterable[tuple[Payment, Decimal]]) -> list[Transaction]:
+    """Refund the amounts of many payments to the balances of their customers.
+
+    The payments are locked and every customer is credited once with the total
+    of their refunds, while a balance event is recorded for every refund. The
+    payments are updated and the refund transactions inserted with bulk queries,
+    and so are the charged amounts and charge statuses of their orders.
+    """
+    amounts: dict[int, Decimal] = {}
+    for payment, amount in refunds:
+        if amount <= 0:
+            raise PaymentError("Amount should be a positive number.")
+        amounts[payment.pk] = amounts.get(payment.pk, Decimal(0)) + amount
+    if not amounts:
+        return []
+
+    with transaction.atomic():
+        payments = (
+            Payment.objects.select_for_update(of=("self",))
+            .filter(pk__in=amounts.keys())
+            .select_related("order")
+            .order_by("pk")
+        )
+        now = timezone.now()
+        postings, transactions = [], []
+        for payment in payments:
+            amount = amounts[payment.pk]
+            if payment.gateway != PLUGIN_ID:
+                raise PaymentError("Only balance payments can be refunded.")
+            if amount > payment.captured_amount:
+                raise PaymentError("Cannot refund more than captured.")
+            if payment.order is None or payment.order.user_id is None:
+                raise PaymentError("Cannot refund a payment without a customer.")
+            payment.captured_amount -= amount
+            payment.modified_at = now
+            payment.charge_status = ChargeStatus.PARTIALLY_REFUNDED
+            if payment.captured_amount <= 0:
+                payment.captured_amount = Decimal("0.0")
+                payment.charge_status = ChargeStatus.FULLY_REFUNDED
+                payment.is_active = False
+            postings.append(
+                ledger.Posting(
+                    user_id=payment.order.user_id,
+                    delta=amount,
+                    type=BalanceEvents.REFUNDED,
+                )
+            )
+            transactions.append(
+                Transaction(
+                    payment=payment,
+                    kind=TransactionKind.REFUND,
+                    is_success=True,
+                    currency=payment.currency,
+                    amount=amount,
+                    customer_id=str(payment.order.user_id),
+                    token=get_client_token(),
+                    gateway_response={"status": "ok"},
+                )
+            )
+        if len(transactions) != len(amounts):
+            raise PaymentError("Payment does not exist.")
+        ledger.post_many(postings)
+        Payment.objects.bulk_update(
+            [txn.payment for txn in transactions],
+            ["captured_amount", "charge_status", "is_active", "modified_at"],
+        )
+        transactions = Transaction.objects.bulk_create(transactions)
+        orders = Order.objects.filter(
+            pk__in={txn.payment.order_id for txn in transactions}
+        ).prefetch_related("payments", "payment_transactions", "granted_refunds")
+        for order in orders:
+            update_order_charge_data(
+                order,
+                order_payments=order.payments.all(),
+                order_transactions=order.payment_transactions.all(),
+                order_granted_refunds=order.granted_refunds.all(),
+                with_save=False,
+            )
+            order.updated_at = now
+        Order.objects.bulk_update(
+            orders, ["total_charged_amount", "charge_status", "updated_at"]
+        )
+        return transactions
@@ -1,12 +1,13 @@
 from typing import TYPE_CHECKING
 from django.db import transaction
-from saleor.account.events import refunded_balance_event
+from saleor.account import BalanceEvents, ledger
 from saleor.account.models import User
 from saleor.payment import TransactionKind
 from saleor.plugins.base_plugin import BasePlugin, ConfigurationTypeField
 
 from ..utils import get_supported_currencies
 from . import (
+    PLUGIN_ID,
     GatewayConfig,
     get_client_token,
     process_payment,
@@ -18,7 +19,7 @@ from ...interface import GatewayResponse, PaymentData, TokenConfig
 
 
 class BalanceGatewayPlugin(BasePlugin):
-    PLUGIN_ID = "aixinwu.payments.balance"
+    PLUGIN_ID = PLUGIN_ID
     PLUGIN_NAME = GATEWAY_NAME
     DEFAULT_ACTIVE = False
     DEFAULT_CONFIGURATION = [
@@ -80,9 +81,7 @@ class BalanceGatewayPlugin(BasePlugin):
         amount = payment_information.amount
         with transaction.atomic():
             user = User.objects.get(pk=payment_information.customer_id)
-            user.balance += amount
-            user.save()
-            refunded_balance_event(user=user, amount=amount)
+            ledger.post(user, amount, BalanceEvents.REFUNDED)
             return GatewayResponse(
                 is_success=True,
                 action_required=False,
@@ -93,7 +92,6 @@ class BalanceGatewayPlugin(BasePlugin):
                 error=None,
                 raw_response={"status": "ok"},
             )
-        
 
     def void_payment(
         self, payment_information: "PaymentData", previous_value
@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .....account import BalanceEvents, ledger
+from .....account.models import BalanceEvent, User
+from .....order import OrderChargeStatus
+from .... import ChargeStatus, PaymentError, TransactionKind
+from ....models import Payment
+from .. import PLUGIN_ID, refund_payments
+
+
+def _create_payment(order, amount):
+    return Payment.objects.create(
+        gateway=PLUGIN_ID,
+        order=order,
+        is_active=True,
+        charge_status=ChargeStatus.FULLY_CHARGED,
+        total=amount,
+        captured_amount=amount,
+        currency="AXB",
+    )
+
+
+@pytest.fixture
+def balance_payments(order_list):
+    return [_create_payment(order, Decimal(10)) for order in order_list]
+
+
+def test_refund_payments(balance_payments, customer_user, _monthly_sequences):
+    # given
+    customer_user.balance = Decimal(5)
+    customer_user.save(update_fields=["balance"])
+    first, second, third = balance_payments
+
+    # when
+    with CaptureQueriesContext(connection) as single_refund:
+        transactions = refund_payments([(first, Decimal(10))])
+    with CaptureQueriesContext(connection) as batch_refund:
+        transactions += refund_payments([(second, Decimal(4)), (third, Decimal(6))])
+
+    # then
+    assert len(batch_refund) == len(single_refund)
+    customer_user.refresh_from_db()
+    assert customer_user.balance == Decimal(25)
+    events = BalanceEvent.objects.filter(
+        user=customer_user, type=BalanceEvents.REFUNDED
+    ).order_by("pk")
+    assert [event.balance for event in events] == [
+        Decimal(15),
+        Decimal(19),
+        Decimal(25),
+    ]
+
+    assert [txn.kind for txn in transactions] == [TransactionKind.REFUND] * 3
+    for payment in balance_payments:
+        payment.refresh_from_db()
+    assert first.charge_status == ChargeStatus.FULLY_REFUNDED
+    assert not first.is_active
+    assert second.charge_status == ChargeStatus.PARTIALLY_REFUNDED
+    assert second.captured_amount == Decimal(6)
+    assert third.captured_amount == Decimal(4)
+
+
+def test_refund_payments_more_than_captured(balance_payments, customer_user):
+    # given
+    balance = customer_user.balance
+    first, second, _ = balance_payments
+
+    # when
+    with pytest.raises(PaymentError):
+        refund_payments([(first, Decimal(5)), (second, Decimal(11))])
+
+    # then
+    customer_user.refresh_from_db()
+    assert customer_user.balance == balance
+    first.refresh_from_db()
+    assert first.captured_amount == Decimal(10)
+    assert not first.transactions.exists()
+
+
+def test_refund_payments_updates_order_charge_data(balance_payments):
+    # given
+    first, second, _ = balance_payments
+    for payment in [first, second]:
+        payment.order.total_gross_amount = Decimal(10)
+        payment.order.save(update_fields=["total_gross_amount"])
+
+    # when
+    refund_payments([(first, Decimal(4)), (second, Decimal(10))])
+
+    # then
+    first.order.refresh_from_db()
+    assert first.order.total_charged_amount == Decimal(6)
+    assert first.order.charge_status == OrderChargeStatus.PARTIAL
+    second.order.refresh_from_db()
+    assert second.order.total_charged_amount == Decimal(0)
+    assert second.order.charge_status == OrderChargeStatus.NONE
+
+
+def test_refund_payments_of_other_gateway(balance_payments, customer_user):
+    # given
+    balance = customer_user.balance
+    payment = balance_payments[0]
+    payment.gateway = "mirumee.payments.dummy"
+    payment.save(update_fields=["gateway"])
+
+    # when
+    with pytest.raises(PaymentError, match="Only balance payments"):
+        refund_payments([(payment, Decimal(5))])
+
+    # then
+    customer_user.refresh_from_db()
+    assert customer_user.balance == balance
+    payment.refresh_from_db()
+    assert payment.captured_amount == Decimal(10)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_refund_payments_concurrent_with_order_confirm(customer_user, order_list):
+    # given
+    workers = 8
+    customer_user.balance = Decimal(1000)
+    customer_user.save(update_fields=["balance"])
+    payments = [_create_payment(order_list[0], Decimal(1000))]
+
+    def confirm_orders():
+        # OrderConfirm spends the coins through the ledger debit.
+        try:
+            user = User.objects.get(pk=customer_user.pk)
+            for _ in range(20):
+                ledger.debit(user, Decimal(3))
+        finally:
+            connection.close()
+
+    def refund():
+        try:
+            for _ in range(20):
+                refund_payments([(payments[0], Decimal(2))])
+        finally:
+            connection.close()
+
+    # when
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(confirm_orders if i % 2 else refund) for i in range(workers)
+        ]
+        for future in futures:
+            future.result()
+
+    # then
+    customer_user.refresh_from_db()
+    spent = Decimal(3) * 20 * (workers // 2)
+    refunded = Decimal(2) * 20 * (workers // 2)
+    assert customer_user.balance == Decimal(1000) - spent + refunded
+    deltas = (
+        BalanceEvent.objects.filter(user=customer_user)
+        .exclude(type=BalanceEvents.OPENING_BALANCE)
+        .values_list("delta", flat=True)
+    )
+    assert sum(deltas) == refunded - spent
+    payments[0].refresh_from_db()
+    assert payments[0].captured_amount == Decimal(1000) - refunded
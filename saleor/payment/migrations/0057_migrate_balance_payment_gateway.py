@@ -0,0 +1,27 @@
+# Generated by Django 3.2.24 on 2026-10-18 14:10
+
+from django.db import migrations
+
+# Payments of the balance gateway used to be recorded with the currency code as
+# the gateway.
+LEGACY_BALANCE_GATEWAY = "AXB"
+BALANCE_PLUGIN_ID = "aixinwu.payments.balance"
+
+
+def migrate_balance_payment_gateway(apps, _schema_editor):
+    Payment = apps.get_model("payment", "Payment")
+    Payment.objects.filter(gateway=LEGACY_BALANCE_GATEWAY).update(
+        gateway=BALANCE_PLUGIN_ID
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payment", "0056_merge_20231213_0755"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrate_balance_payment_gateway, migrations.RunPython.noop
+        ),
+    ]
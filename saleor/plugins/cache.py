@@ -0,0 +1,59 @@
+"""Process-level cache of the configuration of plugins.
+
+Every `PluginsManager` needs all channels and all `PluginConfiguration` rows.
+They rarely change, so each process keeps a snapshot of them per database
+connection for `PLUGIN_CONFIGURATION_CACHE_TIMEOUT` seconds; the cache is
+disabled when the setting is `0`. Saving or deleting a configuration or a
+channel bumps a version stamp stored in the shared cache, so every process
+loads the snapshot again when it creates its next manager.
+
+Every manager gets its own deep copy of the snapshot, plugins are free to
+modify their channel and configuration.
+"""
+import copy
+import threading
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_CACHE_KEY = "plugin_configuration:version"
+
+_lock = threading.Lock()
+_snapshots: dict[str, tuple[Any, float, Any]] = {}
+
+
+def get_plugin_configurations(database: str, load: Callable[[], Any]) -> Any:
+    """Return a copy of the configuration snapshot, loading it if outdated."""
+    timeout = settings.PLUGIN_CONFIGURATION_CACHE_TIMEOUT
+    if not timeout:
+        return load()
+    # Read the version before loading, a change committed in the meantime makes
+    # the next manager load the snapshot again.
+    version = cache.get(VERSION_CACHE_KEY, 0)
+    now = time.monotonic()
+    entry = _snapshots.get(database)
+    if entry and entry[0] == version and entry[1] > now:
+        return copy.deepcopy(entry[2])
+    snapshot = load()
+    with _lock:
+        _snapshots[database] = (version, now + timeout, snapshot)
+    return copy.deepcopy(snapshot)
+
+
+def _bump_version():
+    with _lock:
+        _snapshots.clear()
+    if not cache.add(VERSION_CACHE_KEY, 1, timeout=None):
+        try:
+            cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+
+
+def invalidate_plugin_configurations(sender=None, **kwargs):
+    """Drop configuration snapshots of all processes once changes commit."""
+    _bump_version()
+    transaction.on_commit(_bump_version)
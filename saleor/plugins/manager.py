@@ -5,6 +5,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    NamedTuple,
     Optional,
     Union,
 )
@@ -52,6 +53,7 @@ from ..payment.interface import (
 )
 from ..tax.utils import calculate_tax_rate
 from .base_plugin import ExcludedShippingMethod, ExternalAccessTokens
+from .cache import get_plugin_configurations
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
@@ -89,12 +91,20 @@ if TYPE_CHECKING:
 NotifyEventTypeChoice = str
 
 
+class _PluginSpec(NamedTuple):
+    index: int
+    plugin_class: type["BasePlugin"]
+    db_configs_map: dict
+    channel: Optional["Channel"]
+
+
 class PluginsManager(PaymentInterface):
-    """Base manager for handling plugins logic."""
+    """Base manager for handling plugins logic.
 
-    plugins_per_channel: dict[str, list["BasePlugin"]] = {}
-    global_plugins: list["BasePlugin"] = []
-    all_plugins: list["BasePlugin"] = []
+    Plugins are instantiated lazily. Hooks instantiate only the plugins that
+    implement them; all plugins are loaded on first access to `all_plugins`,
+    `global_plugins` or `plugins_per_channel`.
+    """
 
     @property
     def database(self):
@@ -125,7 +135,7 @@ class PluginsManager(PaymentInterface):
         if settings.PLUGIN_SETTINGS.get(PluginClass.PLUGIN_ID) is not None:
             plugin_config = settings.PLUGIN_SETTINGS[PluginClass.PLUGIN_ID]
             db_config = db_configs_map.get(PluginClass.PLUGIN_ID, None)
-            if (db_config):
+            if db_config:
                 active = db_config.active
             else:
                 active = True
@@ -142,42 +152,134 @@ class PluginsManager(PaymentInterface):
     def __init__(self, plugins: list[str], requestor_getter=None, allow_replica=True):
         with opentracing.global_tracer().start_active_span("PluginsManager.__init__"):
             self._allow_replica = allow_replica
-            self.all_plugins = []
-            self.global_plugins = []
-            self.plugins_per_channel = defaultdict(list)
-
-            channel_map = self._get_channel_map()
-            global_db_configs, channel_db_configs = self._get_db_plugin_configs(
-                channel_map
+            self._requestor_getter = requestor_getter
+            self._loaded_plugins: dict[int, "BasePlugin"] = {}
+            self._all_plugins: Optional[list["BasePlugin"]] = None
+            self._global_plugins: list["BasePlugin"] = []
+            self._plugins_per_channel: defaultdict[
+                str, list["BasePlugin"]
+            ] = defaultdict(list)
+
+            (
+                channel_map,
+                global_db_configs,
+                channel_db_configs,
+            ) = get_plugin_configurations(self.database, self._load_configurations)
+
+            self._all_specs: list[_PluginSpec] = []
+            self._global_specs: list[_PluginSpec] = []
+            self._specs_per_channel: defaultdict[str, list[_PluginSpec]] = defaultdict(
+                list
             )
-
             for plugin_path in plugins:
-                with opentracing.global_tracer().start_active_span(f"{plugin_path}"):
-                    PluginClass = import_string(plugin_path)
-                    if not getattr(PluginClass, "CONFIGURATION_PER_CHANNEL", False):
-                        plugin = self._load_plugin(
+                PluginClass = import_string(plugin_path)
+                if not getattr(PluginClass, "CONFIGURATION_PER_CHANNEL", False):
+                    spec = _PluginSpec(
+                        len(self._all_specs), PluginClass, global_db_configs, None
+                    )
+                    self._global_specs.append(spec)
+                    self._all_specs.append(spec)
+                else:
+                    for channel in channel_map.values():
+                        spec = _PluginSpec(
+                            len(self._all_specs),
                             PluginClass,
-                            global_db_configs,
-                            requestor_getter=requestor_getter,
-                            allow_replica=allow_replica,
+                            channel_db_configs.get(channel, {}),
+                            channel,
                         )
-                        self.global_plugins.append(plugin)
-                        self.all_plugins.append(plugin)
-                    else:
-                        for channel in channel_map.values():
-                            channel_configs = channel_db_configs.get(channel, {})
-                            plugin = self._load_plugin(
-                                PluginClass,
-                                channel_configs,
-                                channel,
-                                requestor_getter,
-                                allow_replica,
-                            )
-                            self.plugins_per_channel[channel.slug].append(plugin)
-                            self.all_plugins.append(plugin)
+                        self._specs_per_channel[channel.slug].append(spec)
+                        self._all_specs.append(spec)
 
             for channel in channel_map.values():
-                self.plugins_per_channel[channel.slug].extend(self.global_plugins)
+                self._specs_per_channel[channel.slug].extend(self._global_specs)
+
+    def _load_configurations(self):
+        channel_map = self._get_channel_map()
+        return channel_map, *self._get_db_plugin_configs(channel_map)
+
+    def _get_plugin_instance(self, spec: _PluginSpec) -> "BasePlugin":
+        plugin = self._loaded_plugins.get(spec.index)
+        if plugin is None:
+            with opentracing.global_tracer().start_active_span(
+                spec.plugin_class.PLUGIN_ID
+            ):
+                plugin = self._load_plugin(
+                    spec.plugin_class,
+                    spec.db_configs_map,
+                    spec.channel,
+                    self._requestor_getter,
+                    self._allow_replica,
+                )
+            self._loaded_plugins[spec.index] = plugin
+        return plugin
+
+    def _load_all_plugins(self):
+        if self._all_plugins is not None:
+            return
+        self._all_plugins = [
+            self._get_plugin_instance(spec) for spec in self._all_specs
+        ]
+        self._global_plugins = [
+            self._get_plugin_instance(spec) for spec in self._global_specs
+        ]
+        for channel_slug, specs in self._specs_per_channel.items():
+            self._plugins_per_channel[channel_slug] = [
+                self._get_plugin_instance(spec) for spec in specs
+            ]
+
+    @property
+    def all_plugins(self) -> list["BasePlugin"]:
+        self._load_all_plugins()
+        return self._all_plugins  # type: ignore[return-value]
+
+    @all_plugins.setter
+    def all_plugins(self, value: list["BasePlugin"]):
+        self._load_all_plugins()
+        self._all_plugins = value
+
+    @property
+    def global_plugins(self) -> list["BasePlugin"]:
+        self._load_all_plugins()
+        return self._global_plugins
+
+    @global_plugins.setter
+    def global_plugins(self, value: list["BasePlugin"]):
+        self._load_all_plugins()
+        self._global_plugins = value
+
+    @property
+    def plugins_per_channel(self) -> dict[str, list["BasePlugin"]]:
+        self._load_all_plugins()
+        return self._plugins_per_channel
+
+    @plugins_per_channel.setter
+    def plugins_per_channel(self, value: dict[str, list["BasePlugin"]]):
+        self._load_all_plugins()
+        self._plugins_per_channel = defaultdict(list, value)
+
+    def _get_plugins_implementing(
+        self, method_name: str, channel_slug: Optional[str] = None
+    ) -> list["BasePlugin"]:
+        """Return active plugins implementing the method.
+
+        Until all plugins are loaded, only the plugins whose class implements the
+        method are instantiated.
+        """
+        if self._all_plugins is not None:
+            return self.get_plugins(channel_slug=channel_slug, active_only=True)
+        specs = (
+            self._specs_per_channel.get(channel_slug, [])
+            if channel_slug
+            else self._all_specs
+        )
+        plugins = []
+        for spec in specs:
+            if not hasattr(spec.plugin_class, method_name):
+                continue
+            plugin = self._get_plugin_instance(spec)
+            if plugin.active:
+                plugins.append(plugin)
+        return plugins
 
     def _get_db_plugin_configs(self, channel_map):
         with opentracing.global_tracer().start_active_span("_get_db_plugin_configs"):
@@ -208,7 +310,7 @@ class PluginsManager(PaymentInterface):
     ):
         """Try to run a method with the given name on each declared active plugin."""
         value = default_value
-        plugins = self.get_plugins(channel_slug=channel_slug, active_only=True)
+        plugins = self._get_plugins_implementing(method_name, channel_slug=channel_slug)
         for plugin in plugins:
             value = self.__run_method_on_single_plugin(
                 plugin, method_name, value, *args, **kwargs
@@ -1857,7 +1959,7 @@ class PluginsManager(PaymentInterface):
         *args,
         channel_slug: Optional[str] = None,
     ):
-        plugins = self.get_plugins(channel_slug=channel_slug)
+        plugins = self._get_plugins_implementing(method_name, channel_slug=channel_slug)
         for plugin in plugins:
             result = self.__run_method_on_single_plugin(
                 plugin, method_name, None, *args
@@ -1937,6 +2039,19 @@ class PluginsManager(PaymentInterface):
     def get_plugin(
         self, plugin_id: str, channel_slug: Optional[str] = None, active_only=False
     ) -> Optional["BasePlugin"]:
+        if self._all_plugins is None:
+            specs = (
+                self._specs_per_channel.get(channel_slug, [])
+                if channel_slug
+                else self._all_specs
+            )
+            for spec in specs:
+                if not spec.plugin_class.check_plugin_id(plugin_id):
+                    continue
+                plugin = self._get_plugin_instance(spec)
+                if plugin.active or not active_only:
+                    return plugin
+            return None
         plugins = self.get_plugins(channel_slug=channel_slug, active_only=active_only)
         for plugin in plugins:
             if plugin.check_plugin_id(plugin_id):
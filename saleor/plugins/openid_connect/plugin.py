@@ -6,10 +6,10 @@ from django.conf import settings
 from django.core import signing
 from django.core.exceptions import ValidationError
 from django.core.handlers.wsgi import WSGIRequest
-from django.db.models import F
 from jwt import ExpiredSignatureError, InvalidTokenError
 from requests import HTTPError, PreparedRequest
 
+from ...account.continuous_login import record_login
 from ...account.models import User
 from ...account.utils import get_user_groups_permissions
 from ...core.auth import get_token_from_request
@@ -21,7 +21,7 @@ from ...core.jwt import (
     jwt_decode,
 )
 from ...permission.enums import get_permissions_codename, get_permissions_from_names
-from ...site.models import Site, SiteStatistics
+from ...site.statistics import increment_site_statistics
 from ..base_plugin import BasePlugin, ConfigurationTypeField, ExternalAccessTokens
 from ..error_codes import PluginErrorCode
 from ..models import PluginConfiguration
@@ -43,7 +43,6 @@ from .utils import (
     get_staff_user_domains,
     get_user_from_token,
     is_owner_of_token_valid,
-    update_continuous_days,
     validate_refresh_token,
 )
 
@@ -329,8 +328,7 @@ class OpenIDConnectPlugin(BasePlugin):
             token_data, user, parsed_id_token, user_permissions, owner=self.PLUGIN_ID
         )
 
-        site = Site.objects.get_current()
-        SiteStatistics.objects.filter(site=site).update(views=F("views") + 1)
+        increment_site_statistics(views=1)
 
         return ExternalAccessTokens(user=user, **tokens)
 
@@ -417,7 +415,7 @@ class OpenIDConnectPlugin(BasePlugin):
                 token_data.get("id_token"), self.config.json_web_key_set_url
             )
             user = get_user_from_token(parsed_id_token)
-            update_continuous_days(user)
+            record_login(user)
             user_permissions = self.get_and_update_user_permissions(user)
 
             tokens = create_tokens_from_oauth_payload(
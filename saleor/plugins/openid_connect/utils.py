@@ -5,7 +5,6 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
 import graphene
-import pytz
 import requests
 from authlib.jose import JWTClaims, jwt
 from authlib.jose.errors import DecodeError, JoseError
@@ -16,15 +15,12 @@ from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
 from django.db import transaction
-from django.db.models import F, QuerySet
+from django.db.models import QuerySet
 from django.utils import timezone
 from jwt import PyJWTError
 
-from ...account.events import (
-    accept_invitation_balance_event,
-    consecutive_login_balance_event,
-    first_login_balance_event,
-)
+from ...account import BalanceEvents, ledger
+from ...account.continuous_login import record_login
 from ...account.models import Group, User, Invitation as InvitationModel
 from ...account.search import prepare_user_search_document_value
 from ...account.utils import get_user_groups_permissions
@@ -47,7 +43,8 @@ from ...graphql.core.utils import from_global_id_or_error
 from ...order.utils import match_orders_with_new_user
 from ...permission.enums import get_permission_names, get_permissions_from_codenames
 from ...permission.models import Permission
-from ...site.models import Site, SiteStatistics
+from ...site.models import Site
+from ...site.statistics import increment_site_statistics
 from ..error_codes import PluginErrorCode
 from ..models import PluginConfiguration
 from . import PLUGIN_ID
@@ -272,14 +269,26 @@ def get_or_create_user_from_payload(
                 **get_kwargs
             )
         except User.DoesNotExist:
-            user, _ = User.objects.get_or_create(
+            user, created = User.objects.get_or_create(
                 email=user_email,
-                defaults=defaults_create,
-            )
-            first_login_balance_event(user=user)
-            consecutive_login_balance_event(
-                user=user, delta=Decimal(settings.CONTINUOUS_BALANCE_ADD[0])
+                defaults={**defaults_create, "balance": Decimal(0)},
             )
+            if created:
+                ledger.post_many(
+                    [
+                        ledger.Posting(
+                            user_id=user.pk,
+                            delta=Decimal(50),
+                            type=BalanceEvents.FIRST_LOGIN,
+                        ),
+                        ledger.Posting(
+                            user_id=user.pk,
+                            delta=Decimal(settings.CONTINUOUS_BALANCE_ADD[0]),
+                            type=BalanceEvents.CONSECUTIVE_LOGIN,
+                        ),
+                    ]
+                )
+                user.refresh_from_db(fields=["balance"])
             site, _ = Site.objects.get_or_create(id=settings.SITE_ID)
 
             if not site.domain or not site.name:
@@ -287,20 +296,19 @@ def get_or_create_user_from_payload(
                 site.domain = settings.SITE_DOMAIN
                 site.save(update_fields=["name", "domain"])
 
-            try:
-                stat = site.stat
-            except:
-                stat, _ = SiteStatistics.objects.get_or_create(site=site)
-
-            SiteStatistics.objects.filter(id=stat.id).update(users=F("users") + 1)
+            if created:
+                transaction.on_commit(
+                    lambda: increment_site_statistics(site_id=site.pk, users=1)
+                )
             match_orders_with_new_user(user)
 
             if invitation_code:
                 invitation = InvitationModel.objects.get(code=invitation_code)
-                invitation.user.balance += Decimal(25.0)
+                ledger.post(
+                    invitation.user, Decimal(25), BalanceEvents.INVITATION_ACCEPTED
+                )
                 invitation.user.updated_at = timezone.now()
-                invitation.user.save(update_fields=["balance", "updated_at"])
-                accept_invitation_balance_event(user=invitation.user)
+                invitation.user.save(update_fields=["updated_at"])
                 user.invited_by = invitation.user.account
                 user.save(update_fields=["invited_by"])
 
@@ -339,37 +347,6 @@ def get_domain_from_email(email: str):
     return domain if delim else None
 
 
-def _update_continuous_days(user: User, login_time: datetime, fields_to_save: set):
-    delta = (
-        login_time.astimezone(tz=pytz.timezone("Asia/Shanghai")).date()
-        - user.last_login.astimezone(tz=pytz.timezone("Asia/Shanghai")).date()
-    ).days
-    if delta > 1:
-        user.continuous = 0
-    if delta >= 1:
-        user.continuous += 1
-        if user.continuous <= len(settings.CONTINUOUS_BALANCE_ADD):
-            balance_delta = Decimal(
-                settings.CONTINUOUS_BALANCE_ADD[user.continuous - 1]
-            )
-        else:
-            balance_delta = Decimal(settings.CONTINUOUS_BALANCE_ADD[-1])
-        user.balance += Decimal(balance_delta)
-        consecutive_login_balance_event(user=user, delta=balance_delta)
-        fields_to_save.add("balance")
-    user.last_login = login_time
-
-    fields_to_save.update({"continuous", "last_login"})
-
-
-@transaction.atomic
-def update_continuous_days(user: User):
-    user = User.objects.select_for_update().get(pk=user.pk)
-    fields_to_save = set()
-    _update_continuous_days(user, datetime.now(), fields_to_save)
-    user.save(update_fields=fields_to_save)
-
-
 def _update_user_details(
     user: User,
     oidc_key: str,
@@ -398,7 +375,7 @@ def _update_user_details(
         match_orders_with_new_user(user)
         fields_to_save.update({"email", "search_document"})
 
-    _update_continuous_days(user, login_time, fields_to_save)
+    record_login(user, login_time)
 
     if user.first_name != user_first_name:
         user.first_name = user_first_name
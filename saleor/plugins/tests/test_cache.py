@@ -0,0 +1,131 @@
+import time
+
+import pytest
+from django.core.cache import cache
+
+from ..cache import invalidate_plugin_configurations
+from ..manager import PluginsManager
+from ..models import PluginConfiguration
+from ..openid_connect.plugin import OpenIDConnectPlugin
+from ..user_email.plugin import UserEmailPlugin
+from ..webhook.plugin import WebhookPlugin
+
+PLUGINS = [
+    "saleor.plugins.webhook.plugin.WebhookPlugin",
+    "saleor.plugins.openid_connect.plugin.OpenIDConnectPlugin",
+    "saleor.plugins.user_email.plugin.UserEmailPlugin",
+]
+
+
+@pytest.fixture
+def _plugin_configuration_cache_enabled(settings):
+    settings.PLUGIN_CONFIGURATION_CACHE_TIMEOUT = 60
+    cache.clear()
+    invalidate_plugin_configurations()
+    yield
+    cache.clear()
+    invalidate_plugin_configurations()
+
+
+def test_manager_reuses_configuration_snapshot(
+    channel_USD, _plugin_configuration_cache_enabled, django_assert_num_queries
+):
+    # given
+    PluginsManager(PLUGINS)
+
+    # when
+    with django_assert_num_queries(0):
+        manager = PluginsManager(PLUGINS)
+        plugins = manager.get_plugins(channel_slug=channel_USD.slug, active_only=False)
+
+    # then
+    assert [type(plugin) for plugin in plugins] == [
+        UserEmailPlugin,
+        WebhookPlugin,
+        OpenIDConnectPlugin,
+    ]
+
+
+def test_configuration_change_invalidates_snapshot(
+    channel_USD, _plugin_configuration_cache_enabled
+):
+    # given
+    manager = PluginsManager(PLUGINS)
+    plugin = manager.get_plugin(UserEmailPlugin.PLUGIN_ID, channel_USD.slug)
+    assert not plugin.active
+
+    # when
+    PluginConfiguration.objects.create(
+        identifier=UserEmailPlugin.PLUGIN_ID,
+        channel=channel_USD,
+        active=True,
+        configuration=[],
+    )
+    manager = PluginsManager(PLUGINS)
+
+    # then
+    plugin = manager.get_plugin(UserEmailPlugin.PLUGIN_ID, channel_USD.slug)
+    assert plugin.active
+
+
+def test_managers_do_not_share_configurations(
+    channel_USD, _plugin_configuration_cache_enabled
+):
+    # given
+    PluginConfiguration.objects.create(
+        identifier=UserEmailPlugin.PLUGIN_ID,
+        channel=channel_USD,
+        active=True,
+        configuration=[{"name": "host", "value": "smtp.example.com"}],
+    )
+    plugin = PluginsManager(PLUGINS).get_plugin(
+        UserEmailPlugin.PLUGIN_ID, channel_USD.slug
+    )
+
+    # when
+    plugin.channel.name = "Changed"
+    plugin.db_config.configuration[0]["value"] = "changed.example.com"
+    other_plugin = PluginsManager(PLUGINS).get_plugin(
+        UserEmailPlugin.PLUGIN_ID, channel_USD.slug
+    )
+
+    # then
+    assert other_plugin.channel.name == channel_USD.name
+    assert other_plugin.db_config.configuration[0]["value"] == "smtp.example.com"
+
+
+def test_hook_instantiates_only_implementing_plugins(
+    rf, channel_USD, _plugin_configuration_cache_enabled
+):
+    # given
+    manager = PluginsManager(PLUGINS)
+
+    # when
+    manager.authenticate_user(rf.request())
+
+    # then
+    loaded_plugins = list(manager._loaded_plugins.values())
+    assert [type(plugin) for plugin in loaded_plugins] == [OpenIDConnectPlugin]
+
+
+def test_cached_manager_setup_overhead(
+    channel_USD, channel_PLN, _plugin_configuration_cache_enabled, settings
+):
+    # given
+    runs = 50
+
+    def create_managers():
+        started_at = time.perf_counter()
+        for _ in range(runs):
+            PluginsManager(PLUGINS).get_plugin(OpenIDConnectPlugin.PLUGIN_ID)
+        return time.perf_counter() - started_at
+
+    settings.PLUGIN_CONFIGURATION_CACHE_TIMEOUT = 0
+    uncached = create_managers()
+
+    # when
+    settings.PLUGIN_CONFIGURATION_CACHE_TIMEOUT = 60
+    cached = create_managers()
+
+    # then
+    assert cached < uncached
@@ -26,10 +26,10 @@ class FakeDelivery:
 
 
 @mock.patch(
-    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.delay"
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_async.delay"
 )
 def test_trigger_webhooks_async(
-    mocked_send_webhook_request,
+    mocked_send_webhook_requests,
     webhook,
     subscription_order_created_webhook,
     order,
@@ -43,8 +43,35 @@ def test_trigger_webhooks_async(
     assert deliveries.count() == 2
     assert deliveries[0].webhook == subscription_order_created_webhook
     assert deliveries[1].webhook == webhook
-    calls = [mock.call(deliveries[1].id), mock.call(deliveries[0].id)]
-    assert mocked_send_webhook_request.mock_calls == calls
+    mocked_send_webhook_requests.assert_called_once_with(
+        [deliveries[1].id, deliveries[0].id]
+    )
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_async.delay"
+)
+def test_trigger_webhooks_async_in_batches(
+    mocked_send_webhook_requests,
+    webhook,
+    subscription_order_created_webhook,
+    order,
+    settings,
+):
+    # given
+    settings.WEBHOOK_BATCH_SIZE = 1
+    webhook_type = WebhookEventAsyncType.ORDER_CREATED
+    webhooks, payload = Webhook.objects.all(), {"example": "payload"}
+
+    # when
+    trigger_webhooks_async(payload, webhook_type, webhooks, order, allow_replica=False)
+
+    # then
+    deliveries = EventDelivery.objects.all()
+    assert mocked_send_webhook_requests.mock_calls == [
+        mock.call([deliveries[1].id]),
+        mock.call([deliveries[0].id]),
+    ]
 
 
 @mock.patch(
@@ -73,11 +73,15 @@ third_url = "http://www.example.com/third/"
         (WebhookEventAsyncType.CUSTOMER_CREATED, 0, set()),
     ],
 )
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_async.delay"
+)
 @mock.patch(
     "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.delay"
 )
 def test_trigger_webhooks_for_event_calls_expected_events(
     mock_request,
+    mock_batch_request,
     event_name,
     total_webhook_calls,
     expected_target_urls,
@@ -118,12 +122,14 @@ def test_trigger_webhooks_for_event_calls_expected_events(
         get_webhooks_for_event(event_name),
         allow_replica=False,
     )
-    deliveries_called = {
-        EventDelivery.objects.get(id=delivery_id[0][0])
-        for delivery_id in mock_request.call_args_list
-    }
+    delivery_ids = [call.args[0] for call in mock_request.call_args_list] + [
+        delivery_id
+        for call in mock_batch_request.call_args_list
+        for delivery_id in call.args[0]
+    ]
+    deliveries_called = EventDelivery.objects.filter(id__in=delivery_ids)
     urls_called = {delivery.webhook.target_url for delivery in deliveries_called}
-    assert mock_request.call_count == total_webhook_calls
+    assert len(delivery_ids) == total_webhook_calls
     assert urls_called == expected_target_urls
 
 
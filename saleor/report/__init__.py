@@ -0,0 +1,13 @@
+default_app_config = "saleor.report.app.ReportAppConfig"
+
+
+class ReportKind:
+    ORDERS = "orders"
+    DONATIONS = "donations"
+    CUSTOMERS = "customers"
+
+    CHOICES = [
+        (ORDERS, "Placed orders with their line quantities and net amounts."),
+        (DONATIONS, "Completed donations."),
+        (CUSTOMERS, "Registered customers."),
+    ]
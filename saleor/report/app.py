@@ -0,0 +1,31 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class ReportAppConfig(AppConfig):
+    name = "saleor.report"
+
+    def ready(self):
+        from ..order.models import OrderLine
+        from .signals import (
+            invalidate_deleted_row_daily_report,
+            invalidate_order_line_daily_report,
+        )
+        from .utils import REPORT_SOURCES
+
+        for model, _date_field, _compute in REPORT_SOURCES.values():
+            post_delete.connect(
+                invalidate_deleted_row_daily_report,
+                sender=model,
+                dispatch_uid=f"invalidate_daily_report_{model.__name__}",
+            )
+        post_save.connect(
+            invalidate_order_line_daily_report,
+            sender=OrderLine,
+            dispatch_uid="invalidate_daily_report_saved_order_line",
+        )
+        post_delete.connect(
+            invalidate_order_line_daily_report,
+            sender=OrderLine,
+            dispatch_uid="invalidate_daily_report_deleted_order_line",
+        )
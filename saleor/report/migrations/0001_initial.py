@@ -0,0 +1,81 @@
+# Generated by Django 3.2.24 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyReport",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            (
+                                "orders",
+                                "Placed orders with their line quantities and net amounts.",
+                            ),
+                            ("donations", "Completed donations."),
+                            ("customers", "Registered customers."),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("collection_total", models.PositiveIntegerField(default=0)),
+                ("quantities_total", models.PositiveIntegerField(default=0)),
+                (
+                    "amount_total",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+            ],
+            options={
+                "ordering": ("kind", "date"),
+                "unique_together": {("kind", "date")},
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyReportRefresh",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            (
+                                "orders",
+                                "Placed orders with their line quantities and net amounts.",
+                            ),
+                            ("donations", "Completed donations."),
+                            ("customers", "Registered customers."),
+                        ],
+                        max_length=32,
+                        unique=True,
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.24 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("report", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyReportInvalidation",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            (
+                                "orders",
+                                "Placed orders with their line quantities and net "
+                                "amounts.",
+                            ),
+                            ("donations", "Completed donations."),
+                            ("customers", "Registered customers."),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("date", models.DateField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import models
+
+from . import ReportKind
+
+
+class DailyReport(models.Model):
+    """Pre-aggregated report values of a single day."""
+
+    kind = models.CharField(max_length=32, choices=ReportKind.CHOICES)
+    date = models.DateField()
+    collection_total = models.PositiveIntegerField(default=0)
+    quantities_total = models.PositiveIntegerField(default=0)
+    amount_total = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+
+    class Meta:
+        ordering = ("kind", "date")
+        unique_together = [["kind", "date"]]
+
+
+class DailyReportRefresh(models.Model):
+    """High-water mark of the rows already aggregated into daily reports."""
+
+    kind = models.CharField(max_length=32, choices=ReportKind.CHOICES, unique=True)
+    refreshed_at = models.DateTimeField()
+
+
+class DailyReportInvalidation(models.Model):
+    """Day whose report has to be recomputed although no row of it was updated.
+
+    Deleted rows and changed order lines don't bump `updated_at` of the rows the
+    reports are computed from.
+    """
+
+    kind = models.CharField(max_length=32, choices=ReportKind.CHOICES)
+    date = models.DateField()
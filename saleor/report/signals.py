@@ -0,0 +1,26 @@
+from django.utils import timezone
+
+from ..order.models import Order
+from . import ReportKind
+from .utils import REPORT_SOURCES, invalidate_daily_reports
+
+
+def invalidate_deleted_row_daily_report(sender, instance, **kwargs):
+    for kind, (model, date_field, _compute) in REPORT_SOURCES.items():
+        if model is sender:
+            day = timezone.localdate(getattr(instance, date_field))
+            invalidate_daily_reports(kind, [day])
+
+
+def invalidate_order_line_daily_report(sender, instance, update_fields=None, **kwargs):
+    # Quantities of the lines are aggregated, changing them doesn't bump
+    # `updated_at` of the order.
+    if update_fields is not None and "quantity" not in update_fields:
+        return
+    created_at = (
+        Order.objects.filter(pk=instance.order_id)
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    if created_at:
+        invalidate_daily_reports(ReportKind.ORDERS, [timezone.localdate(created_at)])
@@ -0,0 +1,14 @@
+from celery.utils.log import get_task_logger
+
+from ..celeryconf import app
+from . import ReportKind
+from .utils import refresh_daily_reports
+
+task_logger = get_task_logger(__name__)
+
+
+@app.task
+def refresh_daily_reports_task():
+    for kind, _ in ReportKind.CHOICES:
+        count = refresh_daily_reports(kind)
+        task_logger.debug("Refreshed %s daily %s reports", count, kind)
@@ -0,0 +1,168 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+import pytz
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ...donation import DonationStatus
+from ...donation.models import Donation
+from ...order import OrderStatus
+from ...order.models import Order
+from .. import ReportKind
+from ..models import DailyReport, DailyReportInvalidation, DailyReportRefresh
+from ..utils import (
+    REFRESH_OVERLAP,
+    get_daily_reports_boundary,
+    refresh_daily_reports,
+)
+
+
+@pytest.fixture
+def completed_donations():
+    start = datetime.datetime(2024, 1, 1, 12, tzinfo=pytz.utc)
+    donations = Donation.objects.bulk_create(
+        [
+            Donation(
+                number=i,
+                status=DonationStatus.COMPLETED,
+                created_at=start + datetime.timedelta(days=i // 2),
+                price_amount=Decimal(5),
+                currency="CNY",
+                quantity=1,
+            )
+            for i in range(4)
+        ]
+    )
+    # Keep the donations out of the overlap window of the refreshes.
+    Donation.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+    return donations
+
+
+@pytest.mark.django_db
+def test_refresh_daily_reports_from_scratch(completed_donations):
+    # when
+    count = refresh_daily_reports(ReportKind.DONATIONS)
+
+    # then
+    assert count == 2
+    reports = DailyReport.objects.filter(kind=ReportKind.DONATIONS)
+    assert [(r.date, r.collection_total, r.amount_total) for r in reports] == [
+        (datetime.date(2024, 1, 1), 2, Decimal(10)),
+        (datetime.date(2024, 1, 2), 2, Decimal(10)),
+    ]
+    assert DailyReportRefresh.objects.filter(kind=ReportKind.DONATIONS).exists()
+
+
+@pytest.mark.django_db
+def test_refresh_daily_reports_recomputes_only_changed_days(completed_donations):
+    # given
+    refresh_daily_reports(ReportKind.DONATIONS)
+    donation = completed_donations[0]
+    donation.status = DonationStatus.REJECTED
+    donation.updated_at = timezone.now() + datetime.timedelta(seconds=1)
+    donation.save(update_fields=["status", "updated_at"])
+
+    # when
+    count = refresh_daily_reports(ReportKind.DONATIONS)
+
+    # then
+    assert count == 1
+    report = DailyReport.objects.get(
+        kind=ReportKind.DONATIONS, date=datetime.date(2024, 1, 1)
+    )
+    assert report.collection_total == 1
+    assert report.amount_total == Decimal(5)
+
+
+@pytest.mark.django_db
+def test_refresh_daily_reports_without_changes(completed_donations):
+    # given
+    refresh_daily_reports(ReportKind.DONATIONS)
+
+    # when
+    count = refresh_daily_reports(ReportKind.DONATIONS)
+
+    # then
+    assert count == 0
+    assert DailyReport.objects.filter(kind=ReportKind.DONATIONS).count() == 2
+
+
+@pytest.mark.django_db
+def test_refresh_daily_reports_rereads_rows_committed_late(completed_donations):
+    # given
+    refresh_daily_reports(ReportKind.DONATIONS)
+    refresh = DailyReportRefresh.objects.get(kind=ReportKind.DONATIONS)
+    # The donation was changed before the mark, but committed after the refresh.
+    donation = completed_donations[0]
+    donation.status = DonationStatus.REJECTED
+    donation.updated_at = refresh.refreshed_at - REFRESH_OVERLAP / 2
+    donation.save(update_fields=["status", "updated_at"])
+
+    # when
+    count = refresh_daily_reports(ReportKind.DONATIONS)
+
+    # then
+    assert count == 1
+    report = DailyReport.objects.get(
+        kind=ReportKind.DONATIONS, date=datetime.date(2024, 1, 1)
+    )
+    assert report.collection_total == 1
+
+
+@pytest.mark.django_db
+def test_refresh_daily_reports_after_delete(completed_donations):
+    # given
+    refresh_daily_reports(ReportKind.DONATIONS)
+
+    # when
+    completed_donations[0].delete()
+    count = refresh_daily_reports(ReportKind.DONATIONS)
+
+    # then
+    assert count == 1
+    report = DailyReport.objects.get(
+        kind=ReportKind.DONATIONS, date=datetime.date(2024, 1, 1)
+    )
+    assert report.collection_total == 1
+    assert not DailyReportInvalidation.objects.exists()
+
+
+@pytest.mark.django_db
+def test_refresh_daily_reports_after_order_line_quantity_change(order_with_lines):
+    # given
+    Order.objects.filter(pk=order_with_lines.pk).update(
+        status=OrderStatus.UNFULFILLED,
+        updated_at=timezone.now() - datetime.timedelta(hours=1),
+    )
+    refresh_daily_reports(ReportKind.ORDERS)
+    line = order_with_lines.lines.first()
+    line.quantity += 1
+
+    # when
+    line.save(update_fields=["quantity"])
+    count = refresh_daily_reports(ReportKind.ORDERS)
+
+    # then
+    assert count == 1
+    report = DailyReport.objects.get(
+        kind=ReportKind.ORDERS, date=timezone.localdate(order_with_lines.created_at)
+    )
+    assert report.quantities_total == sum(
+        line.quantity for line in order_with_lines.lines.all()
+    )
+
+
+@freeze_time("2024-03-10 12:00:00")
+@pytest.mark.django_db
+def test_get_daily_reports_boundary():
+    # given
+    assert get_daily_reports_boundary(ReportKind.ORDERS) == datetime.date.min
+    refresh_daily_reports(ReportKind.ORDERS)
+
+    # when
+    boundary = get_daily_reports_boundary(ReportKind.ORDERS)
+
+    # then
+    assert boundary == datetime.date(2024, 3, 10)
@@ -0,0 +1,178 @@
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Count, Q, QuerySet, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..account.models import User
+from ..donation import DonationStatus
+from ..donation.models import Donation
+from ..order import OrderStatus
+from ..order.models import Order, OrderLine
+from . import ReportKind
+from .models import DailyReport, DailyReportInvalidation, DailyReportRefresh
+
+# Rows are re-read since the previous mark minus the overlap, so rows committed
+# after the mark was taken, with an earlier `updated_at`, are picked up as well.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def get_reportable_orders(using: Optional[str] = None) -> QuerySet[Order]:
+    return Order.objects.using(using).exclude(
+        Q(status=OrderStatus.CANCELED)
+        | Q(status=OrderStatus.UNCONFIRMED)
+        | Q(status=OrderStatus.EXPIRED)
+    )
+
+
+def get_reportable_donations(using: Optional[str] = None) -> QuerySet[Donation]:
+    return Donation.objects.using(using).filter(status=DonationStatus.COMPLETED)
+
+
+def get_reportable_customers(using: Optional[str] = None) -> QuerySet[User]:
+    return User.objects.using(using).all()
+
+
+def _get_dirty_dates(
+    qs: QuerySet, date_field: str, since: Optional[datetime]
+) -> Optional[set[date]]:
+    """Return the days of the rows changed since the last refresh.
+
+    `None` means that the reports were never refreshed and all days are dirty.
+    """
+    if since is None:
+        return None
+    return set(
+        qs.filter(updated_at__gte=since - REFRESH_OVERLAP)
+        .annotate(day=TruncDate(date_field))
+        .order_by()
+        .values_list("day", flat=True)
+        .distinct()
+    )
+
+
+def _group_by_day(
+    qs: QuerySet, date_field: str, dates: Optional[set[date]], **aggregates
+) -> dict[date, dict]:
+    qs = qs.annotate(day=TruncDate(date_field))
+    if dates is not None:
+        qs = qs.filter(day__in=dates)
+    rows = qs.order_by().values("day").annotate(**aggregates)
+    return {row.pop("day"): row for row in rows}
+
+
+def _compute_daily_orders(dates: Optional[set[date]]) -> dict[date, dict]:
+    orders = get_reportable_orders()
+    values = _group_by_day(
+        orders,
+        "created_at",
+        dates,
+        collection_total=Count("pk"),
+        amount_total=Sum("total_net_amount"),
+    )
+    lines = _group_by_day(
+        OrderLine.objects.filter(order__in=orders.values("pk")),
+        "order__created_at",
+        dates,
+        quantities_total=Sum("quantity"),
+    )
+    for day, line_values in lines.items():
+        values.setdefault(day, {}).update(line_values)
+    return values
+
+
+def _compute_daily_donations(dates: Optional[set[date]]) -> dict[date, dict]:
+    return _group_by_day(
+        get_reportable_donations(),
+        "created_at",
+        dates,
+        collection_total=Count("pk"),
+        quantities_total=Sum("quantity"),
+        amount_total=Sum("price_amount"),
+    )
+
+
+def _compute_daily_customers(dates: Optional[set[date]]) -> dict[date, dict]:
+    return _group_by_day(
+        get_reportable_customers(), "date_joined", dates, collection_total=Count("pk")
+    )
+
+
+REPORT_SOURCES = {
+    ReportKind.ORDERS: (Order, "created_at", _compute_daily_orders),
+    ReportKind.DONATIONS: (Donation, "created_at", _compute_daily_donations),
+    ReportKind.CUSTOMERS: (User, "date_joined", _compute_daily_customers),
+}
+
+
+def refresh_daily_reports(kind: str) -> int:
+    """Recompute the daily reports of the days changed since the last refresh.
+
+    Rows are tracked by their `updated_at`, so days whose rows changed status
+    (e.g. a canceled order) are recomputed as well. Days of deleted rows are
+    taken from the invalidations. Returns the number of days that were
+    recomputed.
+    """
+    model, date_field, compute = REPORT_SOURCES[kind]
+    refresh = DailyReportRefresh.objects.filter(kind=kind).first()
+    # Take the mark before reading the rows, changes made during the refresh will
+    # be picked up again by the next one.
+    refreshed_at = timezone.now()
+    invalidations = dict(
+        DailyReportInvalidation.objects.filter(kind=kind).values_list("pk", "date")
+    )
+    dates = _get_dirty_dates(
+        model.objects.all(), date_field, refresh.refreshed_at if refresh else None
+    )
+    if dates is not None:
+        dates.update(invalidations.values())
+    if dates is not None and not dates:
+        DailyReportRefresh.objects.filter(kind=kind).update(refreshed_at=refreshed_at)
+        return 0
+
+    values = compute(dates)
+    reports = [
+        DailyReport(
+            kind=kind,
+            date=day,
+            collection_total=day_values.get("collection_total") or 0,
+            quantities_total=day_values.get("quantities_total") or 0,
+            amount_total=day_values.get("amount_total") or Decimal(0),
+        )
+        for day, day_values in values.items()
+    ]
+    with transaction.atomic():
+        existing = DailyReport.objects.filter(kind=kind)
+        if dates is not None:
+            existing = existing.filter(date__in=dates)
+        existing.delete()
+        DailyReport.objects.bulk_create(reports)
+        DailyReportRefresh.objects.update_or_create(
+            kind=kind, defaults={"refreshed_at": refreshed_at}
+        )
+        # Invalidations created during the refresh are kept for the next one.
+        DailyReportInvalidation.objects.filter(pk__in=invalidations.keys()).delete()
+    return len(dates) if dates is not None else len(reports)
+
+
+def invalidate_daily_reports(kind: str, dates: Iterable[date]):
+    """Mark the days to be recomputed by the next refresh."""
+    DailyReportInvalidation.objects.bulk_create(
+        [DailyReportInvalidation(kind=kind, date=day) for day in set(dates)]
+    )
+
+
+def get_daily_reports_boundary(kind: str, using: Optional[str] = None) -> date:
+    """Return the first day that is not covered by the stored daily reports.
+
+    Reports of the days before the last refresh are final, the rest has to be
+    computed from the source tables.
+    """
+    refresh = DailyReportRefresh.objects.using(using).filter(kind=kind).first()
+    if refresh is None:
+        return date.min
+    return timezone.localdate(refresh.refreshed_at)
@@ -266,6 +266,7 @@ INSTALLED_APPS = [
     "saleor.site",
     "saleor.page",
     "saleor.payment",
+    "saleor.report",
     "saleor.tax",
     "saleor.warehouse",
     "saleor.webhook",
@@ -555,6 +556,31 @@ BEAT_EXPIRE_ORDERS_AFTER_TIMEDELTA = timedelta(
     seconds=parse(os.environ.get("BEAT_EXPIRE_ORDERS_AFTER_TIMEDELTA", "5 minutes"))
 )
 
+# Refresh daily reports task setting
+BEAT_REFRESH_DAILY_REPORTS_AFTER_TIMEDELTA = timedelta(
+    seconds=parse(
+        os.environ.get("BEAT_REFRESH_DAILY_REPORTS_AFTER_TIMEDELTA", "10 minutes")
+    )
+)
+
+# Process queued logins of the login streaks task setting
+BEAT_PROCESS_PENDING_LOGINS_AFTER_TIMEDELTA = timedelta(
+    seconds=parse(
+        os.environ.get("BEAT_PROCESS_PENDING_LOGINS_AFTER_TIMEDELTA", "30 seconds")
+    )
+)
+
+# Flush site statistics counters task setting
+BEAT_FLUSH_SITE_STATISTICS_AFTER_TIMEDELTA = timedelta(
+    seconds=parse(
+        os.environ.get("BEAT_FLUSH_SITE_STATISTICS_AFTER_TIMEDELTA", "1 minute")
+    )
+)
+
+# Accumulate increments of the site statistics in the cache and flush them with the
+# beat task. Unset, enabled unless the cache is local to the process.
+SITE_STATISTICS_WRITE_BEHIND = get_bool_from_env("SITE_STATISTICS_WRITE_BEHIND", None)
+
 # Defines after how many seconds should the task triggered by the Celery beat
 # entry 'update-products-search-vectors' expire if it wasn't picked up by a worker.
 BEAT_UPDATE_SEARCH_SEC = parse(
@@ -589,6 +615,10 @@ CELERY_BEAT_SCHEDULE = {
     #     "task": "saleor.order.tasks.delete_expired_orders_task",
     #     "schedule": crontab(hour=2, minute=0),
     # },
+    "maintain-monthly-sequences": {
+        "task": "saleor.core.tasks.maintain_monthly_sequences_task",
+        "schedule": crontab(hour=0, minute=30),
+    },
     "delete-outdated-event-data": {
         "task": "saleor.core.tasks.delete_event_payloads_task",
         "schedule": timedelta(days=1),
@@ -619,6 +649,18 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": timedelta(seconds=BEAT_UPDATE_SEARCH_SEC),
         "options": {"expires": BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC},
     },
+    "refresh-daily-reports": {
+        "task": "saleor.report.tasks.refresh_daily_reports_task",
+        "schedule": BEAT_REFRESH_DAILY_REPORTS_AFTER_TIMEDELTA,
+    },
+    "process-pending-logins": {
+        "task": "saleor.account.tasks.process_pending_logins_task",
+        "schedule": BEAT_PROCESS_PENDING_LOGINS_AFTER_TIMEDELTA,
+    },
+    "flush-site-statistics": {
+        "task": "saleor.site.tasks.flush_site_statistics_task",
+        "schedule": BEAT_FLUSH_SITE_STATISTICS_AFTER_TIMEDELTA,
+    },
     "expire-orders": {
         "task": "saleor.order.tasks.expire_orders_task",
         "schedule": BEAT_EXPIRE_ORDERS_AFTER_TIMEDELTA,
@@ -641,6 +683,11 @@ CELERY_BEAT_MAX_LOOP_INTERVAL = 300  # 5 minutes
 EVENT_PAYLOAD_DELETE_PERIOD = timedelta(
     seconds=parse(os.environ.get("EVENT_PAYLOAD_DELETE_PERIOD", "14 days"))
 )
+# Number of past months whose numbers are allocated from database sequences,
+# sequences of the older months are dropped by the beat task
+MONTHLY_SEQUENCE_RETENTION_MONTHS = int(
+    os.environ.get("MONTHLY_SEQUENCE_RETENTION_MONTHS", 3)
+)
 # Time between marking app "to remove" and removing the app from the database.
 # App is not visible for the user after removing, but it still exists in the database.
 # Saleor needs time to process sending `APP_DELETED` webhook and possible retrying,
@@ -715,6 +762,13 @@ def SENTRY_INIT(dsn: str, sentry_opts: dict):
 
 
 GRAPHQL_PAGINATION_LIMIT = 10000
+
+# Max number of barcodes that can be printed with a single `barcodeBatchCreate`
+BARCODE_BATCH_CREATE_MAX_COUNT = int(
+    os.environ.get("BARCODE_BATCH_CREATE_MAX_COUNT", 5000)
+)
+# Max number of codes that can be scanned with a single `barcodeBatchScan`
+BARCODE_BATCH_SCAN_MAX_COUNT = int(os.environ.get("BARCODE_BATCH_SCAN_MAX_COUNT", 1000))
 GRAPHQL_MIDDLEWARE: list[str] = []
 
 # Set GRAPHQL_QUERY_MAX_COMPLEXITY=0 in env to disable (not recommended)
@@ -722,6 +776,37 @@ GRAPHQL_QUERY_MAX_COMPLEXITY = int(
     os.environ.get("GRAPHQL_QUERY_MAX_COMPLEXITY", 50000)
 )
 
+# Number of parsed and validated GraphQL documents kept by every process
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+# Number of memoized query costs, one per query and shape of its variables
+GRAPHQL_QUERY_COST_CACHE_SIZE = int(
+    os.environ.get("GRAPHQL_QUERY_COST_CACHE_SIZE", 5000)
+)
+# Seconds for which the queries registered by Automatic Persisted Queries are kept
+PERSISTED_QUERY_CACHE_TIMEOUT = parse(
+    os.environ.get("PERSISTED_QUERY_CACHE_TIMEOUT", "7 days")
+)
+
+# Seconds for which responses of anonymous storefront queries are cached,
+# see saleor.graphql.core.response_cache. Set to 0 to disable the cache.
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", "0 seconds")
+)
+# Let browsers and proxies keep cached responses for the timeout as well. Their
+# copies are not invalidated by writes, they may be stale for the whole timeout.
+GRAPHQL_RESPONSE_CACHE_PUBLIC = get_bool_from_env("GRAPHQL_RESPONSE_CACHE_PUBLIC", False)
+
+# `totalCount` of connections, see saleor.graphql.core.total_count. Unfiltered
+# collections the planner estimates to have more rows than the threshold return
+# the estimate instead of the exact count. Counts are cached for the timeout.
+# Set either to 0 to disable it, estimates are disabled by default.
+GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD", 0)
+)
+GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT", "1 minute")
+)
+
 # Max number entities that can be requested in single query by Apollo Federation
 # Federation protocol implements no securities on its own part - malicious actor
 # may build a query that requests for potentially few thousands of entities.
@@ -846,6 +931,16 @@ if REDIS_URL:
 CACHES = {"default": django_cache_url.config()}
 CACHES["default"]["TIMEOUT"] = parse(os.environ.get("CACHE_TIMEOUT", "7 days"))
 
+# Seconds for which each process reuses the loaded site, site settings, carousel
+# and statistics before loading them again.
+SITE_CACHE_TIMEOUT = parse(os.environ.get("SITE_CACHE_TIMEOUT", "1 minute"))
+
+# Seconds for which each process reuses the loaded channels and configurations
+# of plugins; changes are picked up earlier, see `saleor.plugins.cache`.
+PLUGIN_CONFIGURATION_CACHE_TIMEOUT = parse(
+    os.environ.get("PLUGIN_CONFIGURATION_CACHE_TIMEOUT", "1 minute")
+)
+
 JWT_EXPIRE = True
 JWT_TTL_ACCESS = timedelta(seconds=parse(os.environ.get("JWT_TTL_ACCESS", "30 minutes")))
 JWT_TTL_APP_ACCESS = timedelta(
@@ -853,6 +948,18 @@ JWT_TTL_APP_ACCESS = timedelta(
 )
 JWT_TTL_REFRESH = timedelta(seconds=parse(os.environ.get("JWT_TTL_REFRESH", "30 days")))
 
+# Number of verified access tokens kept by each process and seconds for which a
+# token is trusted without checking its signature again.
+JWT_VERIFICATION_CACHE_SIZE = int(os.environ.get("JWT_VERIFICATION_CACHE_SIZE", 10000))
+JWT_VERIFICATION_CACHE_TIMEOUT = parse(
+    os.environ.get("JWT_VERIFICATION_CACHE_TIMEOUT", "1 minute")
+)
+# Seconds for which authenticated users are loaded from a snapshot stored in the
+# cache instead of the database; `0` disables snapshots.
+JWT_USER_SNAPSHOT_TIMEOUT = parse(
+    os.environ.get("JWT_USER_SNAPSHOT_TIMEOUT", "0 seconds")
+)
+
 
 JWT_TTL_REQUEST_EMAIL_CHANGE = timedelta(
     seconds=parse(os.environ.get("JWT_TTL_REQUEST_EMAIL_CHANGE", "1 hour")),
@@ -933,3 +1040,12 @@ COMMON_REQUESTS_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
 
 WEBHOOK_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
 WEBHOOK_SYNC_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
+
+# Number of async webhook deliveries sent by a single Celery task.
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", 100))
+# Number of requests a single batch of deliveries sends concurrently.
+WEBHOOK_BATCH_MAX_CONCURRENCY = int(os.environ.get("WEBHOOK_BATCH_MAX_CONCURRENCY", 10))
+# Number of keep-alive connections a batch of deliveries opens to a single host.
+WEBHOOK_BATCH_MAX_CONNECTIONS_PER_HOST = int(
+    os.environ.get("WEBHOOK_BATCH_MAX_CONNECTIONS_PER_HOST", 4)
+)
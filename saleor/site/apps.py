@@ -0,0 +1,31 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class SiteAppConfig(AppConfig):
+    name = "saleor.site"
+
+    def ready(self):
+        from django.contrib.sites.models import Site
+
+        from .cache import invalidate_site_cache
+        from .models import (
+            SiteCarousel,
+            SiteCarouselLine,
+            SiteSettings,
+            SiteSettingsTranslation,
+        )
+
+        for model in [
+            Site,
+            SiteSettings,
+            SiteSettingsTranslation,
+            SiteCarousel,
+            SiteCarouselLine,
+        ]:
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    invalidate_site_cache,
+                    sender=model,
+                    dispatch_uid=f"invalidate_site_cache_{model.__name__}",
+                )
@@ -0,0 +1,127 @@
+"""Process-level cache of the site objects resolved by nearly every request.
+
+Entries expire after `SITE_CACHE_TIMEOUT` seconds and are dropped as soon as
+any of the cached models is saved or deleted in this process, see
+`invalidate_site_cache`. Other processes pick up the change when their entries
+expire.
+
+Every call returns its own copies of the cached instances, mutations modify the
+returned site settings before validating them.
+"""
+import copy
+import threading
+import time
+from collections.abc import Hashable, Iterable
+from typing import Any, Callable
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models import Q
+
+from .models import SiteCarousel
+from .statistics import get_site_statistics
+
+
+class TTLCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+
+    def get_many(
+        self,
+        keys: Iterable[Hashable],
+        load_many: Callable[[list], dict],
+        timeout: float,
+    ) -> list:
+        """Return values of the keys, loading the missing ones with one call.
+
+        `load_many` receives the list of missing keys and returns a dict of the
+        found values; keys absent from the dict are cached as `None`. The values
+        are deep copies of the cached ones, so they are never shared by requests.
+        """
+        keys = list(keys)
+        now = time.monotonic()
+        values = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                values[key] = entry[1]
+        missing = [key for key in dict.fromkeys(keys) if key not in values]
+        if missing:
+            loaded = load_many(missing)
+            with self._lock:
+                for key in missing:
+                    values[key] = loaded.get(key)
+                    if timeout > 0:
+                        self._entries[key] = (now + timeout, values[key])
+        return [copy.deepcopy(values[key]) for key in keys]
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+
+site_cache = TTLCache()
+
+
+def _get_many(kind: str, keys: Iterable, load_many: Callable[[list], dict]) -> list:
+    def load_missing(missing_keys):
+        loaded = load_many([key for _, key in missing_keys])
+        return {(kind, key): value for key, value in loaded.items()}
+
+    return site_cache.get_many(
+        [(kind, key) for key in keys], load_missing, settings.SITE_CACHE_TIMEOUT
+    )
+
+
+def get_cached_sites(site_ids: Iterable[int], using: str) -> list:
+    """Return the sites with their settings selected."""
+
+    def load_many(keys):
+        return Site.objects.using(using).select_related("settings").in_bulk(keys)
+
+    return _get_many("site", site_ids, load_many)
+
+
+def get_cached_sites_by_host(hosts: Iterable[str], using: str) -> list:
+    def load_many(keys):
+        # simulate non existing `domain__iexact__in`
+        lookup = Q()
+        for key in keys:
+            lookup |= Q(domain__iexact=key)
+        sites = Site.objects.using(using).select_related("settings").filter(lookup)
+        return {site.domain.lower(): site for site in sites}
+
+    return _get_many("site_by_host", [host.lower() for host in hosts], load_many)
+
+
+def get_cached_carousels(site_ids: Iterable[int], using: str) -> list:
+    """Return the current carousels of the sites with their lines prefetched."""
+
+    def load_many(keys):
+        carousels = (
+            SiteCarousel.objects.using(using)
+            .filter(site__site_id__in=keys)
+            .select_related("site")
+            .prefetch_related("lines")
+        )
+        return {carousel.site.site_id: carousel for carousel in carousels}
+
+    return _get_many("carousel", site_ids, load_many)
+
+
+def get_cached_site_statistics(site_ids: Iterable[int]) -> list:
+    """Return the statistics snapshots, including the pending increments."""
+
+    def load_many(keys):
+        return {site_id: get_site_statistics(site_id) for site_id in keys}
+
+    return _get_many("statistics", site_ids, load_many)
+
+
+def invalidate_site_cache(sender=None, **kwargs):
+    site_cache.clear()
+    Site.objects.clear_cache()
+    # Drop the entries loaded by other requests before the change was committed.
+    transaction.on_commit(site_cache.clear)
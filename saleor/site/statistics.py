@@ -0,0 +1,182 @@
+"""Write-behind counters of the site statistics.
+
+Increments are accumulated in the cache with atomic `incr` calls instead of
+updating the single `SiteStatistics` row on every login or fulfillment. The
+`flush_site_statistics` task periodically moves the pending increments to the
+database with one `UPDATE` per site. Reads are served from a cached snapshot of
+the row combined with the not yet flushed increments.
+
+The pending increments have to be visible to the worker running the flush, with
+a cache local to the process (e.g. local memory) the increments are written to
+the database directly instead, see `SITE_STATISTICS_WRITE_BEHIND`.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional, Union
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import F
+
+from .models import SiteStatistics
+
+COUNTERS = ("views", "users", "circulated_currency", "circulated_items")
+SNAPSHOT_CACHE_KEY = "site_statistics:{site_id}"
+PENDING_CACHE_KEY = "site_statistics:{site_id}:pending:{counter}"
+CARRY_CACHE_KEY = "site_statistics:{site_id}:carry:{counter}"
+# Fractions of the deltas are carried over in thousandths of the unit.
+CARRY_SCALE = 1000
+
+
+def _pending_key(site_id: int, counter: str) -> str:
+    return PENDING_CACHE_KEY.format(site_id=site_id, counter=counter)
+
+
+def is_write_behind_enabled() -> bool:
+    """Return whether the increments are accumulated in the cache.
+
+    Unless configured explicitly, only caches shared by all processes are used;
+    increments kept in a per-process cache would never reach the flushing worker.
+    """
+    if settings.SITE_STATISTICS_WRITE_BEHIND is not None:
+        return settings.SITE_STATISTICS_WRITE_BEHIND
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _update_site_statistics(site_id: int, deltas: dict[str, int]):
+    updated = SiteStatistics.objects.filter(site_id=site_id).update(
+        **{counter: F(counter) + delta for counter, delta in deltas.items()}
+    )
+    if not updated:
+        SiteStatistics.objects.get_or_create(site_id=site_id)
+        SiteStatistics.objects.filter(site_id=site_id).update(
+            **{counter: F(counter) + delta for counter, delta in deltas.items()}
+        )
+
+
+def _get_whole_units(site_id: int, counter: str, delta: Decimal) -> int:
+    """Return the whole units to add for the delta, carrying its fraction over.
+
+    Fractional deltas are summed in the cache and every delta adds the number of
+    whole units the running sum crosses, so fractions are never rounded away no
+    matter how the amount is split between calls.
+    """
+    if delta == delta.to_integral_value():
+        return int(delta)
+    minor = int((delta * CARRY_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+    key = CARRY_CACHE_KEY.format(site_id=site_id, counter=counter)
+    cache.add(key, 0, timeout=None)
+    try:
+        total = cache.incr(key, minor)
+    except ValueError:
+        # The cache doesn't keep values (or the key was just evicted).
+        return int(delta.to_integral_value(rounding=ROUND_HALF_UP))
+    return total // CARRY_SCALE - (total - minor) // CARRY_SCALE
+
+
+def increment_site_statistics(
+    site_id: Optional[int] = None, **deltas: Union[int, Decimal]
+):
+    """Add the deltas to the pending increments of the given counters."""
+    if site_id is None:
+        site_id = settings.SITE_ID
+    rounded = {}
+    for counter, delta in deltas.items():
+        if counter not in COUNTERS:
+            raise ValueError(f"Unknown site statistics counter: {counter}.")
+        delta = _get_whole_units(site_id, counter, Decimal(delta))
+        if delta:
+            rounded[counter] = delta
+    if not rounded:
+        return
+    if not is_write_behind_enabled():
+        _update_site_statistics(site_id, rounded)
+        cache.delete(SNAPSHOT_CACHE_KEY.format(site_id=site_id))
+        return
+    for counter, delta in rounded.items():
+        key = _pending_key(site_id, counter)
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # The key was evicted between `add` and `incr`.
+            cache.set(key, delta, timeout=None)
+
+
+def increment_site_statistics_on_commit(
+    site_id: Optional[int] = None, **deltas: Union[int, Decimal]
+):
+    """Add the deltas to the pending increments after the transaction commits.
+
+    Increments made in a savepoint that is rolled back are discarded together
+    with their callback. Outside of a transaction the deltas are applied at once.
+    """
+    if site_id is None:
+        site_id = settings.SITE_ID
+    for counter in deltas:
+        if counter not in COUNTERS:
+            raise ValueError(f"Unknown site statistics counter: {counter}.")
+    transaction.on_commit(lambda: increment_site_statistics(site_id, **deltas))
+
+
+def get_pending_increments(site_id: int) -> dict[str, int]:
+    keys = {_pending_key(site_id, counter): counter for counter in COUNTERS}
+    values = cache.get_many(keys.keys())
+    return {counter: values.get(key) or 0 for key, counter in keys.items()}
+
+
+def _get_snapshot(site_id: int) -> SiteStatistics:
+    key = SNAPSHOT_CACHE_KEY.format(site_id=site_id)
+    stat = cache.get(key)
+    if stat is None:
+        stat, _ = SiteStatistics.objects.get_or_create(site_id=site_id)
+        cache.set(key, stat, timeout=None)
+    return stat
+
+
+def get_site_statistics(site_id: Optional[int] = None) -> SiteStatistics:
+    """Return the statistics including the increments not flushed yet."""
+    if site_id is None:
+        site_id = settings.SITE_ID
+    stat = _get_snapshot(site_id)
+    for counter, pending in get_pending_increments(site_id).items():
+        setattr(stat, counter, getattr(stat, counter) + pending)
+    return stat
+
+
+def _decrement_pending(site_id: int, pending: dict[str, int]):
+    for counter, value in pending.items():
+        try:
+            cache.decr(_pending_key(site_id, counter), value)
+        except ValueError:
+            # The key was evicted, the flushed value is gone with it.
+            pass
+
+
+def flush_site_statistics() -> int:
+    """Write the pending increments to the database.
+
+    The flushed values are subtracted from the pending counters with `decr` only
+    after the `UPDATE` succeeded, so increments made during the flush are kept for
+    the next run and a failed flush doesn't lose any. Returns the number of sites
+    that were updated.
+    """
+    updated = 0
+    for site_id in Site.objects.order_by("pk").values_list("pk", flat=True):
+        pending = {
+            counter: value
+            for counter, value in get_pending_increments(site_id).items()
+            if value
+        }
+        if not pending:
+            continue
+        with transaction.atomic():
+            _update_site_statistics(site_id, pending)
+        _decrement_pending(site_id, pending)
+        stat = SiteStatistics.objects.get(site_id=site_id)
+        cache.set(SNAPSHOT_CACHE_KEY.format(site_id=site_id), stat, timeout=None)
+        updated += 1
+    return updated
@@ -0,0 +1,12 @@
+from celery.utils.log import get_task_logger
+
+from ..celeryconf import app
+from .statistics import flush_site_statistics
+
+task_logger = get_task_logger(__name__)
+
+
+@app.task
+def flush_site_statistics_task():
+    count = flush_site_statistics()
+    task_logger.debug("Flushed statistics of %s sites", count)
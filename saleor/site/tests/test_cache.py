@@ -0,0 +1,27 @@
+import pytest
+
+from ..cache import get_cached_sites, invalidate_site_cache
+
+
+@pytest.fixture
+def _site_cache_enabled(settings):
+    settings.SITE_CACHE_TIMEOUT = 60
+    invalidate_site_cache()
+    yield
+    invalidate_site_cache()
+
+
+def test_cached_sites_are_not_shared(site_settings, _site_cache_enabled):
+    # given
+    site_id = site_settings.site_id
+    (site,) = get_cached_sites([site_id], "default")
+
+    # when
+    site.name = "Not saved"
+    site.settings.description = "Not validated"
+    (cached_site,) = get_cached_sites([site_id], "default")
+
+    # then
+    assert cached_site is not site
+    assert cached_site.name != "Not saved"
+    assert cached_site.settings.description != "Not validated"
@@ -0,0 +1,228 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+
+from ..models import SiteStatistics
+from ..statistics import (
+    flush_site_statistics,
+    get_pending_increments,
+    get_site_statistics,
+    increment_site_statistics,
+    increment_site_statistics_on_commit,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_increment_site_statistics_does_not_touch_database(
+    site_settings, django_assert_num_queries
+):
+    # when
+    with django_assert_num_queries(0):
+        for _ in range(100):
+            increment_site_statistics(views=1, circulated_items=2)
+
+    # then
+    assert not SiteStatistics.objects.filter(views__gt=0).exists()
+    stat = get_site_statistics(site_settings.site_id)
+    assert stat.views == 100
+    assert stat.circulated_items == 200
+
+
+def test_increment_site_statistics_unknown_counter(site_settings):
+    with pytest.raises(ValueError, match="Unknown site statistics counter"):
+        increment_site_statistics(likes=1)
+
+
+def test_flush_site_statistics(site_settings):
+    # given
+    site_id = site_settings.site_id
+    increment_site_statistics(site_id, views=3, users=1)
+    increment_site_statistics(site_id, circulated_currency="10.50")
+
+    # when
+    updated = flush_site_statistics()
+
+    # then
+    assert updated == 1
+    stat = SiteStatistics.objects.get(site_id=site_id)
+    assert stat.views == 3
+    assert stat.users == 1
+    # The half unit is carried over to the next increment.
+    assert stat.circulated_currency == 10
+
+    # when
+    increment_site_statistics(site_id, views=2)
+
+    # then
+    assert get_site_statistics(site_id).views == 5
+    assert flush_site_statistics() == 1
+    assert flush_site_statistics() == 0
+    assert SiteStatistics.objects.get(site_id=site_id).views == 5
+    assert get_site_statistics(site_id).views == 5
+
+
+def test_flush_site_statistics_failure_keeps_pending_increments(site_settings):
+    # given
+    site_id = site_settings.site_id
+    increment_site_statistics(site_id, views=3)
+
+    # when
+    with patch(
+        "saleor.site.statistics._update_site_statistics", side_effect=DatabaseError
+    ):
+        with pytest.raises(DatabaseError):
+            flush_site_statistics()
+
+    # then
+    assert get_pending_increments(site_id)["views"] == 3
+    assert flush_site_statistics() == 1
+    assert SiteStatistics.objects.get(site_id=site_id).views == 3
+
+
+def test_increment_site_statistics_with_local_cache_updates_database(
+    site_settings, settings
+):
+    # given
+    settings.SITE_STATISTICS_WRITE_BEHIND = None
+    site_id = site_settings.site_id
+
+    # when
+    increment_site_statistics(site_id, views=2, circulated_currency="1.5")
+
+    # then
+    assert get_pending_increments(site_id)["views"] == 0
+    stat = SiteStatistics.objects.get(site_id=site_id)
+    assert stat.views == 2
+    assert stat.circulated_currency == 1
+
+
+def test_get_site_statistics_after_increment_with_local_cache(
+    site_settings, settings
+):
+    # given
+    settings.SITE_STATISTICS_WRITE_BEHIND = None
+    site_id = site_settings.site_id
+    increment_site_statistics(site_id, views=2)
+    assert get_site_statistics(site_id).views == 2
+
+    # when
+    increment_site_statistics(site_id, views=3)
+
+    # then
+    assert get_site_statistics(site_id).views == 5
+
+
+def test_increment_site_statistics_on_commit(
+    site_settings, django_capture_on_commit_callbacks
+):
+    # given
+    site_id = site_settings.site_id
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        for _ in range(10):
+            increment_site_statistics_on_commit(
+                site_id, circulated_items=2, circulated_currency=Decimal("1.5")
+            )
+        pending_before_commit = get_pending_increments(site_id)
+
+    # then
+    assert len(callbacks) == 10
+    assert pending_before_commit["circulated_items"] == 0
+    stat = get_site_statistics(site_id)
+    assert stat.circulated_items == 20
+    assert stat.circulated_currency == 15
+
+
+def test_increment_site_statistics_carries_fractions(site_settings):
+    # given
+    site_id = site_settings.site_id
+
+    # when
+    increment_site_statistics(site_id, circulated_currency=Decimal("1.5"))
+    increment_site_statistics(site_id, circulated_currency=Decimal("1.5"))
+    increment_site_statistics(site_id, circulated_currency=Decimal("0.25"))
+
+    # then
+    assert get_pending_increments(site_id)["circulated_currency"] == 3
+    increment_site_statistics(site_id, circulated_currency=Decimal("0.75"))
+    assert get_pending_increments(site_id)["circulated_currency"] == 4
+
+
+def _increment_views_and_roll_back(site_id):
+    with transaction.atomic():
+        increment_site_statistics_on_commit(site_id, views=5)
+        raise DatabaseError("Rolled back.")
+
+
+def test_increment_site_statistics_on_commit_rolled_back(
+    site_settings, django_capture_on_commit_callbacks
+):
+    # given
+    site_id = site_settings.site_id
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(DatabaseError, match="Rolled back."):
+            _increment_views_and_roll_back(site_id)
+        increment_site_statistics_on_commit(site_id, views=1)
+
+    # then
+    assert get_site_statistics(site_id).views == 1
+
+
+def test_increment_site_statistics_on_commit_savepoint_rolled_back(
+    site_settings, django_capture_on_commit_callbacks
+):
+    # given
+    site_id = site_settings.site_id
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        increment_site_statistics_on_commit(site_id, views=1)
+        with pytest.raises(DatabaseError, match="Rolled back."):
+            _increment_views_and_roll_back(site_id)
+        increment_site_statistics_on_commit(site_id, views=2)
+
+    # then
+    assert get_site_statistics(site_id).views == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_fulfillment_statistics(site_settings):
+    # given
+    site_id = site_settings.site_id
+    workers = 8
+    fulfillments_per_worker = 200
+
+    def fulfill():
+        try:
+            for _ in range(fulfillments_per_worker):
+                with transaction.atomic():
+                    increment_site_statistics_on_commit(
+                        site_id, circulated_items=3, circulated_currency=10
+                    )
+        finally:
+            connection.close()
+
+    # when
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in [executor.submit(fulfill) for _ in range(workers)]:
+            result.result()
+
+    # then
+    count = workers * fulfillments_per_worker
+    assert flush_site_statistics() == 1
+    stat = SiteStatistics.objects.get(site_id=site_id)
+    assert stat.circulated_items == 3 * count
+    assert stat.circulated_currency == 10 * count
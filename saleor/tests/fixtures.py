@@ -41,12 +41,18 @@ from ..checkout import base_calculations
 from ..checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ..checkout.models import Checkout, CheckoutLine, CheckoutMetadata
 from ..checkout.utils import add_variant_to_checkout, add_voucher_to_checkout
-from ..core import EventDeliveryStatus, JobStatus
-from ..core.models import EventDelivery, EventDeliveryAttempt, EventPayload
+from ..core import EventDeliveryStatus, JobStatus, MonthlySequenceName
+from ..core.models import (
+    EventDelivery,
+    EventDeliveryAttempt,
+    EventPayload,
+    MonthlySequence,
+)
 from ..core.payments import PaymentInterface
 from ..core.postgres import FlatConcatSearchVector
 from ..core.taxes import zero_money
 from ..core.units import MeasurementUnits
+from ..core.utils.date_time import get_year_month
 from ..core.utils.editorjs import clean_editor_js
 from ..csv.events import ExportEvents
 from ..csv.models import ExportEvent, ExportFile
@@ -2521,6 +2527,16 @@ def permission_manage_orders():
     return Permission.objects.get(codename="manage_orders")
 
 
+@pytest.fixture
+def permission_manage_donations():
+    return Permission.objects.get(codename="manage_donations")
+
+
+@pytest.fixture
+def permission_manage_barcode():
+    return Permission.objects.get(codename="manage_barcodes")
+
+
 @pytest.fixture
 def permission_manage_orders_import():
     return Permission.objects.get(codename="manage_orders_import")
@@ -7926,6 +7942,31 @@ def app_manifest_webhook():
     }
 
 
+@pytest.fixture(autouse=True)
+def _clear_created_monthly_sequences():
+    """Forget the sequences created by other tests, their creation is rolled back."""
+    MonthlySequence._created_sequences.clear()
+    yield
+    MonthlySequence._created_sequences.clear()
+
+
+@pytest.fixture
+def _monthly_sequences(django_capture_on_commit_callbacks):
+    """Create the sequences of the current month, as done by the beat task.
+
+    Otherwise, numbers of the current month are allocated from the counter rows.
+    The sequences are known to exist only once the creation commits, so the
+    commit callbacks are run right away.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        for name in [
+            MonthlySequenceName.BARCODE,
+            MonthlySequenceName.DONATION,
+            MonthlySequenceName.BALANCE_EVENT,
+        ]:
+            MonthlySequence.create_sequence(name, get_year_month())
+
+
 @pytest.fixture
 def event_payload():
     """Return event payload."""
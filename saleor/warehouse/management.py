@@ -598,6 +598,10 @@ def remove_reservations_for_order(order: "Order"):
     Reservation.objects.filter(order_line__in=lines).delete()
 
 
+def remove_reservations_for_orders(order_ids: Iterable[UUID]):
+    Reservation.objects.filter(order_line__order_id__in=order_ids).delete()
+
+
 @traced_atomic_transaction()
 def deallocate_stock_for_order(order: "Order", manager: PluginsManager):
     """Remove all allocations for given order."""
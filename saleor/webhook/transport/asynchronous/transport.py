@@ -1,15 +1,21 @@
 import json
 import logging
+from collections import defaultdict
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
 from celery import group
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.utils import timezone
 
 from ....celeryconf import app
 from ....core import EventDeliveryStatus
+from ....core.http_client import HTTPClient
 from ....core.models import EventDelivery, EventPayload
 from ....core.tracing import webhooks_opentracing_trace
 from ....core.utils import get_domain
@@ -25,9 +31,14 @@ from ..utils import (
     WebhookResponse,
     WebhookSchemes,
     attempt_update,
+    attempts_update,
+    clear_successful_deliveries,
     clear_successful_delivery,
     create_attempt,
+    create_attempts,
+    deliveries_update,
     delivery_update,
+    get_deliveries_for_webhooks,
     get_delivery_for_webhook,
     handle_webhook_retry,
     send_webhook_using_scheme_method,
@@ -171,8 +182,15 @@ def trigger_webhooks_async(
             )
         )
 
-    for delivery in deliveries:
-        send_webhook_request_async.delay(delivery.id)
+    if len(deliveries) == 1:
+        send_webhook_request_async.delay(deliveries[0].id)
+        return
+
+    batch_size = settings.WEBHOOK_BATCH_SIZE
+    for start in range(0, len(deliveries), batch_size):
+        send_webhook_requests_async.delay(
+            [delivery.id for delivery in deliveries[start : start + batch_size]]
+        )
 
 
 @app.task(
@@ -227,6 +245,133 @@ def send_webhook_request_async(self, event_delivery_id):
     clear_successful_delivery(delivery)
 
 
+def _split_deliveries_into_lanes(
+    deliveries: list[EventDelivery],
+) -> list[list[EventDelivery]]:
+    """Split the deliveries into lanes, each sent over its own connection.
+
+    Deliveries to the same host are spread over at most
+    `WEBHOOK_BATCH_MAX_CONNECTIONS_PER_HOST` lanes.
+    """
+    deliveries_by_host = defaultdict(list)
+    for delivery in deliveries:
+        parts = urlparse(delivery.webhook.target_url)
+        deliveries_by_host[(parts.scheme, parts.netloc)].append(delivery)
+
+    lanes = []
+    for host_deliveries in deliveries_by_host.values():
+        count = min(
+            len(host_deliveries), settings.WEBHOOK_BATCH_MAX_CONNECTIONS_PER_HOST
+        )
+        lanes.extend(host_deliveries[index::count] for index in range(count))
+    return lanes
+
+
+def _send_delivery(delivery, domain, session) -> tuple[WebhookResponse, bool]:
+    """Send the delivery and return the response and whether to retry it."""
+    webhook = delivery.webhook
+    try:
+        if not delivery.payload:
+            raise ValueError("Event delivery id: %r has no payload." % delivery.id)
+        with webhooks_opentracing_trace(delivery.event_type, domain, app=webhook.app):
+            response = send_webhook_using_scheme_method(
+                webhook.target_url,
+                domain,
+                webhook.secret_key,
+                delivery.event_type,
+                delivery.payload.payload,
+                webhook.custom_headers,
+                session=session,
+            )
+    except ValueError as e:
+        response = WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED)
+        return response, False
+
+    status_code = response.response_status_code
+    # do not retry for 30x and 40x status codes
+    retry = not (status_code and 300 <= status_code < 500)
+    return response, retry
+
+
+def _send_deliveries_over_session(
+    deliveries: list[EventDelivery], domain
+) -> list[tuple[WebhookResponse, bool]]:
+    """Send the deliveries one after another over a single keep-alive session."""
+    with HTTPClient.get_session() as session:
+        return [_send_delivery(delivery, domain, session) for delivery in deliveries]
+
+
+@app.task(queue=settings.WEBHOOK_CELERY_QUEUE_NAME, bind=True)
+def send_webhook_requests_async(self, event_delivery_ids):
+    """Send a batch of event deliveries.
+
+    Deliveries are grouped by the target host and sent concurrently over
+    keep-alive connections. Attempts and statuses are stored for the whole batch
+    at once. Failed deliveries are retried one by one by
+    `send_webhook_request_async`.
+    """
+    deliveries = get_deliveries_for_webhooks(event_delivery_ids)
+    if not deliveries:
+        return None
+
+    domain = get_domain()
+    attempts = create_attempts(deliveries, self.request.id)
+    lanes = _split_deliveries_into_lanes(deliveries)
+    max_workers = min(len(lanes), settings.WEBHOOK_BATCH_MAX_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        lanes_results = executor.map(
+            partial(_send_deliveries_over_session, domain=domain), lanes
+        )
+        results = {
+            delivery.id: result
+            for lane, lane_results in zip(lanes, lanes_results)
+            for delivery, result in zip(lane, lane_results)
+        }
+
+    attempts_update(attempts, [results[delivery.id][0] for delivery in deliveries])
+
+    deliveries_by_status = defaultdict(list)
+    retry_countdown = send_webhook_request_async.retry_backoff
+    next_retry = timezone.now() + timedelta(seconds=retry_countdown)
+    for delivery, attempt in zip(deliveries, attempts):
+        response, retry = results[delivery.id]
+        webhook = delivery.webhook
+        if response.status == EventDeliveryStatus.SUCCESS:
+            task_logger.info(
+                "[Webhook ID:%r] Payload sent to %r for event %r. Delivery id: %r",
+                webhook.id,
+                webhook.target_url,
+                delivery.event_type,
+                delivery.id,
+            )
+            deliveries_by_status[EventDeliveryStatus.SUCCESS].append(delivery)
+            observability.report_event_delivery_attempt(attempt)
+            continue
+
+        task_logger.info(
+            "[Webhook ID: %r] Failed request to %r: %r for event: %r."
+            " Delivery attempt id: %r",
+            webhook.id,
+            webhook.target_url,
+            response.content,
+            delivery.event_type,
+            attempt.id,
+        )
+        if retry:
+            # The batch counts as the first attempt of the delivery.
+            send_webhook_request_async.apply_async(
+                (delivery.id,), countdown=retry_countdown, retries=1
+            )
+            observability.report_event_delivery_attempt(attempt, next_retry)
+        else:
+            deliveries_by_status[EventDeliveryStatus.FAILED].append(delivery)
+            observability.report_event_delivery_attempt(attempt)
+
+    for status, status_deliveries in deliveries_by_status.items():
+        deliveries_update(status_deliveries, status)
+    clear_successful_deliveries(deliveries)
+
+
 def send_observability_events(webhooks: list[WebhookData], events: list[Any]):
     event_type = WebhookEventAsyncType.OBSERVABILITY
     for webhook in webhooks:
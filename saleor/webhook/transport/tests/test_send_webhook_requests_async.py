@@ -0,0 +1,175 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from ....core import EventDeliveryStatus
+from ....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
+from ...event_types import WebhookEventAsyncType
+from ...models import Webhook
+from ..asynchronous.transport import (
+    send_webhook_request_async,
+    send_webhook_requests_async,
+)
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.path, self.client_address))
+        time.sleep(self.server.latency)
+        status = {"/error": 500, "/bad-request": 400}.get(self.path, 200)
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhookHandler)
+    server.requests = []
+    server.latency = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _create_deliveries(app, url, count, event_payload):
+    webhook = Webhook.objects.create(app=app, target_url=url, secret_key="secret")
+    return EventDelivery.objects.bulk_create(
+        [
+            EventDelivery(
+                event_type=WebhookEventAsyncType.ORDER_CREATED,
+                payload=event_payload,
+                webhook=webhook,
+            )
+            for _ in range(count)
+        ]
+    )
+
+
+def test_send_webhook_requests_async_reuses_connections(
+    app, event_payload, stub_server, settings, django_assert_max_num_queries
+):
+    # given
+    settings.WEBHOOK_BATCH_MAX_CONNECTIONS_PER_HOST = 2
+    url = f"http://127.0.0.1:{stub_server.server_port}/webhook"
+    deliveries = _create_deliveries(app, url, 20, event_payload)
+
+    # when
+    with django_assert_max_num_queries(15):
+        send_webhook_requests_async([delivery.id for delivery in deliveries])
+
+    # then
+    assert len(stub_server.requests) == 20
+    assert len({address for _path, address in stub_server.requests}) == 2
+    assert not EventDelivery.objects.exists()
+    assert not EventPayload.objects.exists()
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport."
+    "send_webhook_request_async.apply_async"
+)
+def test_send_webhook_requests_async_failed_deliveries(
+    mocked_apply_async, app, event_payload, stub_server
+):
+    # given
+    base_url = f"http://127.0.0.1:{stub_server.server_port}"
+    server_error, bad_request, delivered = (
+        _create_deliveries(app, f"{base_url}{path}", 1, event_payload)[0]
+        for path in ["/error", "/bad-request", "/webhook"]
+    )
+
+    # when
+    send_webhook_requests_async([server_error.id, bad_request.id, delivered.id])
+
+    # then
+    mocked_apply_async.assert_called_once_with(
+        (server_error.id,),
+        countdown=send_webhook_request_async.retry_backoff,
+        retries=1,
+    )
+    server_error.refresh_from_db()
+    assert server_error.status == EventDeliveryStatus.PENDING
+    bad_request.refresh_from_db()
+    assert bad_request.status == EventDeliveryStatus.FAILED
+    assert not EventDelivery.objects.filter(pk=delivered.pk).exists()
+    attempts = EventDeliveryAttempt.objects.filter(
+        delivery__in=[server_error, bad_request]
+    )
+    assert {attempt.response_status_code for attempt in attempts} == {500, 400}
+    assert {attempt.status for attempt in attempts} == {EventDeliveryStatus.FAILED}
+
+
+def test_send_webhook_requests_async_inactive_webhook(app, event_payload, stub_server):
+    # given
+    url = f"http://127.0.0.1:{stub_server.server_port}/webhook"
+    delivery = _create_deliveries(app, url, 1, event_payload)[0]
+    Webhook.objects.update(is_active=False)
+
+    # when
+    send_webhook_requests_async([delivery.id])
+
+    # then
+    assert not stub_server.requests
+    delivery.refresh_from_db()
+    assert delivery.status == EventDeliveryStatus.FAILED
+    assert not delivery.attempts.exists()
+
+
+@pytest.mark.slow
+def test_send_webhook_requests_async_opens_fewer_connections(
+    app, stub_server, settings
+):
+    # given
+    deliveries_count = 500
+    stub_server.latency = 0.005
+    url = f"http://127.0.0.1:{stub_server.server_port}/webhook"
+    single_ids = [
+        delivery.id
+        for delivery in _create_deliveries(
+            app,
+            url,
+            deliveries_count,
+            EventPayload.objects.create(payload='{"key": "value"}'),
+        )
+    ]
+    batch_ids = [
+        delivery.id
+        for delivery in _create_deliveries(
+            app,
+            url,
+            deliveries_count,
+            EventPayload.objects.create(payload='{"key": "value"}'),
+        )
+    ]
+
+    # when
+    for delivery_id in single_ids:
+        send_webhook_request_async.delay(delivery_id)
+    single_requests = list(stub_server.requests)
+    stub_server.requests.clear()
+    send_webhook_requests_async(batch_ids)
+    batch_requests = list(stub_server.requests)
+
+    # then
+    assert len(single_requests) == deliveries_count
+    assert len(batch_requests) == deliveries_count
+    assert not EventDelivery.objects.exists()
+    single_connections = {address for _path, address in single_requests}
+    batch_connections = {address for _path, address in batch_requests}
+    assert len(batch_connections) <= settings.WEBHOOK_BATCH_MAX_CONNECTIONS_PER_HOST
+    assert len(batch_connections) < len(single_connections)
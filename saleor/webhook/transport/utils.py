@@ -17,7 +17,7 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.urls import reverse
 from google.cloud import pubsub_v1
-from requests import RequestException
+from requests import RequestException, Session
 from requests_hardened.ip_filter import InvalidIPAddress
 
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
@@ -108,6 +108,7 @@ def send_webhook_using_http(
     event_type,
     timeout=settings.WEBHOOK_TIMEOUT,
     custom_headers: Optional[dict[str, str]] = None,
+    session: Optional[Session] = None,
 ) -> WebhookResponse:
     """Send a webhook request using http / https protocol.
 
@@ -118,6 +119,8 @@ def send_webhook_using_http(
     :param event_type: Webhook event type.
     :param timeout: Request timeout.
     :param custom_headers: Custom headers which will be added to request headers.
+    :param session: HTTP session which keeps the connection to the target alive;
+        a new connection is opened for the request when not provided.
 
     :return: WebhookResponse object.
     """
@@ -136,8 +139,9 @@ def send_webhook_using_http(
     if custom_headers:
         headers.update(custom_headers)
 
+    send_request = session.request if session else HTTPClient.send_request
     try:
-        response = HTTPClient.send_request(
+        response = send_request(
             "POST",
             target_url,
             data=message,
@@ -269,6 +273,7 @@ def send_webhook_using_scheme_method(
     event_type,
     data,
     custom_headers=None,
+    session=None,
 ) -> WebhookResponse:
     parts = urlparse(target_url)
     message = data.encode("utf-8")
@@ -289,6 +294,7 @@ def send_webhook_using_scheme_method(
             signature,
             event_type,
             custom_headers=custom_headers,
+            session=session,
         )
     raise ValueError(f"Unknown webhook scheme: {parts.scheme!r}")
 
@@ -372,6 +378,27 @@ def get_delivery_for_webhook(event_delivery_id) -> Optional["EventDelivery"]:
     return delivery
 
 
+def get_deliveries_for_webhooks(event_delivery_ids) -> list["EventDelivery"]:
+    """Return the deliveries to send, fetched at once.
+
+    Deliveries of disabled webhooks are marked as failed and skipped.
+    """
+    deliveries = list(
+        EventDelivery.objects.select_related("payload", "webhook__app").filter(
+            id__in=event_delivery_ids
+        )
+    )
+    for event_delivery_id in set(event_delivery_ids) - {d.id for d in deliveries}:
+        logger.error("Event delivery id: %r not found", event_delivery_id)
+
+    inactive = [delivery for delivery in deliveries if not delivery.webhook.is_active]
+    if inactive:
+        deliveries_update(inactive, status=EventDeliveryStatus.FAILED)
+        for delivery in inactive:
+            logger.info("Event delivery id: %r webhook is disabled.", delivery.id)
+    return [delivery for delivery in deliveries if delivery.webhook.is_active]
+
+
 @contextmanager
 def catch_duration_time():
     start = time()
@@ -394,6 +421,22 @@ def create_attempt(
     return attempt
 
 
+def create_attempts(
+    deliveries: list["EventDelivery"],
+    task_id: Optional[str] = None,
+) -> list["EventDeliveryAttempt"]:
+    return EventDeliveryAttempt.objects.bulk_create(
+        [
+            EventDeliveryAttempt(
+                delivery=delivery,
+                task_id=task_id,
+                status=EventDeliveryStatus.PENDING,
+            )
+            for delivery in deliveries
+        ]
+    )
+
+
 def attempt_update(
     attempt: "EventDeliveryAttempt",
     webhook_response: "WebhookResponse",
@@ -416,6 +459,30 @@ def attempt_update(
     )
 
 
+def attempts_update(
+    attempts: list["EventDeliveryAttempt"],
+    webhook_responses: list["WebhookResponse"],
+):
+    for attempt, webhook_response in zip(attempts, webhook_responses):
+        attempt.duration = webhook_response.duration
+        attempt.response = webhook_response.content
+        attempt.response_headers = json.dumps(webhook_response.response_headers)
+        attempt.response_status_code = webhook_response.response_status_code
+        attempt.request_headers = json.dumps(webhook_response.request_headers)
+        attempt.status = webhook_response.status
+    EventDeliveryAttempt.objects.bulk_update(
+        attempts,
+        [
+            "duration",
+            "response",
+            "response_headers",
+            "response_status_code",
+            "request_headers",
+            "status",
+        ],
+    )
+
+
 def clear_successful_delivery(delivery: "EventDelivery"):
     if delivery.status == EventDeliveryStatus.SUCCESS:
         payload_id = delivery.payload_id
@@ -424,11 +491,34 @@ def clear_successful_delivery(delivery: "EventDelivery"):
             EventPayload.objects.filter(pk=payload_id, deliveries__isnull=True).delete()
 
 
+def clear_successful_deliveries(deliveries: list["EventDelivery"]):
+    successful = [
+        delivery
+        for delivery in deliveries
+        if delivery.status == EventDeliveryStatus.SUCCESS
+    ]
+    if not successful:
+        return
+    payload_ids = {delivery.payload_id for delivery in successful}
+    EventDelivery.objects.filter(
+        pk__in=[delivery.pk for delivery in successful]
+    ).delete()
+    EventPayload.objects.filter(pk__in=payload_ids, deliveries__isnull=True).delete()
+
+
 def delivery_update(delivery: "EventDelivery", status: str):
     delivery.status = status
     delivery.save(update_fields=["status"])
 
 
+def deliveries_update(deliveries: list["EventDelivery"], status: str):
+    for delivery in deliveries:
+        delivery.status = status
+    EventDelivery.objects.filter(
+        pk__in=[delivery.pk for delivery in deliveries]
+    ).update(status=status)
+
+
 def trigger_transaction_request(
     transaction_data: "TransactionActionData", event_type: str, requestor
 ):